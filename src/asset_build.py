@@ -0,0 +1,279 @@
+"""Implements the offline build step that turns the raw assets into texture atlases.
+
+The sprite sheets are sliced into frames and packed into one Kivy ``.atlas`` per resolution
+tier; the background is scaled down for every
+tier. ``manifest.json`` lists the frames of every sprite and the content hash of every output, so
+unchanged outputs are skipped on the next build.
+
+Run ``python -m src.asset_build`` after changing a file in ``assets/``. It needs Pillow. With
+``--pack`` the built assets and the sounds are also packed into one asset pack for a release.
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import typing
+
+from PIL import Image
+
+from src.asset_pack import PACK_NAME, write_pack
+
+SOURCE_DIR = "assets"
+"""Directory of the raw assets."""
+
+BUILD_DIR = os.path.join(SOURCE_DIR, "build")
+"""Directory of the built assets that are loaded by the game."""
+
+
+class SpriteSheet(typing.NamedTuple):
+    """A grid of animation frames; ``offset`` shifts the grid to the right in pixels."""
+
+    source: str
+    cols: int
+    rows: int
+    offset: int = 0
+
+
+SPRITE_SHEETS = {
+    "bee": SpriteSheet("bee.png", 2, 4),
+    "bird": SpriteSheet("bird.png", 6, 1, 35),
+    "swallow": SpriteSheet("schwalbe2.png", 4, 2),
+}
+"""The sprite sheets by sprite name."""
+
+BACKGROUNDS = {"background": "new_bg.jpg"}
+"""The background images by name."""
+
+SOUNDS = ("theme.mp3",)
+"""The sounds, which are packed as they are."""
+
+TIERS = {"high": 1.0, "medium": 0.5, "low": 0.25}
+"""The scale of the sprites of every resolution tier."""
+
+BACKGROUND_HEIGHT = 2160
+"""Height of the background of the ``high`` tier in pixels."""
+
+PAGE_WIDTH = 2048
+"""Width of an atlas page in pixels."""
+
+PADDING = 2
+"""Empty pixels around every frame to keep neighbours from bleeding in when filtering."""
+
+
+def content_hash(*parts: object) -> str:
+    """Returns a hash of the given build parameters and the contents of the given files."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str) and os.path.isfile(part):
+            with open(part, "rb") as file:
+                digest.update(file.read())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+def slice_sheet(image: Image.Image, sheet: SpriteSheet) -> list[Image.Image]:
+    """Cuts a sprite sheet into its frames, row by row from the top left.
+
+    The frames keep the empty border of their cells, because the hitboxes of the bees and
+    obstacles are tuned to the sprites drawn with it.
+    """
+    width, height = image.width // sheet.cols, image.height // sheet.rows
+    return [
+        image.crop(
+            (
+                col * width + sheet.offset,
+                row * height,
+                (col + 1) * width + sheet.offset,
+                (row + 1) * height,
+            )
+        )
+        for row in range(sheet.rows)
+        for col in range(sheet.cols)
+    ]
+
+
+def page_width(sizes: list[tuple[int, int]]) -> int:
+    """Returns the power of two page width of a roughly square page for the rectangles."""
+    area = sum((width + PADDING) * (height + PADDING) for width, height in sizes)
+    widest = max(width for width, _ in sizes) + 2 * PADDING
+    width = 1
+    while width * width < area or width < widest:
+        width *= 2
+    return min(width, PAGE_WIDTH)
+
+
+def pack(sizes: list[tuple[int, int]], width: int) -> tuple[list, int]:
+    """Places rectangles on shelves of a page and returns their top left corners and its height.
+
+    The rectangles are placed from the highest to the lowest.
+    """
+    positions: list = [None] * len(sizes)
+    x_pos = y_pos = shelf = 0
+    for index in sorted(range(len(sizes)), key=lambda index: -sizes[index][1]):
+        rect_width, rect_height = sizes[index]
+        if x_pos + rect_width + PADDING > width:
+            x_pos, y_pos, shelf = 0, y_pos + shelf, 0
+        if rect_width + 2 * PADDING > width:
+            raise ValueError(f"A frame of {rect_width} pixels does not fit on a page")
+        positions[index] = (x_pos + PADDING, y_pos + PADDING)
+        x_pos += rect_width + PADDING
+        shelf = max(shelf, rect_height + PADDING)
+    return positions, y_pos + shelf + PADDING
+
+
+def build_atlas(frames: dict[str, Image.Image], path: str):
+    """Packs the named frames into one page and writes it as a Kivy atlas."""
+    names = list(frames)
+    sizes = [frames[name].size for name in names]
+    width = page_width(sizes)
+    positions, height = pack(sizes, width)
+    page = Image.new("RGBA", (width, height))
+    regions = {}
+    for name, (x_pos, y_pos) in zip(names, positions):
+        frame = frames[name]
+        page.paste(frame, (x_pos, y_pos))
+        # Kivy counts y from the bottom of the page
+        regions[name] = [x_pos, height - y_pos - frame.height, *frame.size]
+
+    base = os.path.splitext(os.path.basename(path))[0]
+    page.save(os.path.join(os.path.dirname(path), f"{base}-0.png"), optimize=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({f"{base}-0.png": regions}, file, indent=1, sort_keys=True)
+
+
+def build_sprites(source_dir: str, scale: float, path: str):
+    """Slices and scales all sprite sheets and packs their frames as ``<sprite>_<index>``."""
+    frames = {}
+    for name, sheet in SPRITE_SHEETS.items():
+        with Image.open(os.path.join(source_dir, sheet.source)) as image:
+            sliced = slice_sheet(image.convert("RGBA"), sheet)
+        for index, frame in enumerate(sliced):
+            size = (
+                max(1, round(frame.width * scale)),
+                max(1, round(frame.height * scale)),
+            )
+            frames[f"{name}_{index}"] = frame.resize(size, Image.Resampling.LANCZOS)
+    build_atlas(frames, path)
+
+
+def build_background(source: str, height: int, path: str):
+    """Scales an image to the given height."""
+    with Image.open(source) as image:
+        width = round(image.width * height / image.height)
+        image.convert("RGB").resize((width, height), Image.Resampling.LANCZOS).save(
+            path, quality=85, optimize=True
+        )
+
+
+def plan(source_dir: str, build_dir: str) -> tuple[dict, list]:
+    """Returns the manifest of a build and its outputs with their hashes and build functions."""
+    manifest: dict = {
+        "sprites": {
+            name: [f"{name}_{index}" for index in range(sheet.cols * sheet.rows)]
+            for name, sheet in SPRITE_SHEETS.items()
+        },
+        "tiers": {},
+        "heights": {},
+        "hashes": {},
+    }
+    sheets = [
+        os.path.join(source_dir, sheet.source) for sheet in SPRITE_SHEETS.values()
+    ]
+    jobs = []
+    for tier, scale in TIERS.items():
+        os.makedirs(os.path.join(build_dir, tier), exist_ok=True)
+        height = manifest["heights"][tier] = round(BACKGROUND_HEIGHT * scale)
+        outputs = manifest["tiers"][tier] = {"atlas": f"{tier}/sprites.atlas"}
+        jobs.append(
+            (
+                outputs["atlas"],
+                content_hash(SPRITE_SHEETS, PAGE_WIDTH, PADDING, scale, *sheets),
+                functools.partial(build_sprites, source_dir, scale),
+            )
+        )
+        for name, source in BACKGROUNDS.items():
+            outputs[name] = f"{tier}/{name}.jpg"
+            source = os.path.join(source_dir, source)
+            jobs.append(
+                (
+                    outputs[name],
+                    content_hash(height, source),
+                    functools.partial(build_background, source, height),
+                )
+            )
+    return manifest, jobs
+
+
+def build(
+    source_dir: str = SOURCE_DIR, build_dir: str = BUILD_DIR, force: bool = False
+) -> list[str]:
+    """Builds every output whose inputs changed and returns the paths of the built outputs."""
+    manifest_path = os.path.join(build_dir, "manifest.json")
+    hashes = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding="utf-8") as file:
+            hashes = json.load(file)["hashes"]
+
+    manifest, jobs = plan(source_dir, build_dir)
+    built = []
+    for path, key, job in jobs:
+        manifest["hashes"][path] = key
+        output = os.path.join(build_dir, path)
+        if hashes.get(path) != key or not os.path.exists(output):
+            job(output)
+            built.append(output)
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    return built
+
+
+def pack_files(source_dir: str, build_dir: str) -> dict[str, str]:
+    """Returns the paths of everything the game loads by their names in the asset pack."""
+    files = {"manifest.json": os.path.join(build_dir, "manifest.json")}
+    with open(files["manifest.json"], encoding="utf-8") as file:
+        manifest = json.load(file)
+    for outputs in manifest["tiers"].values():
+        for output in outputs.values():
+            files[output] = os.path.join(build_dir, output)
+            if not output.endswith(".atlas"):
+                continue
+            with open(files[output], encoding="utf-8") as file:
+                pages = json.load(file)
+            for page in pages:
+                name = f"{os.path.dirname(output)}/{page}"
+                files[name] = os.path.join(build_dir, name)
+    for name in SOUNDS:
+        files[name] = os.path.join(source_dir, name)
+    return files
+
+
+def main(argv: list[str] | None = None):
+    """Builds the assets."""
+    parser = argparse.ArgumentParser(description="Build the BeeLazy texture atlases.")
+    parser.add_argument(
+        "--source", default=SOURCE_DIR, help="directory of the raw assets"
+    )
+    parser.add_argument(
+        "--output", default=BUILD_DIR, help="directory of the built assets"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="rebuild unchanged outputs"
+    )
+    parser.add_argument(
+        "--pack", action="store_true", help="pack the assets into one file"
+    )
+    args = parser.parse_args(argv)
+
+    built = build(args.source, args.output, args.force)
+    print(f"Built {len(built)} outputs" + "".join(f"\n  {path}" for path in built))
+    if args.pack:
+        files = pack_files(args.source, args.output)
+        write_pack(os.path.join(args.source, PACK_NAME), files)
+        print(f"Packed {len(files)} assets into {PACK_NAME}")
+
+
+if __name__ == "__main__":
+    main()
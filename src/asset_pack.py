@@ -0,0 +1,147 @@
+"""Implements the asset pack, one file that holds all assets the game loads.
+
+The pack starts with a header index of the name, offset, length and SHA-256 hash of every asset,
+followed by the contents of the assets. It is opened once and memory-mapped, so reading an asset is
+a ``memoryview`` slice of the mapping instead of opening and reading a file on slow storage.
+
+Layout, all integers little endian::
+
+    magic (8 bytes) | entry count (uint32)
+    per entry: name length (uint16) | name (UTF-8) | offset (uint64) | length (uint64) | hash
+    contents
+
+Run ``python -m src.asset_pack <pack>`` to list the assets of a pack and check their hashes.
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import typing
+
+PACK_NAME = "assets.pack"
+"""The file name of the asset pack next to the raw assets."""
+
+MAGIC = b"BEEPACK1"
+"""The first bytes of an asset pack."""
+
+HEADER = struct.Struct("<8sI")
+"""The magic and the number of entries."""
+
+NAME = struct.Struct("<H")
+"""The length of the name of an entry."""
+
+ENTRY = struct.Struct("<QQ32s")
+"""The offset, length and hash of an entry."""
+
+
+class PackEntry(typing.NamedTuple):
+    """The place of an asset in the pack."""
+
+    offset: int
+    length: int
+    digest: bytes
+
+
+class AssetPack:
+    """A memory-mapped asset pack.
+
+    The slices returned by ``get`` point into the mapping; they have to be released before the
+    pack is closed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self.entries: dict[str, PackEntry] = {}
+        try:
+            self._read_index()
+        except (struct.error, UnicodeDecodeError, ValueError) as error:
+            self.close()
+            raise ValueError(f"{path} is not a valid asset pack") from error
+
+    def _read_index(self):
+        """Reads the header index without copying the contents."""
+        magic, count = HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError("Unknown magic")
+        position = HEADER.size
+        for _ in range(count):
+            (length,) = NAME.unpack_from(self._view, position)
+            position += NAME.size
+            name = bytes(self._view[position : position + length]).decode()
+            position += length
+            entry = PackEntry(*ENTRY.unpack_from(self._view, position))
+            position += ENTRY.size
+            if entry.offset + entry.length > len(self._view):
+                raise ValueError(f"{name} ends after the pack")
+            self.entries[name] = entry
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def get(self, name: str) -> memoryview:
+        """Returns the contents of an asset without copying them."""
+        offset, length, _ = self.entries[name]
+        return self._view[offset : offset + length]
+
+    def verify(self) -> list[str]:
+        """Returns the names of the assets whose contents do not match their hash."""
+        return [
+            name
+            for name, entry in self.entries.items()
+            if hashlib.sha256(self.get(name)).digest() != entry.digest
+        ]
+
+    def close(self):
+        """Unmaps the pack."""
+        self._view.release()
+        self._map.close()
+
+
+def write_pack(path: str, files: dict[str, str]):
+    """Packs the given files under their names; the pack is replaced atomically."""
+    contents = {}
+    for name, source in files.items():
+        with open(source, "rb") as file:
+            contents[name] = file.read()
+
+    index_size = HEADER.size + sum(
+        NAME.size + len(name.encode()) + ENTRY.size for name in contents
+    )
+    index = [HEADER.pack(MAGIC, len(contents))]
+    offset = index_size
+    for name, data in contents.items():
+        encoded = name.encode()
+        index.append(NAME.pack(len(encoded)) + encoded)
+        index.append(ENTRY.pack(offset, len(data), hashlib.sha256(data).digest()))
+        offset += len(data)
+
+    with open(f"{path}.tmp", "wb") as file:
+        file.writelines(index)
+        file.writelines(contents.values())
+    os.replace(f"{path}.tmp", path)
+
+
+def main(argv: list[str] | None = None):
+    """Lists the assets of a pack and checks their hashes."""
+    parser = argparse.ArgumentParser(description="List the assets of a BeeLazy pack.")
+    parser.add_argument("pack", help="path of the asset pack")
+    args = parser.parse_args(argv)
+
+    pack = AssetPack(args.pack)
+    for name, entry in pack.entries.items():
+        print(f"{entry.offset:>10} {entry.length:>10} {name}")
+    broken = pack.verify()
+    print(
+        f"{len(pack.entries)} assets, {len(broken)} broken"
+        + "".join(f"\n  {name}" for name in broken)
+    )
+    pack.close()
+
+
+if __name__ == "__main__":
+    main()
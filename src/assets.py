@@ -0,0 +1,106 @@
+"""Implements loading the assets built by ``src.asset_build`` by name.
+
+The assets are read from the memory-mapped asset pack when it was built with
+``python -m src.asset_build --pack``; during development they are read from the loose files. All
+paths are relative to the project, not to the working directory.
+"""
+
+import functools
+import io
+import json
+import os
+import posixpath
+
+from kivy.core.image import Image as CoreImage
+from kivy.graphics.texture import (  # pylint: disable=no-name-in-module
+    Texture,
+    TextureRegion,
+)
+
+from src.asset_pack import PACK_NAME, AssetPack
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
+"""Directory of the raw assets and the sounds."""
+
+BUILD_DIR = os.path.join(ASSET_DIR, "build")
+"""Directory of the built assets."""
+
+PACK_PATH = os.path.join(ASSET_DIR, PACK_NAME)
+"""Path of the asset pack."""
+
+
+@functools.cache
+def pack() -> AssetPack | None:
+    """Opens the asset pack once; without a pack the loose files are used."""
+    return AssetPack(PACK_PATH) if os.path.exists(PACK_PATH) else None
+
+
+def read(name: str) -> memoryview:
+    """Returns the contents of a built asset, a slice of the pack or of its loose file."""
+    archive = pack()
+    if archive:
+        return archive.get(name)
+    with open(os.path.join(BUILD_DIR, *name.split("/")), "rb") as file:
+        return memoryview(file.read())
+
+
+@functools.cache
+def manifest() -> dict:
+    """Returns the manifest of the built assets."""
+    return json.loads(bytes(read("manifest.json")))
+
+
+def tier_for(height: float) -> str:
+    """Returns the smallest resolution tier that covers a window of the given height."""
+    heights = manifest()["heights"]
+    # the largest tier for windows larger than all tiers
+    return min(
+        heights, key=lambda tier: (heights[tier] < height, abs(heights[tier] - height))
+    )
+
+
+def texture(name: str) -> Texture:
+    """Decodes a built image into a texture."""
+    # the image providers decode from a file object, which gets its own copy of the bytes
+    data = io.BytesIO(read(name))
+    return CoreImage(data, ext=posixpath.splitext(name)[1][1:], filename=name).texture
+
+
+@functools.cache
+def atlas(tier: str) -> dict[str, TextureRegion]:
+    """Loads the frames of the sprite atlas of a resolution tier once."""
+    path = manifest()["tiers"][tier]["atlas"]
+    regions = {}
+    for page, ids in json.loads(bytes(read(path))).items():
+        page_texture = texture(posixpath.join(posixpath.dirname(path), page))
+        for name, coords in ids.items():
+            regions[name] = page_texture.get_region(*coords)
+    return regions
+
+
+def frames(sprite: str, tier: str) -> list:
+    """Returns the animation frames of a sprite as texture regions."""
+    regions = atlas(tier)
+    return [regions[name] for name in manifest()["sprites"][sprite]]
+
+
+def image(name: str, tier: str) -> Texture:
+    """Returns the texture of a built image."""
+    return texture(manifest()["tiers"][tier][name])
+
+
+def sound(name: str, cache_dir: str) -> str:
+    """Returns a path of a sound that the audio providers, which only open files, can load.
+
+    A sound in the pack is extracted into ``cache_dir`` once for every version of it.
+    """
+    archive = pack()
+    if not archive or name not in archive:
+        return os.path.join(ASSET_DIR, name)
+    path = os.path.join(cache_dir, f"{archive.entries[name].digest.hex()[:16]}-{name}")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(f"{path}.tmp", "wb") as file:
+            file.write(archive.get(name))
+        os.replace(f"{path}.tmp", path)
+    return path
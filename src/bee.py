@@ -1,32 +1,117 @@
 """Implements the bee with its animation."""
 
 import collections
+import math
 import typing
 
-from kivy.clock import Clock
-from kivy.core.image import Image as CoreImage
-from kivy.core.window import Window
 from kivy.uix.image import Image
 
-HITBOX_OFFSET = 85
+from src import assets, viewport
+from src.rules import (
+    BEE_X,
+    FLY_VELOCITY,
+    GRAVITY,
+    HITBOX_OFFSET,
+    SPRITE_SIZE,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+
+
+def hits(hitbox: tuple, other: tuple) -> bool:
+    """Checks if a bee hitbox overlaps the visible part of another ``(x, y, width, height)``."""
+
+    left, right, bottom, top = hitbox
+    rect_x, rect_y, rect_width, rect_height = other
+    return (
+        left < rect_x + rect_width
+        and right > rect_x
+        and bottom < rect_y + rect_height - HITBOX_OFFSET
+        and top > rect_y
+    )
+
+
+def overlap_interval(
+    low: float, high: float, other_low: float, other_high: float, distance: float
+) -> tuple[float, float]:
+    """Returns when two intervals on one axis overlap while the first moves by ``distance``.
+
+    The times are fractions of the movement and may lie outside of it; the interval is empty if
+    they never overlap.
+    """
+
+    if not distance:
+        return (
+            (-math.inf, math.inf) if low < other_high and high > other_low else (1, 0)
+        )
+    enter, leave = (other_low - high) / distance, (other_high - low) / distance
+    return (enter, leave) if distance > 0 else (leave, enter)
+
+
+def sweep(
+    hitbox: tuple, motion: tuple, other: tuple, other_motion: tuple
+) -> float | None:
+    """Returns when a bee hitbox first touches another rectangle while both move in a straight line.
+
+    ``hitbox`` and ``other`` are given like for ``hits`` at the start of the tick and move by
+    ``motion`` and ``other_motion`` during it. The result is the time of impact as a fraction of the
+    tick, 0 if they overlap from the start, or None if they do not meet, no matter how far they
+    move within the tick.
+    """
+
+    rect_x, rect_y, rect_width, rect_height = other
+    x_start, x_end = overlap_interval(
+        hitbox[0], hitbox[1], rect_x, rect_x + rect_width, motion[0] - other_motion[0]
+    )
+    y_start, y_end = overlap_interval(
+        hitbox[2],
+        hitbox[3],
+        rect_y,
+        rect_y + rect_height - HITBOX_OFFSET,
+        motion[1] - other_motion[1],
+    )
+    start, end = max(x_start, y_start, 0), min(x_end, y_end, 1)
+    return start if start < end else None
+
+
+class ReplayInput:  # pylint: disable=too-few-public-methods
+    """An input source that replays the recorded flying state of a bee, e.g. for ghost runs.
+
+    The game counts its ticks from 1, so the state of tick ``t`` is recorded at index ``t - 1``.
+    """
+
+    def __init__(self, recording: typing.Sequence[bool]):
+        self.recording = recording
+
+    def __call__(self, tick: int) -> bool:
+        return 0 < tick <= len(self.recording) and self.recording[tick - 1]
 
 
 class Bee(Image):
     """The main protoganist of the game which is a bee.
 
-    The bee is an animated spritesheet that must not coolide with obstacles.
+    The bee is an animated spritesheet that must not coolide with obstacles. Bees without an
+    ``input_source`` are steered by touch, the others ask their input source every tick whether to
+    fly.
     """
 
     old_move_pos = None
-    last_positions: typing.Deque = collections.deque(maxlen=10)
     invincible = False
+    sprite = "bee"
 
     def __init__(self, **kwargs):
+        # the frames of every resolution tier fill the widget
+        kwargs.setdefault("fit_mode", "contain")
         super().__init__(**kwargs)
-        self.size = (260, 260)
+        self.last_positions: typing.Deque = collections.deque(maxlen=10)
+        self.input_source: typing.Callable[[int], bool] | None = None
+        self.power_up_timer: typing.Any = None
+        self.alive = True
+        self.size = (SPRITE_SIZE, SPRITE_SIZE)
         self.velocity = [0, 0]
+        self.motion = (0.0, 0.0)
         self.score = 0
-        self.pos = (200, Window.height / 2)
+        self.pos = (BEE_X, WORLD_HEIGHT / 2)
         self.flying = False
         self.moving = False
         self.frames = []
@@ -34,22 +119,11 @@ class Bee(Image):
         self.anim_delay = 0.1
         self.load_spritesheet()
         self.bind(on_texture=self.update_texture)
-        Clock.schedule_interval(self.update_frame, self.anim_delay)
 
     def load_spritesheet(self):
-        """Load spritesheet image and split it into individual frames."""
+        """Load the animation frames from the sprite atlas."""
 
-        texture = CoreImage("./assets/bee.png").texture
-        cols, rows = 2, 4  # 2x4 grid of frames in the spritesheet
-        frame_width, frame_height = texture.width / cols, texture.height / rows
-
-        for row in range(rows):
-            for col in range(cols):
-                x_axis = col * frame_width
-                # Invert y-axis to match Kivy's coordinate system
-                y_axis = (rows - row - 1) * frame_height
-                frame = texture.get_region(x_axis, y_axis, frame_width, frame_height)
-                self.frames.append(frame)
+        self.frames = assets.frames("bee", viewport.current.tier)
 
         self.texture = self.frames[
             self.frame_idx
@@ -67,32 +141,41 @@ class Bee(Image):
         del instance, value
         self.texture = self.frames[self.frame_idx]
 
-    def check_collision(self, other) -> bool:
-        """Checks if the bee collided with an obstacle."""
+    def hitbox(self) -> tuple:
+        """Returns the visible part of the bee as ``(left, right, bottom, top)``."""
 
         sprite_x, sprite_y = self.pos
         sprite_width, sprite_height = self.size
-        rect_x, rect_y = other.pos
-        rect_width, rect_height = other.size
-
-        # Check for overlap of visible parts
         return (
-            sprite_x < rect_x + rect_width
-            and sprite_x + sprite_width - HITBOX_OFFSET > rect_x
-            and sprite_y < rect_y + rect_height - HITBOX_OFFSET
-            and sprite_y + sprite_height - HITBOX_OFFSET > rect_y
-            and not self.invincible
+            sprite_x,
+            sprite_x + sprite_width - HITBOX_OFFSET,
+            sprite_y,
+            sprite_y + sprite_height - HITBOX_OFFSET,
         )
 
+    def check_collision(self, other) -> bool:
+        """Checks if the bee collided with an obstacle."""
+
+        # Check for overlap of visible parts
+        return not self.invincible and hits(self.hitbox(), (*other.pos, *other.size))
+
+    def hovering(self, count: int = 5, tolerance: float = 5) -> bool:
+        """Checks if the bee stayed at nearly the same height during the last ticks."""
+
+        if not self.last_positions:
+            return False
+        recent = list(self.last_positions)[-count:]
+        return max(recent) - min(recent) <= tolerance
+
     def update(self):
         """Updates the bees position."""
 
         if self.flying:
-            self.velocity[1] = 10  # set upward velocity
+            self.velocity[1] = FLY_VELOCITY  # set upward velocity
         if self.moving:
             self.velocity[1] = 0  # moving to the right or left
         else:
-            self.velocity[1] -= 0.5  # apply gravity
+            self.velocity[1] -= GRAVITY  # apply gravity
 
         self.last_positions.append(self.pos[1])
         # when the y position stays the same we will fall
@@ -103,13 +186,14 @@ class Bee(Image):
         new_y_pos = self.pos[1] + self.velocity[1]
 
         # check if bee exceeds screen
-        if new_y_pos >= Window.height - self.size[1] / 2:
-            new_y_pos = Window.height - self.size[1] / 2
-        if new_x_pos >= Window.width - self.size[0] / 2:
-            new_x_pos = Window.width - self.size[0] / 2
+        if new_y_pos >= WORLD_HEIGHT - self.size[1] / 2:
+            new_y_pos = WORLD_HEIGHT - self.size[1] / 2
+        if new_x_pos >= WORLD_WIDTH - self.size[0] / 2:
+            new_x_pos = WORLD_WIDTH - self.size[0] / 2
         if new_x_pos <= 0 - self.size[0] / 2:
             new_x_pos = 0 - self.size[0] / 2
 
+        self.motion = (new_x_pos - self.pos[0], new_y_pos - self.pos[1])
         self.pos = (new_x_pos, new_y_pos)
 
     def fly(self):
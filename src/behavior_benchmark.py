@@ -0,0 +1,121 @@
+"""Implements a benchmark of moving obstacles with mixed behaviors.
+
+``src.behaviors.step``, which looks up the step function of every obstacle by its kind, is
+compared with a baseline that branches on the kind, the way an ``update`` with one branch per
+behavior would. Both move the same
+obstacle widgets, so the difference is the cost of the dispatch and not of the widget updates.
+The implementations take turns for a number of rounds and the fastest round of each is reported.
+"""
+
+import argparse
+import itertools
+import math
+import os
+import time
+import typing
+
+# the benchmark parses its own arguments
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+# pylint: disable=wrong-import-position
+from src import behaviors
+from src.behaviors import BEHAVIORS, Moving
+from src.obstacle import Obstacle
+from src.rules import WORLD_HEIGHT, WORLD_WIDTH
+
+TICK = 1 / 60
+"""Seconds of game time per benchmarked tick."""
+
+
+class BehaviorResult(typing.NamedTuple):
+    """The result of moving the obstacles with one implementation."""
+
+    name: str
+    obstacles: int
+    ticks: int
+    tick_us: float
+
+
+def build_obstacles(count: int) -> list[Obstacle]:
+    """Builds obstacles that cycle through all behaviors."""
+    obstacles = []
+    for index, behavior in zip(range(count), itertools.cycle(BEHAVIORS.values())):
+        obstacle = Obstacle()
+        obstacle.launch(
+            WORLD_WIDTH * index / count, (index * 97) % WORLD_HEIGHT, behavior, 0
+        )
+        obstacles.append(obstacle)
+    return obstacles
+
+
+def step_each(obstacles: typing.Iterable[Moving], now: float, target_y: float | None):
+    """Moves the obstacles with one branch per kind of behavior."""
+    for obstacle in obstacles:
+        behavior = obstacle.behavior
+        x_pos, y_pos = obstacle.pos
+        if behavior.kind == "sine":
+            height = obstacle.base_y + behavior.amplitude * math.sin(
+                2 * math.pi * now / behavior.period + obstacle.phase
+            )
+        elif behavior.kind == "dive" and target_y is not None:
+            height = y_pos + max(
+                -behavior.dive_speed, min(behavior.dive_speed, target_y - y_pos)
+            )
+        else:
+            height = y_pos
+        obstacle.motion = (-obstacle.velocity, height - y_pos)
+        obstacle.pos = (x_pos - obstacle.velocity, height)
+
+
+IMPLEMENTATIONS: dict[str, typing.Callable] = {
+    "steps": behaviors.step,
+    "branches": step_each,
+}
+"""The implementations that are compared by name."""
+
+
+def run(step: typing.Callable, obstacles: list[Obstacle], ticks: int) -> float:
+    """Moves the obstacles for a number of ticks and returns the microseconds per tick."""
+    start = time.perf_counter()
+    for tick in range(ticks):
+        step(obstacles, tick * TICK, WORLD_HEIGHT / 2)
+        for obstacle in obstacles:
+            if obstacle.pos[0] < -obstacle.size[0]:
+                obstacle.pos = (WORLD_WIDTH, obstacle.pos[1])
+    return (time.perf_counter() - start) / ticks * 1e6
+
+
+def benchmark(
+    obstacles: int = 300, ticks: int = 600, rounds: int = 3
+) -> list[BehaviorResult]:
+    """Moves the same obstacles with every implementation and returns the results."""
+    moving = build_obstacles(obstacles)
+    times: dict[str, list[float]] = {name: [] for name in IMPLEMENTATIONS}
+    for _ in range(rounds):
+        for name, step in IMPLEMENTATIONS.items():
+            times[name].append(run(step, moving, ticks))
+    return [
+        BehaviorResult(name, obstacles, ticks, min(tick_us))
+        for name, tick_us in times.items()
+    ]
+
+
+def main(argv: list[str] | None = None):
+    """Prints the time per tick of every implementation."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark moving obstacles with mixed behaviors."
+    )
+    parser.add_argument("--obstacles", type=int, default=300)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for result in benchmark(args.obstacles, args.ticks, args.rounds):
+        print(
+            f"{result.name}: {result.tick_us:.1f} us per tick "
+            f"for {result.obstacles} obstacles"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Implements the motion patterns of the obstacles, declared as data.
+
+A ``Behavior`` describes how an obstacle moves. Every tick each obstacle is moved by the step
+function of the kind of its behavior, so a new motion pattern is an entry in ``BEHAVIORS``, or one
+step function for a new kind, instead of another branch in the loop of the game. All obstacles
+fly to the left at their velocity; the kinds differ in how they move vertically.
+"""
+
+import math
+import typing
+
+from src import rng
+from src.rules import SPRITE_SIZE
+
+
+class Behavior(typing.NamedTuple):
+    """A motion pattern of obstacles."""
+
+    kind: str
+    """The step function that moves the obstacles: ``linear``, ``sine`` or ``dive``."""
+    amplitude: float = 0.0
+    """Vertical amplitude of a ``sine`` wave in world units."""
+    period: float = 1.0
+    """Seconds of one ``sine`` wave."""
+    dive_speed: float = 0.0
+    """Vertical speed per tick at which a ``dive`` obstacle heads for the bee."""
+    members: int = 1
+    """The number of obstacles that are spawned together as a formation."""
+    spacing: float = 0.0
+    """Horizontal distance between the members of a formation."""
+    min_score: int = 0
+    """The score from which the behavior is spawned."""
+    weight: float = 1.0
+    """The chance of the behavior relative to the other available behaviors."""
+
+
+BEHAVIORS = {
+    "straight": Behavior("linear"),
+    "wave": Behavior("sine", amplitude=120, period=2, min_score=5),
+    "dive": Behavior("dive", dive_speed=2, min_score=10, weight=0.5),
+    "formation": Behavior(
+        "sine",
+        amplitude=80,
+        period=3,
+        members=3,
+        spacing=2 * SPRITE_SIZE,
+        min_score=15,
+        weight=0.5,
+    ),
+}
+"""The behaviors of the obstacles by name."""
+
+
+class Moving(typing.Protocol):  # pylint: disable=too-few-public-methods
+    """An obstacle as seen by the step functions."""
+
+    pos: tuple[float, float]
+    velocity: float
+    behavior: Behavior
+    base_y: float
+    phase: float
+    motion: tuple[float, float]
+
+
+def available(score: int, free: int) -> list[Behavior]:
+    """Returns the behaviors a new obstacle can have at a score.
+
+    Only formations that fit into ``free`` obstacle slots are available.
+    """
+    return [
+        behavior
+        for behavior in BEHAVIORS.values()
+        if behavior.min_score <= score and behavior.members <= free
+    ]
+
+
+def choose(score: int, free: int) -> Behavior:
+    """Picks the behavior of a new obstacle among those available at a score."""
+    candidates = available(score, free)
+    return rng.gameplay.choices(
+        candidates, [behavior.weight for behavior in candidates]
+    )[0]
+
+
+def phase(behavior: Behavior, time: float) -> float:
+    """Returns the phase that starts the wave of a behavior at its base height at ``time``."""
+    return -2 * math.pi * time / behavior.period
+
+
+def linear(
+    behavior: Behavior, obstacle: Moving, time: float, target_y: float | None
+) -> float:
+    """Keeps the height of an obstacle."""
+    del behavior, time, target_y
+    return obstacle.pos[1]
+
+
+def sine(
+    behavior: Behavior, obstacle: Moving, time: float, target_y: float | None
+) -> float:
+    """Moves an obstacle on a sine wave around its base height."""
+    del target_y
+    return obstacle.base_y + behavior.amplitude * math.sin(
+        2 * math.pi * time / behavior.period + obstacle.phase
+    )
+
+
+def dive(
+    behavior: Behavior, obstacle: Moving, time: float, target_y: float | None
+) -> float:
+    """Turns an obstacle toward the height of the bee."""
+    del time
+    height = obstacle.pos[1]
+    if target_y is None:
+        return height
+    speed = behavior.dive_speed
+    return height + max(-speed, min(speed, target_y - height))
+
+
+Step = typing.Callable[[Behavior, Moving, float, float | None], float]
+"""A step function; it returns the new height of an obstacle."""
+
+STEPS: dict[str, Step] = {
+    "linear": linear,
+    "sine": sine,
+    "dive": dive,
+}
+"""The step functions by kind."""
+
+
+def step(obstacles: typing.Iterable[Moving], time: float, target_y: float | None):
+    """Moves the obstacles by one tick at game time ``time``.
+
+    ``target_y`` is the height the diving obstacles head for. The motion of every obstacle during
+    the tick is stored for the collision checks.
+    """
+    for obstacle in obstacles:
+        behavior = obstacle.behavior
+        x_pos, y_pos = obstacle.pos
+        height = STEPS[behavior.kind](behavior, obstacle, time, target_y)
+        obstacle.motion = (-obstacle.velocity, height - y_pos)
+        obstacle.pos = (x_pos - obstacle.velocity, height)
@@ -0,0 +1,369 @@
+"""Implements a vectorized, headless version of the game for training agents.
+
+``BeeLazyEnv`` runs many independent games in lockstep on NumPy arrays instead of Kivy widgets.
+It follows the rules of ``src.rules`` and the gym vector API: ``reset()`` returns the
+observations and ``step(actions)`` returns observations, rewards, dones and infos, resetting
+finished games automatically. The obstacles move with the behaviors of ``src.behaviors`` and
+collide along their motion like in ``Game.update_obstacles``.
+"""
+
+import numpy as np
+
+from src.behaviors import BEHAVIORS, Behavior, available, phase
+from src.rules import (
+    BEE_X,
+    FLY_VELOCITY,
+    GRAVITY,
+    HITBOX_OFFSET,
+    INVINCIBLE_DURATION,
+    OBSTACLE_SPEED,
+    POWER_UP_CHANCE,
+    POWER_UP_SIZE,
+    POWER_UP_VELOCITY,
+    SCORE_PER_OBSTACLE,
+    SCORE_PER_REINFORCEMENT,
+    SPRITE_SIZE,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+from src.timer_wheel import TICK
+
+MAX_OBSTACLES = 5
+"""The maximum number of obstacles in one game."""
+
+BEHAVIOR_LIST = tuple(BEHAVIORS.values())
+"""The behaviors by their index in ``BeeLazyEnv.obstacle_behavior``."""
+
+NEAREST_OBSTACLES = 2
+"""Number of obstacles ahead of the bee that are part of the observation."""
+
+HOVER_TICKS = 5
+"""An obstacle targets the bee when it stayed at the same height for this many ticks."""
+
+STILL_TICKS = 10
+"""A bee that could not move for this many ticks starts to fall."""
+
+
+def overlaps(bee_y, rect_x, rect_y, rect_size):
+    """Checks the bee hitbox against rectangles like ``Bee.check_collision``."""
+    return (
+        (BEE_X < rect_x + rect_size)
+        & (BEE_X + SPRITE_SIZE - HITBOX_OFFSET > rect_x)
+        & (bee_y < rect_y + rect_size - HITBOX_OFFSET)
+        & (bee_y + SPRITE_SIZE - HITBOX_OFFSET > rect_y)
+    )
+
+
+def overlap_intervals(low, high, other_low, other_high, distance):
+    """Returns when intervals overlap while the first ones move, like ``bee.overlap_interval``."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        enter, leave = (other_low - high) / distance, (other_high - low) / distance
+    overlapping = (low < other_high) & (high > other_low)
+    still = distance == 0
+    return (
+        np.where(
+            still,
+            np.where(overlapping, -np.inf, 1),
+            np.where(distance > 0, enter, leave),
+        ),
+        np.where(
+            still,
+            np.where(overlapping, np.inf, 0),
+            np.where(distance > 0, leave, enter),
+        ),
+    )
+
+
+def sweeps(bee_y, bee_motion, rect, rect_motion, rect_size):
+    """Checks the bee hitbox against moving rectangles along their motion like ``bee.sweep``.
+
+    The rectangles start at the ``(x, y)`` pair ``rect``; during the tick the bees move vertically
+    by ``bee_motion`` and the rectangles by the ``(x, y)`` pair ``rect_motion``.
+    """
+    rect_x, rect_y = rect
+    x_start, x_end = overlap_intervals(
+        BEE_X,
+        BEE_X + SPRITE_SIZE - HITBOX_OFFSET,
+        rect_x,
+        rect_x + rect_size,
+        -rect_motion[0],
+    )
+    y_start, y_end = overlap_intervals(
+        bee_y,
+        bee_y + SPRITE_SIZE - HITBOX_OFFSET,
+        rect_y,
+        rect_y + rect_size - HITBOX_OFFSET,
+        bee_motion - rect_motion[1],
+    )
+    return np.maximum(np.maximum(x_start, y_start), 0) < np.minimum(
+        np.minimum(x_end, y_end), 1
+    )
+
+
+class BeeLazyEnv:
+    """Runs ``num_envs`` games in lockstep without rendering.
+
+    Actions are 1 to fly and 0 to fall. Each step repeats the action for ``frame_skip`` ticks and
+    rewards every passed obstacle with 1 and a crash with -1. At most ``max_obstacles`` obstacles
+    fly at once, like the quality tiers cap them in the game.
+    """
+
+    observation_size = 5 + 3 * NEAREST_OBSTACLES
+
+    def __init__(
+        self,
+        num_envs: int = 16,
+        frame_skip: int = 1,
+        size: tuple[int, int] = (WORLD_WIDTH, WORLD_HEIGHT),
+        seed: int | None = None,
+        max_obstacles: int = MAX_OBSTACLES,
+    ):
+        self.num_envs = num_envs
+        self.frame_skip = frame_skip
+        self.max_obstacles = min(max_obstacles, MAX_OBSTACLES)
+        self.width, self.height = size
+        self.rng = np.random.default_rng(seed)
+
+        shape = (num_envs, MAX_OBSTACLES)
+        self.bee_y = np.zeros(num_envs)
+        self.bee_velocity = np.zeros(num_envs)
+        self.recent_y = np.zeros((num_envs, max(HOVER_TICKS, STILL_TICKS)))
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.ticks = np.zeros(num_envs, dtype=np.int64)
+        self.invincible = np.zeros(num_envs, dtype=np.int64)
+        self.power_up = np.zeros((num_envs, 2))
+        self.power_up_active = np.zeros(num_envs, dtype=bool)
+        self.obstacles = np.zeros(shape + (3,))
+        self.obstacle_active = np.zeros(shape, dtype=bool)
+        self.obstacle_passed = np.zeros(shape, dtype=bool)
+        self.obstacle_behavior = np.zeros(shape, dtype=np.int64)
+        self.obstacle_base_y = np.zeros(shape)
+        self.obstacle_phase = np.zeros(shape)
+
+    def reset(self) -> np.ndarray:
+        """Starts all games from scratch and returns their observations."""
+        self._reset(np.ones(self.num_envs, dtype=bool))
+        return self.observe()
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Advances all games by ``frame_skip`` ticks.
+
+        The infos contain the final ``score`` and ``ticks`` of every game that ended in this step,
+        before it was reset, and whether its bee ``fell`` instead of hitting an obstacle.
+        """
+        flying = np.asarray(actions, dtype=bool)
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        for _ in range(self.frame_skip):
+            passed, crashed = self._tick(flying, ~dones)
+            rewards += passed - crashed
+            dones |= crashed
+        infos = {
+            "score": self.score.copy(),
+            "ticks": self.ticks.copy(),
+            "fell": self.bee_y < -SPRITE_SIZE,
+        }
+        self._reset(dones)
+        return self.observe(), rewards, dones, infos
+
+    def observe(self) -> np.ndarray:
+        """Returns the bee, the power up and the nearest obstacles ahead, scaled to about [-1, 1].
+
+        Missing obstacles and power ups are reported one screen width away.
+        """
+        observation = np.empty((self.num_envs, self.observation_size), dtype=np.float32)
+        observation[:, 0] = self.bee_y / self.height
+        observation[:, 1] = self.bee_velocity / FLY_VELOCITY
+        observation[:, 2] = self.invincible > 0
+        observation[:, 3] = np.where(
+            self.power_up_active, (self.power_up[:, 0] - BEE_X) / self.width, 1
+        )
+        observation[:, 4] = (self.power_up[:, 1] - self.bee_y) / self.height
+
+        ahead = self.obstacle_active & (self.obstacles[:, :, 0] + SPRITE_SIZE > BEE_X)
+        distance = np.where(ahead, self.obstacles[:, :, 0], np.inf)
+        nearest = np.argsort(distance, axis=1)[:, :NEAREST_OBSTACLES]
+        rows = np.arange(self.num_envs)[:, None]
+        found = ahead[rows, nearest]
+        obstacles = self.obstacles[rows, nearest]
+        observation[:, 5::3] = np.where(
+            found, (obstacles[:, :, 0] - BEE_X) / self.width, 1
+        )
+        observation[:, 6::3] = np.where(
+            found, (obstacles[:, :, 1] - self.bee_y[:, None]) / self.height, 0
+        )
+        observation[:, 7::3] = np.where(
+            found, obstacles[:, :, 2] / OBSTACLE_SPEED[1], 0
+        )
+        return observation
+
+    def _reset(self, mask: np.ndarray):
+        """Starts the masked games from scratch."""
+        self.bee_y[mask] = self.height / 2
+        self.bee_velocity[mask] = 0
+        self.recent_y[mask] = np.nan
+        self.score[mask] = 0
+        self.ticks[mask] = 0
+        self.invincible[mask] = 0
+        self.power_up_active[mask] = False
+        self.obstacle_active[mask] = False
+
+    def _tick(self, flying: np.ndarray, running: np.ndarray) -> tuple:
+        """Advances the running games by one tick and returns the passed obstacles and crashes."""
+        self.ticks += running
+
+        # bee: a bee pinned to the top for a while falls even when flying, like Bee.update
+        still = np.all(self.recent_y[:, -STILL_TICKS:] == self.bee_y[:, None], axis=1)
+        velocity = np.where(flying & ~still, FLY_VELOCITY, self.bee_velocity) - GRAVITY
+        self.bee_velocity = np.where(running, velocity, self.bee_velocity)
+        self.recent_y[running] = np.roll(self.recent_y[running], -1, axis=1)
+        self.recent_y[running, -1] = self.bee_y[running]
+        bee_y = self.bee_y
+        self.bee_y = np.where(
+            running,
+            np.minimum(self.bee_y + self.bee_velocity, self.height - SPRITE_SIZE / 2),
+            self.bee_y,
+        )
+        self.invincible = np.where(
+            running, np.maximum(self.invincible - 1, 0), self.invincible
+        )
+
+        self._tick_power_ups(running)
+        self._spawn_obstacles(running)
+
+        # obstacles: move, leave the screen, score and collide; like in the game an obstacle
+        # that leaves the screen still counts in its last tick
+        start = self.obstacles[:, :, :2].copy()
+        self._move_obstacles(running)
+        active = self.obstacle_active
+        self.obstacle_active = active & (self.obstacles[:, :, 0] >= -SPRITE_SIZE)
+        passed = (
+            active
+            & ~self.obstacle_passed
+            & (BEE_X > self.obstacles[:, :, 0] + SPRITE_SIZE)
+            & running[:, None]
+        )
+        self.obstacle_passed |= passed
+        passed_count = passed.sum(axis=1)
+        self.score += passed_count
+        hit = active & sweeps(
+            bee_y[:, None],
+            (self.bee_y - bee_y)[:, None],
+            (start[:, :, 0], start[:, :, 1]),
+            (
+                self.obstacles[:, :, 0] - start[:, :, 0],
+                self.obstacles[:, :, 1] - start[:, :, 1],
+            ),
+            SPRITE_SIZE,
+        )
+        crashed = running & (
+            (hit.any(axis=1) & (self.invincible == 0)) | (self.bee_y < -SPRITE_SIZE)
+        )
+        return passed_count, crashed
+
+    def _tick_power_ups(self, running: np.ndarray):
+        """Spawns, moves and collects the power ups of the running games."""
+        spawn = (
+            running
+            & ~self.power_up_active
+            & (self.invincible == 0)
+            & (self.rng.integers(0, POWER_UP_CHANCE + 1, self.num_envs) == 0)
+        )
+        self.power_up[spawn, 0] = self.width
+        self.power_up[spawn, 1] = self.rng.integers(
+            POWER_UP_SIZE, self.height - POWER_UP_SIZE, int(spawn.sum()), endpoint=True
+        )
+        self.power_up_active |= spawn
+
+        self.power_up[:, 0] -= np.where(running, POWER_UP_VELOCITY, 0)
+        self.power_up_active &= self.power_up[:, 0] >= -POWER_UP_SIZE
+        collected = (
+            running
+            & self.power_up_active
+            & (self.invincible == 0)
+            & overlaps(
+                self.bee_y, self.power_up[:, 0], self.power_up[:, 1], POWER_UP_SIZE
+            )
+        )
+        self.power_up_active &= ~collected
+        self.invincible[collected] = round(INVINCIBLE_DURATION / TICK)
+
+    def _move_obstacles(self, running: np.ndarray):
+        """Moves the obstacles of the running games by one tick like ``behaviors.step``.
+
+        The diving obstacles head for the bee of their game.
+        """
+        heights = self.obstacles[:, :, 1]
+        time = self.ticks[:, None] * TICK
+        moved = heights
+        for index, behavior in enumerate(BEHAVIOR_LIST):
+            group = self.obstacle_behavior == index
+            if behavior.kind == "sine":
+                angle = 2 * np.pi * time / behavior.period
+                moved = np.where(
+                    group,
+                    self.obstacle_base_y
+                    + behavior.amplitude * np.sin(angle + self.obstacle_phase),
+                    moved,
+                )
+            elif behavior.kind == "dive":
+                speed = behavior.dive_speed
+                moved = np.where(
+                    group,
+                    heights + np.clip(self.bee_y[:, None] - heights, -speed, speed),
+                    moved,
+                )
+        self.obstacles[:, :, 0] -= np.where(
+            running[:, None], self.obstacles[:, :, 2], 0
+        )
+        self.obstacles[:, :, 1] = np.where(running[:, None], moved, heights)
+
+    def _spawn_obstacles(self, running: np.ndarray):
+        """Adds obstacles to every running game that has less than its score allows.
+
+        Like ``Game.spawn_obstacle`` the behavior is picked among those that fit into the free
+        slots, and the members of a formation share one height and speed.
+        """
+        free = np.ceil(
+            np.minimum(
+                np.where(self.score, self.score / SCORE_PER_OBSTACLE, 1),
+                self.max_obstacles,
+            )
+        ) - self.obstacle_active.sum(axis=1)
+        rows = np.flatnonzero(running & (free > 0))
+        if not rows.size:
+            return
+
+        recent = self.recent_y[rows, -HOVER_TICKS:]
+        hovering = np.max(recent, axis=1) - np.min(recent, axis=1) <= 5
+        random_y = self.rng.integers(
+            50, self.height - SPRITE_SIZE // 2, rows.size, endpoint=True
+        )
+        heights = np.where(hovering, self.bee_y[rows], random_y)
+        reinforcement = self.score[rows] / SCORE_PER_REINFORCEMENT + 1
+        speeds = reinforcement * self.rng.integers(
+            *OBSTACLE_SPEED, rows.size, endpoint=True
+        )
+        for row, height, speed in zip(rows.tolist(), heights, speeds):
+            candidates = available(int(self.score[row]), int(free[row]))
+            weights = np.array([behavior.weight for behavior in candidates])
+            self._launch(
+                row,
+                candidates[self.rng.choice(len(candidates), p=weights / weights.sum())],
+                height,
+                speed,
+            )
+
+    def _launch(self, row: int, behavior: Behavior, height: float, speed: float):
+        """Starts the members of a behavior in the free slots of a game."""
+        slots = np.flatnonzero(~self.obstacle_active[row])[: behavior.members]
+        self.obstacles[row, slots, 0] = (
+            self.width + np.arange(behavior.members) * behavior.spacing
+        )
+        self.obstacles[row, slots, 1] = height
+        self.obstacles[row, slots, 2] = speed
+        self.obstacle_behavior[row, slots] = BEHAVIOR_LIST.index(behavior)
+        self.obstacle_base_y[row, slots] = height
+        self.obstacle_phase[row, slots] = phase(behavior, self.ticks[row] * TICK)
+        self.obstacle_active[row, slots] = True
+        self.obstacle_passed[row, slots] = False
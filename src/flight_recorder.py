@@ -0,0 +1,182 @@
+"""Implements the flight recorder that keeps the last seconds of the game for diagnostics.
+
+Every tick writes one row into a ring buffer that is allocated once, so recording does not
+allocate. The buffer is dumped to a file on an unhandled exception, on a long frame and on game
+over. A dump is a JSON header line followed by the rows from the oldest to the newest as raw
+doubles; ``python -m src.flight_viewer <dump>`` plots it.
+"""
+
+import array
+import json
+import os
+import sys
+import threading
+import time
+import typing
+
+FIELDS = (
+    "tick",
+    "time",
+    "bee_y",
+    "bee_velocity",
+    "entities",
+    "score",
+    "tick_ms",
+    "frame_ms",
+    "inputs",
+)
+"""The columns of a row; ``inputs`` has bit ``i`` set while bee ``i`` flies."""
+
+CAPACITY = 600
+"""The number of rows the recorder keeps, 10 seconds at 60 ticks per second."""
+
+LONG_FRAME = 0.1
+"""Seconds between two ticks from which a frame counts as long and is dumped."""
+
+DUMP_INTERVAL = 10.0
+"""The fewest seconds between two dumps of long frames."""
+
+MAX_DUMPS = 20
+"""The number of dumps that are kept; older ones are deleted."""
+
+SUFFIX = ".flight"
+"""The file name extension of a dump."""
+
+
+class FlightRecorder:
+    """Records the last ``capacity`` ticks and dumps them into ``directory``."""
+
+    def __init__(
+        self,
+        directory: str,
+        capacity: int = CAPACITY,
+        long_frame: float = LONG_FRAME,
+        max_dumps: int = MAX_DUMPS,
+    ):
+        self.directory = directory
+        self.capacity = capacity
+        self.long_frame = long_frame
+        self.max_dumps = max_dumps
+        self.count = 0
+        self.dumps = 0
+        self.last_long_frame_dump = -DUMP_INTERVAL
+        self._rows = array.array("d", bytes(8 * len(FIELDS) * capacity))
+        self._hooks: tuple[typing.Callable, typing.Callable] | None = None
+
+    def record(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        tick: int,
+        now: float,
+        bee_y: float,
+        bee_velocity: float,
+        entities: int,
+        score: int,
+        tick_time: float,
+        frame_time: float,
+        inputs: int,
+    ):
+        """Writes the row of a tick over the oldest one and dumps a long frame."""
+        rows = self._rows
+        offset = self.count % self.capacity * len(FIELDS)
+        rows[offset] = tick
+        rows[offset + 1] = now
+        rows[offset + 2] = bee_y
+        rows[offset + 3] = bee_velocity
+        rows[offset + 4] = entities
+        rows[offset + 5] = score
+        rows[offset + 6] = tick_time * 1000
+        rows[offset + 7] = frame_time * 1000
+        rows[offset + 8] = inputs
+        self.count += 1
+        if frame_time > self.long_frame:
+            monotonic = time.monotonic()
+            if monotonic - self.last_long_frame_dump >= DUMP_INTERVAL:
+                self.last_long_frame_dump = monotonic
+                self.dump("long-frame")
+
+    def rows(self) -> list[tuple[float, ...]]:
+        """Returns the recorded rows from the oldest to the newest."""
+        ordered = self._ordered()
+        width = len(FIELDS)
+        return [
+            tuple(ordered[start : start + width])
+            for start in range(0, len(ordered), width)
+        ]
+
+    def _ordered(self) -> array.array:
+        """Returns the recorded values from the oldest row to the newest."""
+        if self.count <= self.capacity:
+            return self._rows[: self.count * len(FIELDS)]
+        split = self.count % self.capacity * len(FIELDS)
+        return self._rows[split:] + self._rows[:split]
+
+    def dump(self, reason: str) -> str:
+        """Writes the recorded rows to a new file and returns its path."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.dumps += 1
+        path = os.path.join(
+            self.directory, f"{time.time_ns() // 1000000}-{self.dumps}-{reason}{SUFFIX}"
+        )
+        ordered = self._ordered()
+        header = {
+            "reason": reason,
+            "time": time.time(),
+            "fields": FIELDS,
+            "rows": len(ordered) // len(FIELDS),
+            "byteorder": sys.byteorder,
+        }
+        with open(path, "wb") as file:
+            file.write(json.dumps(header).encode() + b"\n")
+            ordered.tofile(file)
+        self._prune()
+        return path
+
+    def _prune(self):
+        """Deletes the oldest dumps beyond ``max_dumps``."""
+        dumps = sorted(
+            (
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(SUFFIX)
+            ),
+            key=lambda entry: entry.stat().st_mtime_ns,
+        )
+        for entry in dumps[: -self.max_dumps]:
+            os.remove(entry.path)
+
+    def dump_on_exception(self):
+        """Dumps the rows when an exception is not handled, on any thread, until ``close``."""
+        previous = sys.excepthook, threading.excepthook
+
+        def excepthook(kind, value, traceback):
+            self.dump(f"exception-{kind.__name__}")
+            previous[0](kind, value, traceback)
+
+        def thread_excepthook(args):
+            self.dump(f"exception-{args.exc_type.__name__}")
+            previous[1](args)
+
+        sys.excepthook = excepthook
+        threading.excepthook = thread_excepthook
+        self._hooks = previous
+
+    def close(self):
+        """Restores the exception hooks."""
+        if self._hooks:
+            sys.excepthook, threading.excepthook = self._hooks
+            self._hooks = None
+
+
+def load(path: str) -> tuple[dict, list[tuple[float, ...]]]:
+    """Reads a dump and returns its header and its rows."""
+    with open(path, "rb") as file:
+        header = json.loads(file.readline())
+        values = array.array("d")
+        values.frombytes(file.read())
+    if header["byteorder"] != sys.byteorder:
+        values.byteswap()
+    width = len(header["fields"])
+    rows = [
+        tuple(values[start : start + width]) for start in range(0, len(values), width)
+    ]
+    return header, rows
@@ -0,0 +1,95 @@
+"""Implements the viewer of the dumps of the flight recorder.
+
+Run ``python -m src.flight_viewer <dump>`` to print a summary of the captured window and plot one
+chart per column into a PNG next to the dump.
+"""
+
+import argparse
+import os
+
+from PIL import Image, ImageDraw
+
+from src.flight_recorder import load
+
+PLOTTED = (
+    "bee_y",
+    "bee_velocity",
+    "entities",
+    "score",
+    "tick_ms",
+    "frame_ms",
+    "inputs",
+)
+"""The columns that get a chart."""
+
+CHART_SIZE = (800, 90)
+"""Width and height of every chart in pixels."""
+
+MARGIN = 4
+"""Pixels around every chart."""
+
+
+def summary(header: dict, rows: list[tuple[float, ...]]) -> str:
+    """Returns the reason of a dump and the slowest tick and frame of its window."""
+    fields = header["fields"]
+    lines = [f"{header['reason']}: {len(rows)} ticks"]
+    if rows:
+        tick, tick_ms, frame_ms = (
+            fields.index(name) for name in ("tick", "tick_ms", "frame_ms")
+        )
+        lines.append(f"ticks {rows[0][tick]:.0f} to {rows[-1][tick]:.0f}")
+        slowest = max(rows, key=lambda row: row[tick_ms])
+        lines.append(
+            f"slowest tick {slowest[tick_ms]:.2f} ms at tick {slowest[tick]:.0f}"
+        )
+        longest = max(rows, key=lambda row: row[frame_ms])
+        lines.append(
+            f"longest frame {longest[frame_ms]:.2f} ms at tick {longest[tick]:.0f}"
+        )
+    return "\n".join(lines)
+
+
+def plot(header: dict, rows: list[tuple[float, ...]], path: str):
+    """Draws the plotted columns of the rows over the ticks as stacked line charts."""
+    width, height = CHART_SIZE
+    image = Image.new(
+        "RGB", (width + 2 * MARGIN, len(PLOTTED) * (height + 2 * MARGIN)), "white"
+    )
+    draw = ImageDraw.Draw(image)
+    for index, name in enumerate(PLOTTED):
+        top = index * (height + 2 * MARGIN) + MARGIN
+        draw.rectangle((MARGIN, top, MARGIN + width, top + height), outline="gray")
+        values = [row[header["fields"].index(name)] for row in rows]
+        low, high = min(values, default=0), max(values, default=0)
+        scale = (high - low) or 1
+        points = [
+            (
+                MARGIN + width * step / max(len(values) - 1, 1),
+                top + height - height * (value - low) / scale,
+            )
+            for step, value in enumerate(values)
+        ]
+        if len(points) > 1:
+            draw.line(points, fill="navy")
+        draw.text((MARGIN + 4, top + 2), f"{name} {low:g}..{high:g}", fill="black")
+    image.save(path)
+
+
+def main(argv: list[str] | None = None):
+    """Prints the summary of a dump and plots it."""
+    parser = argparse.ArgumentParser(
+        description="Show a dump of the BeeLazy flight recorder."
+    )
+    parser.add_argument("dump", help="path of the dump")
+    parser.add_argument("--png", help="path of the plot, next to the dump by default")
+    args = parser.parse_args(argv)
+
+    header, rows = load(args.dump)
+    print(summary(header, rows))
+    png = args.png or os.path.splitext(args.dump)[0] + ".png"
+    plot(header, rows, png)
+    print(f"plot: {png}")
+
+
+if __name__ == "__main__":
+    main()
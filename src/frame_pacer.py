@@ -0,0 +1,159 @@
+"""Implements frame pacing that runs the fixed game ticks in step with the display refresh.
+
+All per-frame work of a running game hangs off one callback per displayed frame. The pacer
+estimates the refresh interval of the display from the measured frame intervals, snaps every
+interval that is close to a whole number of refreshes onto it and decides how many ticks of
+``TICK`` seconds the frame runs. Without the snapping, scheduling noise of a millisecond lets
+the tick and frame cadences beat against each other, so some frames run two ticks and the next
+none although the average rate is right. The frame-interval jitter is collected per session.
+"""
+
+import collections
+import math
+import statistics
+import typing
+
+from src.timer_wheel import TICK
+
+REFRESH_RATES = (60, 75, 90, 120, 144, 165, 240)
+"""The common refresh rates in Hz the estimated refresh interval is snapped to."""
+
+MIN_SYNCED_INTERVAL = 1 / 300
+"""Shorter frame intervals than this mean that the frames are not paced by vsync."""
+
+SNAP_TOLERANCE = 0.15
+"""How far a frame interval may be off a whole number of refreshes, relative to one refresh."""
+
+SYNCED_SHARE = 0.9
+"""The share of frame intervals within ``SNAP_TOLERANCE`` of their median when vsync paces them."""
+
+MAX_TICKS = 4
+"""The most ticks one frame runs; the game slows down instead of spiraling on slow devices."""
+
+MISSED_RATIO = 1.5
+"""A frame interval longer than this many refreshes missed a refresh."""
+
+
+class FramePacer:
+    """Turns the intervals of the displayed frames into a steady number of ticks per frame.
+
+    ``on_refresh`` is called with the refresh interval and whether the frames are synchronized
+    to the display whenever the estimate changes.
+    """
+
+    def __init__(
+        self,
+        on_refresh: typing.Callable[[float, bool], None] | None = None,
+        tick: float = TICK,
+        window: int = 120,
+    ):
+        self.on_refresh = on_refresh
+        self.tick = tick
+        self.window = window
+        self.refresh_interval = tick
+        self.synced = True
+        self.accumulator = 0.0
+        self._intervals: collections.deque[float] = collections.deque(maxlen=window)
+        self._frames = 0
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        self._histogram: typing.Counter[int] = collections.Counter()
+        self.missed = 0
+
+    def reset(self):
+        """Forgets the measured frame intervals, e.g. before the display is tested again."""
+        self._intervals.clear()
+        self.refresh_interval = self.tick
+        self.synced = True
+
+    def ticks(self, interval: float) -> int:
+        """Records the interval since the last frame and returns the ticks this frame runs."""
+        self._intervals.append(interval)
+        self._frames += 1
+        self._sum += interval
+        self._sum_squares += interval * interval
+        self._histogram[int(interval * 10000)] += 1
+        if (
+            self._frames % (self.window // 4) == 0
+            and len(self._intervals) == self.window
+        ):
+            self.estimate()
+        if interval > self.refresh_interval * MISSED_RATIO:
+            self.missed += 1
+
+        self.accumulator += self.snap(interval)
+        ticks = 0
+        # a tiny tolerance keeps float error from postponing a tick by a whole frame
+        while self.accumulator >= self.tick - 1e-6 and ticks < MAX_TICKS:
+            self.accumulator -= self.tick
+            ticks += 1
+        if ticks == MAX_TICKS:
+            self.accumulator = 0.0
+        return ticks
+
+    def snap(self, interval: float) -> float:
+        """Returns the interval as a whole number of refreshes if it is close to one."""
+        if not self.synced:
+            return interval
+        refreshes = max(round(interval / self.refresh_interval), 1)
+        snapped = refreshes * self.refresh_interval
+        if abs(interval - snapped) <= self.refresh_interval * SNAP_TOLERANCE:
+            return snapped
+        return interval
+
+    def estimate(self):
+        """Estimates the refresh interval from the median of the recent frame intervals.
+
+        The frames count as paced by vsync if the intervals cluster tightly around their median.
+        Scheduling noise is about the same in absolute terms at any frame rate, so the intervals
+        of an uncapped frame rate spread widely relative to their median even if it is high.
+        """
+        median = statistics.median(self._intervals)
+        clustered = sum(
+            abs(interval - median) <= median * SNAP_TOLERANCE
+            for interval in self._intervals
+        )
+        synced = (
+            median >= MIN_SYNCED_INTERVAL
+            and clustered >= len(self._intervals) * SYNCED_SHARE
+        )
+        refresh_interval = self.tick
+        if synced:
+            nearest = min(
+                (1 / rate for rate in REFRESH_RATES),
+                key=lambda candidate: abs(candidate - median),
+            )
+            if abs(nearest - median) > nearest * SNAP_TOLERANCE:
+                nearest = median
+            # frames slower than the ticks are paced by a refresh the ticks divide
+            refresh_interval = min(nearest, self.tick)
+        if (refresh_interval, synced) != (self.refresh_interval, self.synced):
+            self.refresh_interval, self.synced = refresh_interval, synced
+            if self.on_refresh:
+                self.on_refresh(refresh_interval, synced)
+
+    def session_stats(self) -> dict[str, float]:
+        """Returns the refresh rate and the frame-interval jitter since the last call and resets
+        them."""
+        frames = sum(self._histogram.values())
+        mean = self._sum / frames if frames else 0.0
+        variance = self._sum_squares / frames - mean * mean if frames else 0.0
+        p99 = 0
+        seen = 0
+        for bucket in sorted(self._histogram):
+            seen += self._histogram[bucket]
+            p99 = bucket
+            if seen >= frames * 0.99:
+                break
+        stats = {
+            "refresh_hz": round(1 / self.refresh_interval),
+            "frames": frames,
+            "mean_ms": mean * 1000,
+            "jitter_ms": math.sqrt(max(variance, 0.0)) * 1000,
+            "p99_ms": p99 / 10,
+            "missed": self.missed,
+        }
+        self._sum = self._sum_squares = 0.0
+        self._histogram.clear()
+        self.missed = 0
+        return stats
@@ -0,0 +1,110 @@
+"""Implements the garbage collector policy that keeps cyclic collections out of gameplay frames.
+
+Every tick allocates short-lived tuples, generator objects and strings, and the automatic
+collections they trigger land in the middle of a frame. The policy freezes the objects that live
+for the whole app after the assets are loaded, so no collection has to traverse them again, raises
+the collection thresholds while a game is running and collects explicitly whenever the game enters
+a state in which a pause is not noticed. The pauses of all collections are measured through
+``gc.callbacks``.
+"""
+
+import gc
+import time
+import typing
+
+from kivy.logger import Logger
+
+from src.run_state import RunState
+
+PLAY_THRESHOLDS = (20_000, 50, 1_000)
+"""The collection thresholds while playing: young collections are rare and old ones almost never
+run."""
+
+SAFE_STATES = {
+    RunState.MENU,
+    RunState.PAUSED,
+    RunState.GAME_OVER,
+    RunState.BACKGROUNDED,
+}
+"""The states in which a collection does not interrupt the game."""
+
+
+class GcPolicy:
+    """Tunes the garbage collector to the run state of the game and measures its pauses.
+
+    ``thresholds`` are applied while playing; with ``None`` the automatic collector is disabled
+    during play and only the collections at the safe points remain.
+    """
+
+    def __init__(
+        self,
+        thresholds: tuple[int, int, int] | None = PLAY_THRESHOLDS,
+        timer: typing.Callable[[], float] = time.perf_counter,
+    ):
+        self.thresholds = thresholds
+        self.timer = timer
+        self.default_thresholds = gc.get_threshold()
+        self.playing = False
+        self.collections = [0, 0, 0]
+        self.pause_time = 0.0
+        self.longest_pause = 0.0
+        self.play_pauses: list[float] = []
+        self._started = 0.0
+        gc.callbacks.append(self.measure)
+
+    def freeze(self):
+        """Moves all objects alive now, e.g. the loaded assets, out of the reach of collections."""
+
+        gc.collect()
+        gc.freeze()
+        Logger.info("BeeLazy: Froze %d objects", gc.get_freeze_count())
+
+    def enter(self, state: RunState):
+        """Applies the collector settings of a run state.
+
+        Entering a safe state restores the default thresholds and collects the garbage of the
+        game that has just stopped.
+        """
+
+        self.playing = state is RunState.PLAYING
+        if self.playing and self.thresholds:
+            gc.set_threshold(*self.thresholds)
+        elif self.playing:
+            gc.disable()
+        else:
+            gc.enable()
+            gc.set_threshold(*self.default_thresholds)
+        if state in SAFE_STATES:
+            gc.collect()
+
+    def measure(self, phase: str, info: dict):
+        """Measures the pause of a collection; called by the garbage collector."""
+
+        if phase == "start":
+            self._started = self.timer()
+            return
+        pause = self.timer() - self._started
+        self.collections[info["generation"]] += 1
+        self.pause_time += pause
+        self.longest_pause = max(self.longest_pause, pause)
+        if self.playing:
+            self.play_pauses.append(pause)
+
+    def session_stats(self) -> dict[str, float]:
+        """Returns the collection pauses during play since the last call."""
+
+        pauses, self.play_pauses = self.play_pauses, []
+        return {
+            "count": len(pauses),
+            "total_ms": sum(pauses) * 1000,
+            "longest_ms": max(pauses, default=0.0) * 1000,
+        }
+
+    def stop(self):
+        """Stops measuring and gives the collector back its default behaviour."""
+
+        if self.measure in gc.callbacks:
+            gc.callbacks.remove(self.measure)
+        gc.unfreeze()
+        gc.enable()
+        gc.set_threshold(*self.default_thresholds)
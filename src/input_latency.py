@@ -0,0 +1,106 @@
+"""Implements measuring the latency from a touch to the first frame that shows its effect.
+
+Every touch is timestamped when it is dispatched to the game, at the start of the tick that acts
+on it and at the next frame swap of the window, which is the first frame that can show the
+effect. The latencies are counted in millisecond histograms per input device.
+"""
+
+import collections
+import time
+import typing
+
+from kivy.uix.label import Label
+
+from src.rules import WORLD_HEIGHT
+from src.telemetry import MAX_FRAME_BUCKET_MS, percentile
+
+
+class LatencyTracker:
+    """Follows the touches through the ticks and frames and counts their latencies."""
+
+    def __init__(self, timer: typing.Callable[[], float] = time.perf_counter):
+        self.timer = timer
+        self.pending: list[tuple[str, float]] = []
+        self.consumed: list[tuple[str, float, float]] = []
+        self.histograms: dict[tuple[str, str], typing.Counter[int]] = (
+            collections.defaultdict(collections.Counter)
+        )
+
+    def touch(self, device: str):
+        """Timestamps a touch of an input device when it is dispatched."""
+        self.pending.append((device, self.timer()))
+
+    def tick(self):
+        """Timestamps the pending touches when a tick starts to act on them."""
+        if not self.pending:
+            return
+        now = self.timer()
+        self.consumed.extend((device, touched, now) for device, touched in self.pending)
+        self.pending.clear()
+
+    def frame(self, *args) -> list[tuple[str, float]]:
+        """Completes the consumed touches at a frame swap and returns their total latencies."""
+        del args
+        if not self.consumed:
+            return []
+        now = self.timer()
+        latencies = []
+        for device, touched, ticked in self.consumed:
+            self.count(device, "tick", ticked - touched)
+            self.count(device, "frame", now - touched)
+            latencies.append((device, now - touched))
+        self.consumed.clear()
+        return latencies
+
+    def discard(self):
+        """Forgets the touches that no tick or frame will act on, e.g. on game over."""
+        self.pending.clear()
+        self.consumed.clear()
+
+    def count(self, device: str, stage: str, latency: float):
+        """Counts a latency in seconds in its millisecond bucket."""
+        bucket = min(int(latency * 1000), MAX_FRAME_BUCKET_MS)
+        self.histograms[device, stage][bucket] += 1
+
+    def percentiles(self, device: str, stage: str) -> tuple[int, int, int]:
+        """Returns the p50, p95 and p99 latency of a device in milliseconds."""
+        histogram = sorted(self.histograms[device, stage].items())
+        return (
+            percentile(histogram, 0.5),
+            percentile(histogram, 0.95),
+            percentile(histogram, 0.99),
+        )
+
+    def summary(self) -> str:
+        """Returns one line of percentiles per device and stage, ``tick`` or ``frame``."""
+        lines = []
+        for device, stage in sorted(self.histograms):
+            p50, p95, p99 = self.percentiles(device, stage)
+            touches = sum(self.histograms[device, stage].values())
+            lines.append(
+                f"{device} touch to {stage}: p50 {p50} p95 {p95} p99 {p99} ms "
+                f"({touches} touches)"
+            )
+        return "\n".join(lines) or "No touches yet"
+
+
+class LatencyOverlay(Label):
+    """A debug overlay in the top left corner that shows the latencies of a tracker."""
+
+    def __init__(self, tracker: LatencyTracker, **kwargs):
+        kwargs.setdefault("font_size", 14)
+        super().__init__(**kwargs)
+        self.tracker = tracker
+        self.bind(texture_size=self.place)
+        self.refresh()
+
+    def place(self, *args):
+        """Keeps the overlay in the top left corner of the world."""
+        del args
+        self.size = self.texture_size
+        self.pos = (10, WORLD_HEIGHT - self.height - 10)
+
+    def refresh(self, *args):
+        """Shows the current percentiles."""
+        del args
+        self.text = self.tracker.summary()
@@ -1,10 +1,9 @@
 """This module contains the InvincibleEffect class."""
 
-import random
-
 from kivy.graphics import Color, Ellipse, Line
 from kivy.uix.widget import Widget
 
+from src import rng
 from src.bee import Bee
 
 
@@ -19,11 +18,14 @@ class InvincibleEffect(Widget):
         self.color = Color(1, 1, 0, 0.8)  # Yellow color with 80% opacity
         self.ellipse = Ellipse(pos=self.pos, size=self.size)
         self.glitters: list[Line] = []
+        self.num_glitters = 10
 
     def draw_glitter(self):
-        """Draws glitter around the invincible effect."""
-        num_glitters = 10
+        """Draws glitter around the invincible effect, unless cosmetics are disabled."""
+        if not rng.cosmetic.enabled:
+            return
         glitter_length = self.size[0] / 2
+        uniform = rng.cosmetic.uniform
 
         with self.canvas:
             Color(1, 1, 0, 0.4)  # Yellow color with 80% opacity
@@ -32,11 +34,11 @@ class InvincibleEffect(Widget):
                 oldest_glitter = self.glitters.pop(0)
                 self.canvas.remove(oldest_glitter)
 
-            for _ in range(num_glitters):
+            for _ in range(self.num_glitters):
                 glitter = Line(points=[self.pos[0], self.pos[1]])
                 glitter.points += [
-                    self.pos[0] + random.uniform(-glitter_length, glitter_length),
-                    self.pos[1] + random.uniform(-glitter_length, glitter_length),
+                    self.pos[0] + uniform(-glitter_length, glitter_length),
+                    self.pos[1] + uniform(-glitter_length, glitter_length),
                 ]
                 glitter.width = 2
                 self.glitters.append(glitter)
@@ -0,0 +1,146 @@
+"""Implements a cooperative job queue that spreads expensive main thread work over frames.
+
+Every frame the queue runs jobs until its time budget is spent. A job is a callable; if it
+returns a generator, the generator is an incremental job and every ``next`` is one step that
+runs in a frame that still has budget left. Jobs with a lower priority number run first, and a
+job whose deadline has passed runs even when the budget of the frame is spent.
+"""
+
+import heapq
+import inspect
+import math
+import time
+import typing
+
+BUDGET = 0.002
+"""Seconds of every frame that may be spent on jobs."""
+
+
+class Job:  # pylint: disable=too-few-public-methods
+    """A queued job; ``cancel`` removes it before its next step."""
+
+    __slots__ = (
+        "cancelled",
+        "deadline",
+        "done",
+        "generator",
+        "key",
+        "name",
+        "steps",
+        "task",
+    )
+
+    def __init__(self, task: typing.Callable, name: str, key: tuple[int, float, int]):
+        self.task = task
+        self.generator: typing.Iterator[object] | None = None
+        self.name = name
+        self.key = key  # priority, deadline and submission order
+        self.deadline = key[1]
+        self.steps = 0
+        self.cancelled = False
+        self.done = False
+
+    def cancel(self):
+        """Cancels the job."""
+        self.cancelled = True
+
+
+class JobQueue:
+    """Runs queued jobs within a time budget per frame and counts the frames that overran it."""
+
+    def __init__(
+        self,
+        budget: float = BUDGET,
+        timer: typing.Callable[[], float] = time.perf_counter,
+    ):
+        self.budget = budget
+        self.timer = timer
+        self.overruns = 0
+        self.max_depth = 0
+        self.longest_run = 0.0
+        self._heap: list[tuple[int, float, int, Job]] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def submit(
+        self,
+        task: typing.Callable,
+        priority: int = 0,
+        deadline: float | None = None,
+        name: str | None = None,
+    ) -> Job:
+        """Queues a job that has to run within ``deadline`` seconds, if given."""
+        self._count += 1
+        job = Job(
+            task,
+            name or str(getattr(task, "__name__", task)),
+            (
+                priority,
+                self.timer() + deadline if deadline is not None else math.inf,
+                self._count,
+            ),
+        )
+        self._push(job)
+        self.max_depth = max(self.max_depth, len(self._heap))
+        return job
+
+    def _push(self, job: Job):
+        """Queues a job; an incremental job keeps its place between its steps."""
+        heapq.heappush(self._heap, (*job.key, job))
+
+    def run(self, *args) -> int:
+        """Runs jobs until the budget of this frame is spent and returns the number of steps."""
+        del args
+        start = self.timer()
+        steps = 0
+        while self._heap:
+            now = self.timer()
+            if now - start < self.budget:
+                job = heapq.heappop(self._heap)[3]
+            else:
+                overdue = [entry for entry in self._heap if entry[1] <= now]
+                if not overdue:
+                    break
+                entry = min(overdue)
+                self._heap.remove(entry)
+                heapq.heapify(self._heap)
+                job = entry[3]
+            if job.cancelled:
+                job.done = True
+            else:
+                self._step(job)
+                steps += 1
+
+        elapsed = self.timer() - start
+        self.longest_run = max(self.longest_run, elapsed)
+        if elapsed > self.budget:
+            self.overruns += 1
+        return steps
+
+    def _step(self, job: Job):
+        """Runs a job or the next step of an incremental job."""
+        job.steps += 1
+        generator = job.generator
+        if not generator:
+            result = job.task()
+            if not inspect.isgenerator(result):
+                job.done = True
+                return
+            generator = job.generator = result
+        try:
+            next(generator)
+        except StopIteration:
+            job.done = True
+            return
+        self._push(job)
+
+    def stats(self) -> dict[str, float]:
+        """Returns the queue depth and how often and how far the budget was overrun."""
+        return {
+            "depth": len(self._heap),
+            "max_depth": self.max_depth,
+            "overruns": self.overruns,
+            "longest_run_ms": self.longest_run * 1000,
+        }
@@ -0,0 +1,236 @@
+"""Implements the client of the global leaderboard.
+
+Scores are submitted on a background thread so the game over frame never waits for the network.
+Unsent scores are kept in a JSON file and survive restarts, failed batches are retried with an
+exponential backoff and the fetched top scores are cached for a while.
+"""
+
+import http.client
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.parse
+
+BACKOFF_BASE = 0.5
+"""Seconds to wait before the first retry; doubled for every further failure."""
+
+BACKOFF_MAX = 30.0
+"""The longest wait between two retries in seconds."""
+
+logger = logging.getLogger(__name__)
+
+
+class RequestRejected(http.client.HTTPException):
+    """The server answered a request with a 4xx status; sending it again will not help."""
+
+
+class ConnectionPool:
+    """A pool of keep-alive HTTP or HTTPS connections to one host."""
+
+    def __init__(self, url: str, size: int = 2, timeout: float = 2.0):
+        parsed = urllib.parse.urlsplit(url)
+        self.secure = parsed.scheme == "https"
+        self.host = parsed.hostname or "localhost"
+        # without a port the connection classes use the default port of their scheme
+        self.port = parsed.port
+        self.prefix = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+
+    def request(self, method: str, path: str, body: object = None) -> object:
+        """Sends a JSON request and returns the decoded JSON response, or None if it is empty.
+
+        A connection closed by the server while idle is replaced once, every other error is
+        raised to the caller.
+        """
+        data = json.dumps(body).encode() if body is not None else None
+        try:
+            status, payload = self._exchange(self._acquire(), method, path, data)
+        except ConnectionError:
+            status, payload = self._exchange(self._connect(), method, path, data)
+        if 400 <= status < 500:
+            raise RequestRejected(f"{method} {path}: {status}")
+        if status >= 500:
+            raise http.client.HTTPException(f"{method} {path}: {status}")
+        return json.loads(payload) if payload else None
+
+    def close(self):
+        """Closes all idle connections."""
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+    def _exchange(
+        self,
+        connection: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        data: bytes | None,
+    ) -> tuple[int, bytes]:
+        """Sends one request and puts the connection back into the pool afterwards."""
+        headers = {"Content-Type": "application/json"} if data else {}
+        try:
+            connection.request(method, self.prefix + path, data, headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+        self._release(connection)
+        return response.status, payload
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        """Reuses an idle connection or opens a new one."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        """Opens a new connection, encrypted for an ``https`` URL."""
+        if self.secure:
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection: http.client.HTTPConnection):
+        """Keeps the connection for the next request if the pool has room."""
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+
+class LeaderboardClient:
+    """Submits scores to the leaderboard and caches its top scores."""
+
+    def __init__(
+        self, url: str, queue_path: str, batch_size: int = 20, ttl: float = 60.0
+    ):
+        self.pool = ConnectionPool(url)
+        self.queue_path = queue_path
+        self.batch_size = batch_size
+        self.ttl = ttl
+        self.failures = 0
+        self._pending: list[int] = []
+        if os.path.exists(queue_path):
+            with open(queue_path, encoding="utf-8") as file:
+                self._pending = json.load(file)["pending"]
+        self._top: list[int] = []
+        self._top_limit = 0
+        self._fetched_at: float | None = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+        if self._pending:
+            self._wake.set()
+
+    @property
+    def pending(self) -> list[int]:
+        """The scores that were not accepted by the server yet."""
+        with self._lock:
+            return list(self._pending)
+
+    def submit(self, score: int):
+        """Queues a score for submission and returns immediately."""
+        with self._lock:
+            self._pending.append(score)
+            self._save()
+        self._wake.set()
+
+    def top(self, limit: int = 5) -> list[int]:
+        """Returns the cached top scores and refreshes them in the background when stale."""
+        with self._lock:
+            fresh = (
+                self._fetched_at is not None
+                and time.monotonic() - self._fetched_at < self.ttl
+                and limit <= self._top_limit
+            )
+            if not fresh:
+                self._top_limit = max(limit, self._top_limit)
+                self._fetched_at = None
+            top = self._top[:limit]
+        if not fresh:
+            self._wake.set()
+        return top
+
+    def close(self):
+        """Stops the background thread; unsent scores stay in the queue file."""
+        self._stopping.set()
+        self._wake.set()
+        self._worker.join()
+        self.pool.close()
+
+    def _save(self):
+        """Writes the pending scores to the queue file; called with the lock held."""
+        with open(self.queue_path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump({"pending": self._pending}, file)
+        os.replace(self.queue_path + ".tmp", self.queue_path)
+
+    def _run(self):
+        """Sends pending scores and refreshes the top scores until the client is closed.
+
+        New scores and top score requests wake the thread, but not before a running backoff
+        is over.
+        """
+        delay = None
+        retry_at = 0.0
+        while True:
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stopping.is_set():
+                return
+            if time.monotonic() < retry_at:
+                delay = retry_at - time.monotonic()
+                continue
+            try:
+                self._send_pending()
+                self._refresh_top()
+            except (OSError, http.client.HTTPException, TypeError, ValueError):
+                self.failures += 1
+                delay = min(BACKOFF_BASE * 2 ** (self.failures - 1), BACKOFF_MAX)
+                retry_at = time.monotonic() + delay
+            else:
+                self.failures = 0
+                delay = None
+
+    def _send_pending(self):
+        """Submits the pending scores in batches and drops them once accepted or rejected.
+
+        A rejected batch is dropped, so it does not hold back the scores queued after it.
+        """
+        while True:
+            with self._lock:
+                batch = self._pending[: self.batch_size]
+            if not batch:
+                return
+            try:
+                self.pool.request("POST", "/scores", {"scores": batch})
+            except RequestRejected as error:
+                logger.warning("Leaderboard: dropped the scores %s: %s", batch, error)
+            with self._lock:
+                del self._pending[: len(batch)]
+                self._save()
+
+    def _refresh_top(self):
+        """Fetches the top scores if they were requested and are stale."""
+        with self._lock:
+            limit = self._top_limit if self._fetched_at is None else 0
+        if not limit:
+            return
+        try:
+            top = self.pool.request("GET", f"/scores?limit={limit}")
+        except RequestRejected as error:
+            # keep the cached scores until they are stale again instead of retrying
+            logger.warning("Leaderboard: the top scores were rejected: %s", error)
+            top = self._top
+        if not isinstance(top, list):
+            raise TypeError(f"Unexpected top scores {top!r}")
+        with self._lock:
+            self._top = [int(score) for score in top]
+            self._fetched_at = time.monotonic()
@@ -0,0 +1,135 @@
+"""Implements a local stand-in for the leaderboard server, used by tests and load benchmarks.
+
+Run ``python -m src.leaderboard_server`` to serve a leaderboard in memory, or add
+``--benchmark`` to measure how many scores per second a pool of clients can submit.
+"""
+
+import argparse
+import http.server
+import json
+import threading
+import time
+import urllib.parse
+
+from src.leaderboard import ConnectionPool
+
+
+class LeaderboardHandler(http.server.BaseHTTPRequestHandler):
+    """Serves ``POST /scores`` and ``GET /scores?limit=N`` over keep-alive connections."""
+
+    protocol_version = "HTTP/1.1"
+    server: "LeaderboardServer"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Returns the top scores."""
+        url = urllib.parse.urlsplit(self.path)
+        if self.server.fail_requests or url.path != "/scores":
+            self.reply(503 if self.server.fail_requests else 404)
+            return
+        limit = int(urllib.parse.parse_qs(url.query).get("limit", ["10"])[0])
+        with self.server.lock:
+            top = sorted(self.server.scores, reverse=True)[:limit]
+        self.reply(200, top)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Adds a batch of scores."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.server.fail_requests or self.path != "/scores":
+            self.reply(503 if self.server.fail_requests else 404)
+            return
+        scores = json.loads(body).get("scores")
+        if not isinstance(scores, list) or not all(
+            isinstance(score, int) for score in scores
+        ):
+            self.reply(400)
+            return
+        with self.server.lock:
+            self.server.scores.extend(scores)
+            self.server.batches += 1
+        self.reply(204)
+
+    def reply(self, status: int, body: object = None):
+        """Sends the status and an optional JSON body."""
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keeps the requests out of the console."""
+
+
+class LeaderboardServer(http.server.ThreadingHTTPServer):
+    """An in-memory leaderboard; ``fail_requests`` lets it answer every request with 503."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int] = ("127.0.0.1", 0)):
+        super().__init__(address, LeaderboardHandler)
+        self.host = address[0]
+        self.scores: list[int] = []
+        self.batches = 0
+        self.fail_requests = False
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        return f"http://{self.host}:{self.server_port}"
+
+    def start(self) -> "LeaderboardServer":
+        """Serves requests on a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stops serving and closes the socket."""
+        self.shutdown()
+        self.server_close()
+
+
+def benchmark(
+    url: str, clients: int = 8, batches: int = 500, batch_size: int = 20
+) -> float:
+    """Submits batches from several threads over one pool and returns the scores per second."""
+    pool = ConnectionPool(url, size=clients)
+
+    def submit():
+        for _ in range(batches // clients):
+            pool.request("POST", "/scores", {"scores": list(range(batch_size))})
+
+    threads = [threading.Thread(target=submit) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return batches // clients * clients * batch_size / elapsed
+
+
+def main(argv: list[str] | None = None):
+    """Serves a leaderboard or benchmarks a local one."""
+    parser = argparse.ArgumentParser(description="Local BeeLazy leaderboard server.")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--benchmark", action="store_true", help="run a load benchmark")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--batches", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    server = LeaderboardServer(("127.0.0.1", 0 if args.benchmark else args.port))
+    if not args.benchmark:
+        print(f"Serving the leaderboard on {server.url}")
+        server.serve_forever()
+        return
+    server.start()
+    rate = benchmark(server.url, args.clients, args.batches)
+    server.stop()
+    print(f"{rate:.0f} scores/s with {args.clients} clients")
+
+
+if __name__ == "__main__":
+    main()
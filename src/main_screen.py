@@ -1,8 +1,11 @@
 """Implements classes of the main screen of the game."""
 
-import collections
+# pylint: disable=too-many-lines
+
+import functools
+import math
 import os
-import random
+import time
 import typing
 
 from kivy.app import App
@@ -10,26 +13,57 @@ from kivy.clock import Clock
 from kivy.core.audio import SoundLoader
 from kivy.core.window import Window
 from kivy.graphics import Color, Rectangle
+from kivy.logger import Logger
 from kivy.storage.jsonstore import JsonStore
 from kivy.uix.button import Button
-from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.uix.widget import Widget
+from kivy.utils import platform
 
-from src.bee import Bee
+from src import assets, behaviors, rng, viewport
+from src.bee import Bee, hits, sweep
+from src.flight_recorder import FlightRecorder
+from src.frame_pacer import FramePacer
+from src.gc_policy import GcPolicy
+from src.input_latency import LatencyOverlay, LatencyTracker
 from src.invincible_effect import InvincibleEffect
-from src.obstacle import Obstacle
+from src.job_queue import Job, JobQueue
+from src.leaderboard import LeaderboardClient
+from src.obstacle import SPRITES, Obstacle, spawn_height
+from src.profiler import Profiler
+from src.quality import QualityGovernor, QualityTier
+from src.rules import (
+    INVINCIBLE_DURATION,
+    OBSTACLE_SPEED,
+    POWER_UP_CHANCE,
+    POWER_UP_SIZE,
+    POWER_UP_VELOCITY,
+    SCORE_PER_OBSTACLE,
+    SCORE_PER_REINFORCEMENT,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+from src.run_state import MAX_FPS, RunState, RunStateMachine, set_max_fps
+from src.scaled_view import ScaledView
+from src.shared_world import WorldExporter
+from src.snapshot import BeeState, ObstacleState, SnapshotFile, WorldState
+from src.sprite_shader import SpriteBatch
 from src.start_screen import StartScreen
+from src.telemetry import TelemetrySink
+from src.timer_wheel import TICK, Timer, TimerWheel
+
+if typing.TYPE_CHECKING:
+    from src.simulation import Frame, Simulation
 
 GROUND_HEIGHT = 100
 """Height of the ground from the screen bottom."""
 
-MAX_OBSTACLES = 5
-"""The maximum number of obstacles in one screen."""
-
-TOP_TEXT = Window.height - Window.height * 0.02
+TOP_TEXT = WORLD_HEIGHT - WORLD_HEIGHT * 0.02
 """Top text position."""
 
+GAME_OVER_DEADLINE = 0.25
+"""Seconds within which the game over screen is complete."""
+
 
 class PowerUp(Widget):
     """The PowerUp for the bee to gain.
@@ -40,9 +74,12 @@ class PowerUp(Widget):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.size = (50, 50)
-        self.velocity = 7
-        self.pos = (Window.width, random.randint(50, Window.height - 50))
+        self.size = (POWER_UP_SIZE, POWER_UP_SIZE)
+        self.velocity = POWER_UP_VELOCITY
+        self.pos = (
+            WORLD_WIDTH,
+            rng.gameplay.randint(POWER_UP_SIZE, WORLD_HEIGHT - POWER_UP_SIZE),
+        )
         with self.canvas:
             self.color = Color(1, 1, 0)
             self.rect = Rectangle(pos=self.pos, size=self.size)
@@ -53,48 +90,108 @@ class PowerUp(Widget):
         self.rect.pos = self.pos
 
 
-class Game(Widget):
+class Game(Widget):  # pylint: disable=too-many-public-methods
     """
-    The main game object where its methods uses obstacles and the bee and updates them
+    The main game object where its methods uses obstacles and the bees and updates them
     periodically.
+
+    The first bee belongs to the player, further bees are local players or ghost runs. All bees
+    are checked against each obstacle in one pass per tick.
     """
 
-    bee = Bee()
     obstacles: list[Obstacle] = []
     power_ups: list[PowerUp] = []
-    theme_song = None
-    last_positions: typing.Deque = collections.deque(maxlen=5)
+    theme_song: typing.Any = None
     game_over = False
 
     def __init__(self, **kwargs):
+        kwargs.setdefault("size", (WORLD_WIDTH, WORLD_HEIGHT))
         super().__init__(**kwargs)
+        self.bees = [Bee()]
+        self.invincible_effects: dict[Bee, InvincibleEffect] = {}
+        self.tick = 0
+        self.next_power_up = rng.ticks_until(rng.gameplay, POWER_UP_CHANCE)
+        self.recording: list[bool] = []
+        self.last_recording: list[bool] = []
+        self.telemetry: TelemetrySink | None = None
+        self.gc_policy: GcPolicy | None = None
+        self.flight_recorder: FlightRecorder | None = None
+        self.shared_world: WorldExporter | None = None
+        self.latency = LatencyTracker()
+        self.leaderboard: LeaderboardClient | None = None
+        self.snapshot: SnapshotFile | None = None
+        self.simulation: Simulation | None = None
+        self.view: ScaledView | None = None
+        self.sprites: SpriteBatch | None = None
+        self.obstacle_slots: dict[int, Obstacle] = {}
+        self.spare_obstacles: list[Obstacle] = []
+        self.obstacle_job: Job | None = None
+        self.jobs = JobQueue()
+        self.run_jobs_trigger = Clock.create_trigger(self.run_jobs)
         self.score = 0
         self.highscores = []
         self.store = None
         self.score_label = None
         self.highscore_label = None
         self.restart_button = None
+        self.timers = TimerWheel()
+        self.animation_timer: Timer | None = None
+        self.quality = QualityGovernor(self.apply_quality)
+        self.pacer = FramePacer(self.refresh_detected)
+        self.playing_fps = MAX_FPS[RunState.PLAYING]
+        self.frame_time = TICK
+        self.run_state = RunStateMachine(self.enter_run_state)
         self.start_screen = StartScreen(
             start_callback=self.start_game,
             highscore_callback=self.show_highscore_label,
             back_callback=self.remove_highscore_label,
         )
-        self.invincible_effect = InvincibleEffect(self.bee)
         self.add_widget(self.start_screen)
         with self.canvas.before:
-            self.img = Image(
-                source="assets/new_bg.jpg", allow_stretch=True, keep_ratio=False
-            )
-            self.texture = self.img.texture
+            self.tier = viewport.current.tier
+            self.texture = assets.image("background", self.tier)
             self.texture.wrap = "repeat"
             self.rect_1 = Rectangle(texture=self.texture, size=self.size, pos=self.pos)
             self.bind(pos=self.update_background, size=self.update_background)
 
+    @property
+    def bee(self) -> Bee:
+        """The bee of the player."""
+        return self.bees[0]
+
+    @bee.setter
+    def bee(self, bee: Bee):
+        self.bees[0] = bee
+
+    @property
+    def invincible_effect(self) -> InvincibleEffect:
+        """The invincible effect of the player's bee."""
+        return self.effect_of(self.bee)
+
+    def effect_of(self, bee: Bee) -> InvincibleEffect:
+        """Returns the invincible effect of a bee and creates it when needed."""
+
+        if bee not in self.invincible_effects:
+            effect = InvincibleEffect(bee)
+            effect.num_glitters = self.quality.tier.glitter_count
+            self.invincible_effects[bee] = effect
+        return self.invincible_effects[bee]
+
+    def add_bee(self, input_source: typing.Callable[[int], bool] | None = None) -> Bee:
+        """Adds another bee, steered by touch or by ``input_source(tick)``."""
+
+        bee = Bee()
+        bee.input_source = input_source
+        self.bees.append(bee)
+        if self.run_state.state is RunState.PLAYING:
+            self.add_widget(bee)
+        return bee
+
     def txupdate(self, *args):
         """Updates the background position."""
 
         del args
-        boot_time = Clock.get_boottime()
+        boot_time = self.timers.now
         self.rect_1.tex_coords = (
             -(boot_time * 0.05),
             0,
@@ -106,12 +203,60 @@ class Game(Widget):
             -1,
         )
 
+    def add_widget(self, widget, *args, **kwargs):
+        super().add_widget(widget, *args, **kwargs)
+        self.attach_sprite(widget)
+
+    def remove_widget(self, widget, *args, **kwargs):
+        super().remove_widget(widget, *args, **kwargs)
+        if self.sprites:
+            self.sprites.detach(widget)
+
+    def use_gpu_sprites(self):
+        """Animates the bees and obstacles with the sprite shader instead of the CPU."""
+
+        self.sprites = SpriteBatch(viewport.current.tier, ("bee", *SPRITES))
+        self.canvas.before.add(self.sprites.canvas)
+        for widget in self.children:
+            self.attach_sprite(widget)
+        self.schedule_animation()
+
+    def attach_sprite(self, widget: Widget):
+        """Lets the sprite shader draw a bee or an obstacle, starting at its current frame."""
+
+        if self.sprites and isinstance(widget, (Bee, Obstacle)):
+            self.sprites.attach(
+                widget,
+                widget.sprite,
+                1 / self.quality.tier.anim_delay,
+                self.timers.now,
+                widget.frame_idx,
+            )
+
     def update_background(self, *args):
         """Updates the size of the background after initial creation."""
 
         del args
         self.rect_1.size = self.size
 
+    def viewport_changed(self, changed: viewport.Viewport):
+        """Reloads the background and the sprites when a resize or rotation changes the
+        resolution tier of the assets; the shader keeps the atlas it was built with.
+
+        The window may have moved to another display, so its vsync is tested again."""
+
+        self.retest_vsync()
+        if changed.tier == self.tier:
+            return
+        self.tier = changed.tier
+        self.texture = assets.image("background", self.tier)
+        self.texture.wrap = "repeat"
+        self.rect_1.texture = self.texture
+        if self.sprites:
+            return
+        for widget in (*self.bees, *self.obstacles, *self.spare_obstacles):
+            widget.load_spritesheet()
+
     def start_game(self):
         """
         Method to call to start the game.
@@ -120,12 +265,16 @@ class Game(Widget):
         the highscore.
         """
 
-        Clock.schedule_interval(self.txupdate, 0)
         self.remove_widget(self.start_screen)
         self.init_score_label()
         self.add_widget(self.score_label)
-        self.add_widget(self.bee)
-        Clock.schedule_interval(self.update, 1.0 / 60.0)
+        for bee in self.bees:
+            self.add_widget(bee)
+        self.schedule_animation()
+        self.run_state.transition(RunState.PLAYING)
+        if self.telemetry:
+            self.telemetry.start_session()
+        self.prepare_obstacles()
         self.bind(on_touch_down=self.fly)
         self.bind(on_touch_up=self.fall)
         self.bind(on_touch_move=self.move)
@@ -135,7 +284,7 @@ class Game(Widget):
         """Initializes the score label with its postion and text."""
 
         self.score_label = Label(
-            center_x=Window.width / 2, top=TOP_TEXT, text="Score: 0"
+            center_x=WORLD_WIDTH / 2, top=TOP_TEXT, text="Score: 0"
         )
 
     def remove_start_screen(self):
@@ -149,121 +298,625 @@ class Game(Widget):
         self.game_over = False
         self.parent.remove_widget(instance)
         self.clear_widgets()
-        self.bee = Bee()
+        self.timers.cancel_all()
+        input_sources = [bee.input_source for bee in self.bees]
+        self.bees = []
+        self.invincible_effects = {}
+        for input_source in input_sources:
+            self.add_bee(input_source)
+        self.tick = 0
+        self.next_power_up = rng.ticks_until(rng.gameplay, POWER_UP_CHANCE)
+        self.last_recording, self.recording = self.recording, []
         self.obstacles = []
+        self.obstacle_slots = {}
         self.power_ups = []
+        if self.simulation:
+            self.simulation.reset()
         self.theme_song.play()
         self.score = 0
         self.init_score_label()
         self.add_widget(self.score_label)
-        self.add_widget(self.bee)
-        Clock.schedule_interval(self.update, 1.0 / 60.0)
-        Clock.schedule_interval(self.txupdate, 0)
+        for bee in self.bees:
+            self.add_widget(bee)
+        self.schedule_animation()
+        self.run_state.transition(RunState.PLAYING)
+        if self.telemetry:
+            self.telemetry.start_session()
+
+    def world_state(self) -> WorldState:
+        """Returns the state of the running game for a snapshot."""
+
+        return WorldState(
+            self.tick,
+            self.score,
+            [
+                BeeState(
+                    bee.pos[0],
+                    bee.pos[1],
+                    bee.velocity[0],
+                    bee.velocity[1],
+                    bee.flying,
+                    bee.alive,
+                    bee.invincible,
+                    self.timers.remaining(bee.power_up_timer),
+                    bee.score,
+                )
+                for bee in self.bees
+            ],
+            [
+                ObstacleState(
+                    *obstacle.pos,
+                    obstacle.velocity,
+                    SPRITES.index(obstacle.sprite),
+                    sum(1 << self.bees.index(bee) for bee in obstacle.passed_by),
+                    tuple(behaviors.BEHAVIORS.values()).index(obstacle.behavior),
+                    obstacle.base_y,
+                    obstacle.phase
+                    - behaviors.phase(obstacle.behavior, self.timers.now),
+                )
+                for obstacle in self.obstacles
+            ],
+            [tuple(power_up.pos) for power_up in self.power_ups],
+            rng.gameplay.getstate(),
+            self.next_power_up,
+        )
+
+    def restore(self, world: WorldState):
+        """Rebuilds a run from a snapshot and pauses it until the player touches the screen.
+
+        The bees keep their input sources; the sprites come from the already loaded atlas.
+        """
+
+        self.remove_widget(self.start_screen)
+        self.clear_widgets()
+        self.timers.cancel_all()
+        input_sources = [bee.input_source for bee in self.bees]
+        input_sources += [None] * (len(world.bees) - len(input_sources))
+        self.bees = []
+        self.invincible_effects = {}
+        for state, input_source in zip(world.bees, input_sources):
+            bee = self.add_bee(input_source)
+            bee.pos = (state.x, state.y)
+            bee.velocity = [state.velocity_x, state.velocity_y]
+            bee.flying = state.flying
+            bee.alive = state.alive
+            bee.score = state.score
+            if state.invincible:
+                bee.invincible = True
+                bee.power_up_timer = self.timers.schedule(
+                    state.power_up_left,
+                    functools.partial(self.timeout_power_up, bee=bee),
+                )
+
+        self.obstacles = []
+        for saved in world.obstacles:
+            obstacle = Obstacle(saved.y, SPRITES[saved.sprite])
+            obstacle.launch(
+                saved.x,
+                saved.base_y,
+                tuple(behaviors.BEHAVIORS.values())[saved.behavior],
+                self.timers.now,
+            )
+            obstacle.pos = (saved.x, saved.y)
+            obstacle.phase += saved.phase
+            obstacle.velocity = saved.velocity
+            obstacle.passed_by = {
+                bee
+                for index, bee in enumerate(self.bees)
+                if saved.passed_by & 1 << index
+            }
+            self.obstacles.append(obstacle)
+        self.power_ups = []
+        for position in world.power_ups:
+            power_up = PowerUp()
+            power_up.pos = power_up.rect.pos = position
+            self.power_ups.append(power_up)
+        self.tick = world.tick
+        self.score = world.score
+        rng.gameplay.setstate(world.random_state)
+        self.next_power_up = world.next_power_up
+
+        self.init_score_label()
+        self.add_widget(self.score_label)
+        for widget in [*self.obstacles, *self.power_ups]:
+            self.add_widget(widget)
+        for bee in self.bees:
+            if bee.alive and not bee.parent:
+                self.add_widget(bee)
+            if bee.alive and bee.invincible:
+                self.add_widget(self.effect_of(bee))
+        self.schedule_animation()
+        self.run_state.transition(RunState.PLAYING)
+        self.run_state.transition(RunState.PAUSED)
+        if self.telemetry:
+            self.telemetry.start_session()
+            self.telemetry.record("resume", tick=self.tick)
+        self.bind(on_touch_down=self.fly)
+        self.bind(on_touch_up=self.fall)
+        self.bind(on_touch_move=self.move)
+        self.load_highscores()
 
-    def timeout_power_up(self, arg):
+    def enter_run_state(self, state: RunState, previous_state: RunState):
+        """Schedules or tears down the periodic work of the game for the new run state.
+
+        Only a running game runs ``frame`` on every displayed frame; every other state just
+        redraws the static screen at a capped frame rate.
+        """
+
+        Clock.unschedule(self.frame)
+        if self.simulation and state is RunState.PLAYING:
+            self.simulation.resume()
+        elif self.simulation:
+            self.simulation.pause()
+        if state is RunState.PLAYING:
+            self.timers.resume()
+            self.pacer.accumulator = 0.0
+            Clock.schedule_interval(self.frame, 0)
+            if previous_state is RunState.PAUSED:
+                self.score_label.text = f"Score: {self.score}"
+                self.retest_vsync()
+        else:
+            self.timers.pause()
+            self.latency.discard()
+        if state is RunState.PAUSED:
+            self.score_label.text = "Paused"
+
+        if self.theme_song and state is RunState.BACKGROUNDED:
+            self.theme_song.stop()
+        elif (
+            self.theme_song
+            and previous_state is RunState.BACKGROUNDED
+            and state is not RunState.GAME_OVER
+        ):
+            self.theme_song.play()
+        set_max_fps(self.playing_fps if state is RunState.PLAYING else MAX_FPS[state])
+        if self.gc_policy:
+            self.gc_policy.enter(state)
+
+    def apply_quality(self, tier: QualityTier):
+        """Applies the visual settings of a new quality tier."""
+
+        for effect in self.invincible_effects.values():
+            effect.num_glitters = tier.glitter_count
+        if self.view:
+            self.view.set_quality_scale(tier.render_scale)
+        if self.simulation:
+            self.simulation.env.max_obstacles = tier.max_obstacles
+        self.schedule_animation()
+
+    def schedule_animation(self):
+        """(Re)starts the sprite animation with the delay of the current quality tier."""
+
+        if self.animation_timer:
+            self.animation_timer.cancel()
+        self.bee.anim_delay = self.quality.tier.anim_delay
+        if self.sprites:
+            # the shader shows the frames, only their rate changes
+            for widget in list(self.sprites.sprites):
+                self.sprites.animate(widget, 1 / self.bee.anim_delay, self.timers.now)
+            return
+        self.animation_timer = self.timers.schedule_interval(
+            self.bee.anim_delay, self.animate
+        )
+
+    def timeout_power_up(self, arg, bee: Bee | None = None):
         """Timeout function for the power up."""
         del arg
-        self.bee.invincible = False
-        self.remove_widget(self.invincible_effect)
+        bee = bee or self.bee
+        bee.power_up_timer = None
+        bee.invincible = False
+        self.remove_widget(self.effect_of(bee))
 
-    def update(self, *args):  # pylint: disable=too-many-statements  # main update method
+    def animate(self, arg):
+        """Shows the next animation frame of the bees and all obstacles."""
+        del arg
+        for bee in self.bees:
+            if bee.alive:
+                bee.update_frame(None)
+        for obstacle in self.obstacles:
+            obstacle.update_frame(None)
+
+    def refresh_detected(self, interval: float, synced: bool):
+        """Caps the frame rate of a running game at the tick rate if the frames are not paced
+        by vsync, so the clock does not spin; a synced display is not capped.
+
+        Once capped, the frames are paced by the cap itself and look synced, so the cap stays
+        until ``retest_vsync`` lifts it.
         """
-        Updates the game by updating the bee and obstacles.
 
-        Adds obstacles to the screen and also updates the score.
+        Logger.info(
+            "BeeLazy: refresh %.1f Hz, %s",
+            1 / interval,
+            "synced" if synced else "not synced",
+        )
+        if synced and self.playing_fps != MAX_FPS[RunState.PLAYING]:
+            return
+        self.playing_fps = MAX_FPS[RunState.PLAYING] if synced else round(1 / TICK)
+        if self.run_state.state is RunState.PLAYING:
+            set_max_fps(self.playing_fps)
+
+    def retest_vsync(self):
+        """Lifts the frame rate cap of a running game so the pacer tests the display again."""
+
+        if self.playing_fps == MAX_FPS[RunState.PLAYING]:
+            return
+        self.playing_fps = MAX_FPS[RunState.PLAYING]
+        self.pacer.reset()
+        if self.run_state.state is RunState.PLAYING:
+            set_max_fps(self.playing_fps)
+
+    def frame(self, dt: float):
+        """Runs all the work of a running game for one displayed frame.
+
+        The pacer decides how many ticks the frame runs, so the world moves evenly at any refresh
+        rate; the background scrolls on every frame.
         """
 
-        del args
-        self.bee.update()
+        self.quality.record(dt)
+        if self.telemetry:
+            self.telemetry.record_frame(dt)
+        self.frame_time = dt
+        ticks = self.pacer.ticks(dt)
+        if self.simulation:
+            self.present(dt)
+        for _ in range(0 if self.simulation else ticks):
+            self.update()
+            if self.run_state.state is not RunState.PLAYING:
+                break
+        if self.quality.tier.scroll_background:
+            self.txupdate()
+
+    def update(self, dt: float = TICK):
+        """
+        Updates the game by updating the bees and obstacles.
+
+        Adds obstacles to the screen and also updates the score. The game timers are advanced by
+        the elapsed time ``dt`` first.
+        """
+
+        start = time.perf_counter()
+        self.latency.tick()
+        self.timers.advance(dt)
+        if self.sprites:
+            self.sprites.set_time(self.timers.now)
+        self.tick += 1
+        self.recording.append(self.bee.flying)
+
+        alive = [bee for bee in self.bees if bee.alive]
+        for bee in alive:
+            if bee.input_source:
+                if bee.input_source(self.tick):
+                    bee.fly()
+                else:
+                    bee.fall()
+            bee.update()
+            if bee.invincible:
+                effect = self.effect_of(bee)
+                effect.update(bee)
+                effect.draw_glitter()
+
+        hitboxes = [(bee, bee.hitbox()) for bee in alive]
+        self.update_power_ups(hitboxes)
+        self.spawn_obstacle(alive)
+        crashed = self.update_obstacles(hitboxes)
+        for bee in alive:
+            if bee.pos[1] < -bee.size[1]:
+                crashed.setdefault(bee, "fell")
+        if self.flight_recorder:
+            self.flight_recorder.record(
+                self.tick,
+                self.timers.now,
+                self.bee.pos[1],
+                self.bee.velocity[1],
+                len(self.obstacles) + len(self.power_ups),
+                self.score,
+                time.perf_counter() - start,
+                self.frame_time,
+                sum(bee.flying << index for index, bee in enumerate(self.bees)),
+            )
+        for bee, cause in crashed.items():
+            self.crash(bee, cause)
+        self.export_world()
+
+    def present(self, dt: float = TICK):
+        """Shows the newest frame of the simulation running on the worker thread.
+
+        Only the player's bee takes part in the simulation; the other bees are not shown.
+        """
+
+        if not self.simulation:
+            return
+        self.latency.tick()
+        self.timers.advance(dt)
+        if self.sprites:
+            self.sprites.set_time(self.timers.now)
+        frame = self.simulation.frames.latest()
+        self.tick = frame.tick
+        bee = self.bee
+        bee.pos = (bee.pos[0], frame.bee_y)
+        bee.invincible = frame.invincible
+        effect = self.effect_of(bee)
+        if bee.invincible:
+            if not effect.parent:
+                self.add_widget(effect)
+            effect.update(bee)
+            effect.draw_glitter()
+        elif effect.parent:
+            self.remove_widget(effect)
 
-        if self.bee.invincible:
-            self.invincible_effect.update(self.bee)
-            self.invincible_effect.draw_glitter()
+        self.present_obstacles(frame)
+        if frame.score != self.score:
+            self.score = bee.score = frame.score
+            self.score_label.text = f"Score: {self.score}"
+        if frame.crash and bee.alive:
+            self.crash(bee, frame.crash)
+        self.export_world()
+
+    def export_world(self):
+        """Writes the world of this tick into the shared memory of external tools."""
+
+        if self.shared_world:
+            self.shared_world.write(
+                self.tick, self.score, self.bees, self.obstacles, self.power_ups
+            )
+
+    def present_obstacles(self, frame: "Frame"):
+        """Adds, moves and removes the obstacle and power up widgets to match a frame."""
+
+        slots = {slot: (x_pos, y_pos) for slot, x_pos, y_pos in frame.obstacles}
+        for slot in set(self.obstacle_slots) - set(slots):
+            self.remove_widget(self.obstacle_slots.pop(slot))
+        for slot, pos in slots.items():
+            if slot not in self.obstacle_slots:
+                self.obstacle_slots[slot] = Obstacle(pos[1])
+                self.add_widget(self.obstacle_slots[slot])
+            self.obstacle_slots[slot].pos = pos
+        self.obstacles = list(self.obstacle_slots.values())
+
+        if frame.power_up and not self.power_ups:
+            self.power_ups = [PowerUp()]
+            self.add_widget(self.power_ups[0])
+        elif not frame.power_up and self.power_ups:
+            self.remove_widget(self.power_ups.pop())
+        if frame.power_up:
+            self.power_ups[0].pos = self.power_ups[0].rect.pos = frame.power_up
+
+    def update_power_ups(self, hitboxes: list[tuple[Bee, tuple]]):
+        """Moves the power ups and lets the first bee touching one become invincible."""
 
         # small change for a power up to pop up on the screen
-        if (
-            random.randint(0, 1400) == 0
-            and len(self.power_ups) < 1
-            and not self.bee.invincible
-        ):
-            new_powerup = PowerUp()
-            self.power_ups.append(new_powerup)
-            self.add_widget(new_powerup)
+        if self.tick >= self.next_power_up:
+            self.next_power_up = self.tick + rng.ticks_until(
+                rng.gameplay, POWER_UP_CHANCE
+            )
+            if len(self.power_ups) < 1 and not all(
+                bee.invincible for bee, _ in hitboxes
+            ):
+                new_powerup = PowerUp()
+                self.power_ups.append(new_powerup)
+                self.add_widget(new_powerup)
 
-        for power_up in self.power_ups:
+        for power_up in self.power_ups[:]:
             power_up.update()
             if power_up.pos[0] < -power_up.size[0]:
                 self.remove_widget(power_up)
                 self.power_ups.remove(power_up)
-            if self.bee.check_collision(power_up):
-                self.bee.invincible = True
-                self.remove_widget(power_up)
-                Clock.schedule_once(self.timeout_power_up, timeout=8)
-                # Add the sprite and Fbo to the widget
-                self.invincible_effect.update(self.bee)
-                self.add_widget(self.invincible_effect)
+                continue
+            box = (*power_up.pos, *power_up.size)
+            for bee, hitbox in hitboxes:
+                if not bee.invincible and hits(hitbox, box):
+                    bee.invincible = True
+                    if self.telemetry:
+                        self.telemetry.record("power_up", bee=self.bees.index(bee))
+                    self.remove_widget(power_up)
+                    self.power_ups.remove(power_up)
+                    bee.power_up_timer = self.timers.schedule(
+                        INVINCIBLE_DURATION,
+                        functools.partial(self.timeout_power_up, bee=bee),
+                    )
+                    # Add the sprite and Fbo to the widget
+                    effect = self.effect_of(bee)
+                    effect.update(bee)
+                    self.add_widget(effect)
+                    break
 
-        self.last_positions.append(self.bee.pos[1])
+    def spawn_obstacle(self, alive: list[Bee]):
+        """Adds a new obstacle while there are less than the score allows.
 
-        if all(
-            pos == self.last_positions[0] or abs(self.last_positions[0] - pos) <= 5
-            for pos in self.last_positions
-        ):
-            y_pos = self.bee.pos[1]
-        else:
-            y_pos = None
+        A new obstacle heads for a bee that hovers at the same height.
+        """
 
-        obstacles = self.score / 30 or 1
-        obstacles = min(obstacles, MAX_OBSTACLES)
+        obstacles = self.score / SCORE_PER_OBSTACLE or 1
+        obstacles = min(obstacles, self.quality.tier.max_obstacles)
         if len(self.obstacles) < obstacles:
-            new_obstacle = Obstacle(y_pos)
-            reinforcement = (self.score / 100) + 1
-            new_obstacle.velocity = reinforcement * random.randint(10, 20)
-            self.obstacles.append(new_obstacle)
-            self.add_widget(self.obstacles[-1])
+            y_pos = next((bee.pos[1] for bee in alive if bee.hovering()), None)
+            if y_pos is None:
+                y_pos = spawn_height()
+            behavior = behaviors.choose(
+                self.score, math.ceil(obstacles) - len(self.obstacles)
+            )
+            reinforcement = (self.score / SCORE_PER_REINFORCEMENT) + 1
+            velocity = reinforcement * rng.gameplay.randint(*OBSTACLE_SPEED)
+            for member in range(behavior.members):
+                new_obstacle = (
+                    self.spare_obstacles.pop() if self.spare_obstacles else Obstacle()
+                )
+                new_obstacle.launch(
+                    WORLD_WIDTH + member * behavior.spacing,
+                    y_pos,
+                    behavior,
+                    self.timers.now,
+                )
+                new_obstacle.velocity = velocity
+                self.obstacles.append(new_obstacle)
+                self.add_widget(new_obstacle)
+            self.prepare_obstacles()
 
-        for obstacle in self.obstacles:
-            obstacle.update()
+    def update_obstacles(self, hitboxes: list[tuple[Bee, tuple]]) -> dict[Bee, str]:
+        """Moves the obstacles and checks all bees against each of them in one pass.
+
+        The collisions are checked along the motion of the bees and obstacles during the tick, so
+        fast obstacles cannot pass through a bee between two ticks. Returns the bees that collided
+        with an obstacle together with the cause.
+        """
+
+        crashed = {}
+        behaviors.step(
+            self.obstacles,
+            self.timers.now,
+            hitboxes[0][0].pos[1] if hitboxes else None,
+        )
+        for obstacle in self.obstacles[:]:
             if obstacle.pos[0] < -obstacle.size[0]:
                 self.remove_widget(obstacle)
                 self.obstacles.remove(obstacle)
-            if (
-                self.bee.pos[0] > obstacle.pos[0] + obstacle.size[0]
-                and obstacle not in obstacle.passed_obstacles
-            ):
-                self.score += 1
-                obstacle.passed_obstacles.append(obstacle)
-                self.score_label.text = f"Score: {self.score}"
-            if (
-                self.bee.check_collision(obstacle)
-                or self.bee.pos[1] < -self.bee.size[1]
-                and not self.game_over
-            ):
-                self.game_over = True
-                Clock.unschedule(self.update)
-                Clock.unschedule(self.txupdate)
-                self.remove_widget(self.bee)
-                self.score_label.text = "Game over!"
-                self.theme_song.stop()
-                self.save_highscores()
-                self.show_restart_button()
-                self.show_highscore_label(self.score)
+            box = (*obstacle.pos, *obstacle.size)
+            for bee, hitbox in hitboxes:
+                if hitbox[0] > box[0] + box[2] and bee not in obstacle.passed_by:
+                    obstacle.passed_by.add(bee)
+                    bee.score += 1
+                    if bee is self.bee:
+                        self.score += 1
+                        self.score_label.text = f"Score: {self.score}"
+                if (
+                    not bee.invincible
+                    and self.impact(bee, hitbox, obstacle) is not None
+                ):
+                    crashed[bee] = "obstacle"
+        return crashed
+
+    @staticmethod
+    def impact(bee: Bee, hitbox: tuple, obstacle: Obstacle) -> float | None:
+        """Returns the time of impact of a bee and an obstacle during the last tick, if any."""
+
+        start = (
+            hitbox[0] - bee.motion[0],
+            hitbox[1] - bee.motion[0],
+            hitbox[2] - bee.motion[1],
+            hitbox[3] - bee.motion[1],
+        )
+        box = (
+            obstacle.pos[0] - obstacle.motion[0],
+            obstacle.pos[1] - obstacle.motion[1],
+            *obstacle.size,
+        )
+        return sweep(start, bee.motion, box, obstacle.motion)
+
+    def crash(self, bee: Bee, cause: str = "obstacle"):
+        """Removes a crashed bee; the game is over when no player is left."""
+
+        if self.telemetry:
+            self.telemetry.record("death", bee=self.bees.index(bee), cause=cause)
+        bee.alive = False
+        if bee.power_up_timer:
+            bee.power_up_timer.cancel()
+        self.remove_widget(bee)
+        self.remove_widget(self.effect_of(bee))
+
+        players = [bee for bee in self.bees if not bee.input_source] or self.bees
+        if self.game_over or any(bee.alive for bee in players):
+            return
+        self.game_over = True
+        self.run_state.transition(RunState.GAME_OVER)
+        if self.snapshot:
+            self.snapshot.clear()
+        self.end_session(cause)
+        if self.flight_recorder:
+            self.flight_recorder.dump("game-over")
+        self.score_label.text = "Game over!"
+        self.theme_song.stop()
+        self.defer(self.finish_game, deadline=GAME_OVER_DEADLINE)
+
+    def finish_game(self) -> typing.Iterator[None]:
+        """Stores the score and shows the game over screen, one step per frame."""
+
+        self.save_highscores()
+        yield
+        self.show_highscore_label(self.score)
+        yield
+        self.show_restart_button()
+
+    def prepare_obstacles(self):
+        """Builds the spare obstacles of the current quality tier over the next frames."""
+
+        if self.obstacle_job and not self.obstacle_job.done:
+            return
+
+        def build() -> typing.Iterator[None]:
+            while len(self.spare_obstacles) < self.quality.tier.max_obstacles:
+                self.spare_obstacles.append(Obstacle())
+                yield
+
+        # after all work that is visible to the player
+        self.obstacle_job = self.defer(build, priority=1)
+
+    def defer(
+        self, task: typing.Callable, priority: int = 0, deadline: float | None = None
+    ) -> Job:
+        """Runs expensive work within the job budget of the next frames."""
+
+        job = self.jobs.submit(task, priority, deadline)
+        self.run_jobs_trigger()
+        return job
+
+    def run_jobs(self, *args):
+        """Runs the queued jobs within the budget of this frame."""
+
+        self.jobs.run(*args)
+        if self.jobs:
+            self.run_jobs_trigger()
+
+    def end_session(self, cause: str):
+        """Ends the telemetry session together with the collection pauses during the game."""
+
+        if not self.telemetry:
+            return
+        if self.gc_policy:
+            self.telemetry.record("gc_pauses", **self.gc_policy.session_stats())
+        self.telemetry.record("frame_pacing", **self.pacer.session_stats())
+        self.telemetry.end_session(self.score, self.tick, cause)
 
     def fly(self, *args):
-        """Activates flying mode for the bee."""
+        """Activates flying mode for the bee and continues a paused game."""
 
-        del args
-        self.bee.fly()
+        if self.run_state.state is RunState.PAUSED:
+            self.run_state.transition(RunState.PLAYING)
+        if self.run_state.state is RunState.PLAYING:
+            device = args[1].device if len(args) > 1 else "unknown"
+            self.latency.touch(f"{platform}/{device}")
+        if self.simulation:
+            self.simulation.send(True)
+        self.touched_bee(args).fly()
+
+    def frame_shown(self, *args):
+        """Completes the latencies of the touches whose effect this frame shows."""
+
+        for device, latency in self.latency.frame(*args):
+            if self.telemetry:
+                self.telemetry.record_latency(device, latency)
 
     def fall(self, *args):
         """Activates fall mode for the bee."""
 
-        del args
-        self.bee.fall()
+        if self.simulation:
+            self.simulation.send(False)
+        self.touched_bee(args).fall()
 
     def move(self, *args):
         """Activates move mode for the bee."""
-        self.bee.move(args)
+        self.touched_bee(args).move(args)
+
+    def touched_bee(self, args) -> Bee:
+        """Returns the bee steered by a touch.
+
+        With several touch controlled bees the screen is split into one column per bee.
+        """
+
+        players = [bee for bee in self.bees if not bee.input_source]
+        if len(players) < 2 or len(args) < 2:
+            return self.bee
+        column = int(args[1].pos[0] / WORLD_WIDTH * len(players))
+        return players[min(max(column, 0), len(players) - 1)]
 
     def show_restart_button(self):
         """Adds the restart button after a game over."""
@@ -272,7 +925,7 @@ class Game(Widget):
             text="Retry",
             size_hint=(None, None),
             size=(200, 100),
-            pos=(Window.width / 2 - 100, Window.height / 3 - 150),
+            pos=(WORLD_WIDTH / 2 - 100, WORLD_HEIGHT / 3 - 150),
             outline_color=(0, 0, 0, 1),
             outline_width=2,
         )
@@ -284,7 +937,7 @@ class Game(Widget):
 
         # Display highscores
         self.highscore_label = Label(
-            center_x=Window.width / 2,
+            center_x=WORLD_WIDTH / 2,
             text="Highscores:\n",
             color=(1, 1, 1, 1),
             font_size="24sp",
@@ -304,6 +957,13 @@ class Game(Widget):
             if i < 5:
                 self.highscore_label.text += f"      {i + 1}. {score}\n"
 
+        # the global scores come from the cache and are refreshed in the background
+        global_scores = self.leaderboard.top(5) if self.leaderboard else []
+        if global_scores:
+            self.highscore_label.text += "Global:\n"
+        for i, score in enumerate(global_scores):
+            self.highscore_label.text += f"      {i + 1}. {score}\n"
+
         offset = self.score_label.size[1] if self.score_label else 0
         self.highscore_label.top = TOP_TEXT - 3 * self.highscore_label.size[1] - offset
         self.add_widget(self.highscore_label)
@@ -333,16 +993,158 @@ class Game(Widget):
         self.highscores = self.highscores[:1000]  # Keep only the top 100 scores
 
         self.store.put("scores", scores=self.highscores)
+        if self.leaderboard:
+            self.leaderboard.submit(self.score)
 
 
 class BeeLazy(App):
     """Class that builds the game and starts the theme song."""
 
+    game: Game | None = None
+    profiler: Profiler | None = None
+
     def build(self):
+        # runs with the same BEELAZY_SEED play out the same for the same input
+        rng.seed(os.environ.get("BEELAZY_SEED"))
+        if os.environ.get("BEELAZY_PROFILE"):
+            self.start_profiler(os.environ["BEELAZY_PROFILE"])
         game = Game()
-        game.theme_song = SoundLoader.load("assets/theme.mp3")  # Load the MP3 file
+        self.game = game
+        game.theme_song = SoundLoader.load(
+            assets.sound("theme.mp3", self.user_data_dir)
+        )  # Load the MP3 file
         if game.theme_song:
             game.theme_song.loop = True  # Set the theme song to loop
             game.theme_song.play()  # Start playing the theme song
         game.load_highscores()
-        return game
+        game.telemetry = TelemetrySink(
+            os.path.join(self.user_data_dir, "telemetry.sqlite3")
+        )
+        game.snapshot = SnapshotFile(os.path.join(self.user_data_dir, "snapshot.bin"))
+        game.flight_recorder = FlightRecorder(
+            os.path.join(self.user_data_dir, "flight_recorder")
+        )
+        game.flight_recorder.dump_on_exception()
+        world = game.snapshot.load()
+        if world:
+            game.restore(world)
+        if os.environ.get("BEELAZY_GPU_SPRITES"):
+            game.use_gpu_sprites()
+        if os.environ.get("BEELAZY_SIMULATION_THREAD"):
+            # pylint: disable-next=import-outside-toplevel
+            from src.simulation import Simulation  # needs numpy
+
+            game.simulation = Simulation(
+                max_obstacles=game.quality.tier.max_obstacles
+            ).start((WORLD_WIDTH, WORLD_HEIGHT))
+        leaderboard_url = os.environ.get("BEELAZY_LEADERBOARD_URL")
+        if leaderboard_url:
+            game.leaderboard = LeaderboardClient(
+                leaderboard_url, os.path.join(self.user_data_dir, "leaderboard.json")
+            )
+            game.leaderboard.top(5)  # warm the cache for the highscore screen
+        Window.bind(on_minimize=self.on_minimize, on_restore=self.on_restore)
+        Window.bind(on_flip=game.frame_shown)
+        Window.bind(
+            on_resize=viewport.current.resize, on_rotate=viewport.current.resize
+        )
+        viewport.current.subscribe(game.viewport_changed)
+        viewport.current.resize(Window)
+        game.view = ScaledView(
+            render_scale=float(os.environ.get("BEELAZY_RENDER_SCALE", "1"))
+        )
+        game.view.set_quality_scale(game.quality.tier.render_scale)
+        game.view.add_widget(game)
+        if os.environ.get("BEELAZY_SHARED_WORLD"):
+            game.shared_world = WorldExporter(os.environ["BEELAZY_SHARED_WORLD"])
+        if os.environ.get("BEELAZY_LATENCY_OVERLAY"):
+            overlay = LatencyOverlay(game.latency)
+            game.view.add_widget(overlay)
+            Clock.schedule_interval(overlay.refresh, 0.5)
+        # everything loaded so far lives as long as the app
+        game.gc_policy = GcPolicy()
+        game.gc_policy.freeze()
+        game.gc_policy.enter(game.run_state.state)
+        return game.view
+
+    def start_profiler(self, trace_path: str):
+        """Records the clock callbacks of the game into a Chrome trace until the app stops.
+
+        ``BEELAZY_PROFILE_SAMPLES`` names a file for the collapsed stacks of the main thread.
+        """
+
+        self.profiler = Profiler(trace_path, os.environ.get("BEELAZY_PROFILE_SAMPLES"))
+        self.profiler.trace(Game, "update", "present", "txupdate", "animate")
+        self.profiler.trace(Bee, "update_frame")
+        self.profiler.trace(Obstacle, "update_frame")
+        self.profiler.trace(StartScreen, "set_button_width")
+        self.profiler.start()
+
+    def on_pause(self):
+        """Puts the game into the backgrounded state when the OS pauses the app.
+
+        A run in progress is saved first, so it survives if the OS kills the app.
+        """
+
+        if self.game.snapshot and self.game.run_state.state in (
+            RunState.PLAYING,
+            RunState.PAUSED,
+        ):
+            start = time.perf_counter()
+            try:
+                size = self.game.snapshot.save(self.game.world_state())
+            except (OSError, ValueError) as error:
+                # e.g. more bees than a snapshot holds or a full disk
+                Logger.warning("BeeLazy: Skipped the snapshot: %s", error)
+            else:
+                Logger.info(
+                    "BeeLazy: Saved a snapshot of %d bytes in %.2f ms",
+                    size,
+                    (time.perf_counter() - start) * 1000,
+                )
+        self.game.run_state.background()
+        return True
+
+    def on_resume(self):
+        """Brings the game back from the backgrounded state."""
+
+        self.game.run_state.foreground()
+
+    def on_minimize(self, *args):
+        """Puts the game into the backgrounded state when the window is minimized."""
+
+        del args
+        self.on_pause()
+
+    def on_restore(self, *args):
+        """Brings the game back when the window is restored."""
+
+        del args
+        self.on_resume()
+
+    def on_stop(self):
+        """Logs the CPU wakeups per run state and the collection pauses and stores the telemetry."""
+
+        for state, wakeups in self.game.run_state.wakeups_per_second().items():
+            Logger.info("BeeLazy: %s: %.1f wakeups/s", state, wakeups)
+        self.game.end_session("quit")
+        if self.game.telemetry:
+            self.game.telemetry.close()
+        if self.game.gc_policy:
+            Logger.info(
+                "BeeLazy: %s collections per generation, longest pause %.2f ms",
+                self.game.gc_policy.collections,
+                self.game.gc_policy.longest_pause * 1000,
+            )
+            self.game.gc_policy.stop()
+        if self.game.leaderboard:
+            self.game.leaderboard.close()
+        if self.game.simulation:
+            self.game.simulation.stop()
+        if self.profiler:
+            self.profiler.stop()
+        if self.game.flight_recorder:
+            self.game.flight_recorder.close()
+        if self.game.shared_world:
+            self.game.shared_world.close()
+        Logger.info("BeeLazy: Jobs: %s", self.game.jobs.stats())
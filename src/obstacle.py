@@ -1,62 +1,53 @@
 """Implements the Obstacle with its animation."""
 
-import random
-
-from kivy.clock import Clock
-from kivy.core.image import Image as CoreImage
-from kivy.core.window import Window
 from kivy.uix.image import Image
 
+from src import assets, rng, viewport
+from src.behaviors import BEHAVIORS, Behavior, phase
+from src.rules import SPRITE_SIZE, WORLD_HEIGHT, WORLD_WIDTH
+
+SPRITES = ("bird", "swallow")
+"""The sprites an obstacle can look like."""
+
+
+def spawn_height() -> int:
+    """Draws the height an obstacle that no bee is hovering at enters the world."""
+    return rng.gameplay.randint(50, WORLD_HEIGHT - SPRITE_SIZE // 2)
+
 
 class Obstacle(Image):
-    """Implements the Obstacle with its animation."""
+    """Implements the Obstacle with its animation.
 
-    def __init__(self, y: int | None = None, **kwargs):
+    How the obstacle moves is set by its behavior; all obstacles are moved by
+    ``src.behaviors.step``.
+    """
+
+    def __init__(self, y: float | None = None, sprite: str | None = None, **kwargs):
+        # the frames of every resolution tier fill the widget
+        kwargs.setdefault("fit_mode", "contain")
         super().__init__(**kwargs)
-        self.size = (260, 260)
-        self.passed_obstacles: list[Obstacle] = []
-        self.velocity = 5
-        y_pos = y if y else random.randint(50, Window.height - self.size[1] / 2)
-        self.pos = (Window.width, y_pos)
+        self.size = (SPRITE_SIZE, SPRITE_SIZE)
+        self.passed_by: set = set()
+        self.velocity: float = 5
+        # spare obstacles are built ahead of time, their height is drawn when they spawn
+        y_pos = y if y else WORLD_HEIGHT / 2
+        self.pos: tuple[float, float] = (WORLD_WIDTH, y_pos)
+        self.behavior = BEHAVIORS["straight"]
+        self.base_y: float = y_pos
+        self.phase = 0.0
+        self.motion = (0.0, 0.0)
         self.frames: list = []
         self.frame_idx = 0
         self.anim_delay = 0.1
+        self.sprite = sprite or (
+            rng.cosmetic.choice(SPRITES) if rng.cosmetic.enabled else SPRITES[0]
+        )
         self.load_spritesheet()
         self.bind(on_texture=self.update_texture)
-        Clock.schedule_interval(self.update_frame, self.anim_delay)
 
     def load_spritesheet(self):
-        """Load spritesheet image and split it into individual frames."""
-        sprites = [
-            {
-                "texture": CoreImage("./assets/bird.png").texture,
-                "cols": 6,
-                "rows": 1,
-                "offset": 35,
-            },
-            {
-                "texture": CoreImage("./assets/schwalbe2.png").texture,
-                "cols": 4,
-                "rows": 2,
-                "offset": 0,
-            },
-        ]
-
-        sprite = random.choice(sprites)
-        frame_width, frame_height = (
-            sprite["texture"].width / sprite["cols"],
-            sprite["texture"].height / sprite["rows"],
-        )
-
-        for row in range(sprite["rows"]):
-            for col in range(sprite["cols"]):
-                x_axis = col * frame_width
-                # Invert y-axis to match Kivy's coordinate system
-                y_axis = (sprite["rows"] - row - 1) * frame_height
-                frame = sprite["texture"].get_region(
-                    x_axis + sprite["offset"], y_axis, frame_width, frame_height
-                )
-                self.frames.append(frame)
+        """Load the animation frames of the sprite from the sprite atlas."""
+        self.frames = assets.frames(self.sprite, viewport.current.tier)
 
         self.texture = self.frames[
             self.frame_idx
@@ -74,6 +65,10 @@ class Obstacle(Image):
         del instance, value
         self.texture = self.frames[self.frame_idx]
 
-    def update(self):
-        """Updates the postion of the obstacle."""
-        self.pos = (self.pos[0] - self.velocity, self.pos[1])
+    def launch(self, x: float, y: float, behavior: Behavior, time: float):
+        """Starts the obstacle at a position with a behavior at game time ``time``."""
+        self.pos = (x, y)
+        self.base_y = y
+        self.behavior = behavior
+        self.phase = phase(behavior, time)
+        self.motion = (0.0, 0.0)
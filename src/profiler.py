@@ -0,0 +1,175 @@
+"""Implements the profiling mode that records a session for later inspection.
+
+Traced methods, e.g. the Kivy clock callbacks of the game, are wrapped in spans that are written
+in the Chrome Trace Event format, which ``chrome://tracing`` and https://ui.perfetto.dev open.
+Optionally a sampler thread records the stack of the main thread at a fixed interval in the
+collapsed stack format of ``flamegraph.pl`` and speedscope.
+"""
+
+import collections
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import typing
+
+SAMPLE_INTERVAL = 0.005
+"""Seconds between two stack samples."""
+
+BUFFER_SIZE = 4096
+"""The number of spans that are buffered before they are written."""
+
+
+class TraceWriter:
+    """Writes spans as complete events of a Chrome trace, in batches of ``buffer_size``.
+
+    The spans are buffered as tuples and only formatted when they are written, so a span costs
+    little more than an append while the game is running.
+    """
+
+    def __init__(self, path: str, buffer_size: int = BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.pid = os.getpid()
+        # pylint: disable-next=consider-using-with
+        self._file = open(path, "w", encoding="utf-8")  # noqa: SIM115
+        self._file.write("[")
+        self._spans: list[tuple[str, float, float, int]] = []
+        self._separator = ""
+        self.write_event(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": threading.get_native_id(),
+                "args": {"name": threading.current_thread().name},
+            }
+        )
+
+    def span(self, name: str, start: float, duration: float):
+        """Buffers a span; the times are in seconds of ``time.perf_counter``."""
+        self._spans.append((name, start, duration, threading.get_native_id()))
+        if len(self._spans) >= self.buffer_size:
+            self.flush()
+
+    def write_event(self, event: dict):
+        """Writes a single trace event."""
+        self._file.write(self._separator + json.dumps(event))
+        self._separator = ",\n"
+
+    def flush(self):
+        """Writes the buffered spans."""
+        for name, start, duration, tid in self._spans:
+            self.write_event(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": round(start * 1e6, 1),
+                    "dur": round(duration * 1e6, 1),
+                    "pid": self.pid,
+                    "tid": tid,
+                }
+            )
+        self._spans = []
+
+    def close(self):
+        """Writes the remaining spans and ends the trace."""
+        self.flush()
+        self._file.write("]\n")
+        self._file.close()
+
+
+def collapse(frame) -> str:
+    """Returns a stack in the collapsed format, from the outermost frame to ``frame``."""
+    names = []
+    while frame:
+        code = frame.f_code
+        # co_qualname would need Python 3.11; the file name tells same named functions apart
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples the stack of a thread on a background thread and counts the collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: typing.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._sample, name="stack-sampler", daemon=True
+        )
+
+    def start(self):
+        """Starts sampling."""
+        self._thread.start()
+
+    def stop(self):
+        """Stops sampling and waits for the sampler thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self):
+        """Records the stack of the sampled thread every interval."""
+        while not self._stop.wait(self.interval):
+            # pylint: disable-next=protected-access
+            frame = sys._current_frames().get(self.thread_id)
+            if frame:
+                self.stacks[collapse(frame)] += 1
+
+    def write(self, path: str):
+        """Writes the counted stacks, one ``stack count`` line each."""
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(
+                f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+            )
+
+
+class Profiler:
+    """Traces methods into a Chrome trace and optionally samples the stack of the main thread."""
+
+    def __init__(self, trace_path: str, samples_path: str | None = None):
+        self.writer = TraceWriter(trace_path)
+        self.samples_path = samples_path
+        self.sampler = (
+            StackSampler(threading.main_thread().ident or 0) if samples_path else None
+        )
+        self._originals: list[tuple[type, str, typing.Callable]] = []
+
+    def trace(self, cls: type, *names: str):
+        """Wraps methods of a class in spans named ``<class>.<method>`` until ``stop``."""
+        for name in names:
+            method = getattr(cls, name)
+            self._originals.append((cls, name, method))
+            setattr(cls, name, self.traced(method, f"{cls.__name__}.{name}"))
+
+    def traced(self, function: typing.Callable, name: str) -> typing.Callable:
+        """Returns a wrapper of a function that records a span for every call."""
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.writer.span(name, start, time.perf_counter() - start)
+
+        return wrapper
+
+    def start(self):
+        """Starts the stack sampler."""
+        if self.sampler:
+            self.sampler.start()
+
+    def stop(self):
+        """Restores the traced methods and writes the trace and the samples."""
+        for cls, name, method in reversed(self._originals):
+            setattr(cls, name, method)
+        self._originals = []
+        self.writer.close()
+        if self.sampler and self.samples_path:
+            self.sampler.stop()
+            self.sampler.write(self.samples_path)
@@ -0,0 +1,122 @@
+"""Implements the quality governor that trades visuals for speed on slow devices."""
+
+import collections
+import typing
+
+from kivy.logger import Logger
+
+from src.timer_wheel import TICK
+
+
+class QualityTier(typing.NamedTuple):
+    """The visual settings of one quality tier."""
+
+    name: str
+    glitter_count: int
+    """Number of glitter lines drawn per frame while invincible."""
+    anim_delay: float
+    """Seconds between two animation frames of the sprites."""
+    scroll_background: bool
+    """Whether the background scrolls every frame or stands still."""
+    max_obstacles: int
+    """The maximum number of obstacles in one screen."""
+    render_scale: float
+    """The internal resolution relative to the configured one."""
+
+
+QUALITY_TIERS = (
+    QualityTier("low", 2, 0.2, False, 3, 0.5),
+    QualityTier("medium", 5, 0.15, True, 4, 0.75),
+    QualityTier("high", 10, 0.1, True, 5, 1.0),
+)
+"""The quality tiers ordered from the cheapest to the most expensive."""
+
+DOWNGRADE_RATIO = 1.25
+"""Drop a tier when the average frame time exceeds the budget by this ratio."""
+
+UPGRADE_RATIO = 1.05
+"""Count frames towards an upgrade while the average frame time stays within this ratio."""
+
+
+class QualityGovernor:
+    """Steps through the quality tiers based on the measured frame time.
+
+    The governor keeps a rolling window of frame times. When the average of a full window exceeds
+    the frame budget by ``DOWNGRADE_RATIO`` it drops one tier, and only after ``upgrade_after``
+    frames within ``UPGRADE_RATIO`` of the budget it tries the next better tier again. The gap
+    between both ratios and the delay keep the tier from flickering. A manual override pins a
+    tier until it is released again.
+    """
+
+    def __init__(
+        self,
+        on_change: typing.Callable[[QualityTier], None],
+        budget: float = TICK,
+        window: int = 60,
+        upgrade_after: int = 300,
+    ):
+        self.on_change = on_change
+        self.budget = budget
+        self.window = window
+        self.upgrade_after = upgrade_after
+        self.level = len(QUALITY_TIERS) - 1
+        self.pinned: int | None = None
+        self.log: list[tuple[int, str, str, str]] = []
+        self.frame = 0
+        self._frame_times: collections.deque = collections.deque()
+        self._total = 0.0
+        self._good_frames = 0
+
+    @property
+    def tier(self) -> QualityTier:
+        """The currently active quality tier."""
+        return QUALITY_TIERS[self.level]
+
+    def record(self, frame_time: float):
+        """Adds a measured frame time and changes the tier if needed."""
+        self.frame += 1
+        self._frame_times.append(frame_time)
+        self._total += frame_time
+        if len(self._frame_times) > self.window:
+            self._total -= self._frame_times.popleft()
+
+        if self.pinned is not None or len(self._frame_times) < self.window:
+            return
+
+        average = self._total / len(self._frame_times)
+        if average > self.budget * DOWNGRADE_RATIO:
+            self._good_frames = 0
+            if self.level > 0:
+                self._set_level(self.level - 1, f"average frame time {average:.4f}s")
+        elif average <= self.budget * UPGRADE_RATIO:
+            self._good_frames += 1
+            if (
+                self._good_frames >= self.upgrade_after
+                and self.level < len(QUALITY_TIERS) - 1
+            ):
+                self._set_level(self.level + 1, f"average frame time {average:.4f}s")
+        else:
+            self._good_frames = 0
+
+    def override(self, name: str | None):
+        """Pins the tier with the given name, or gives control back to the governor with None."""
+        if name is None:
+            self.pinned = None
+            return
+        names = [tier.name for tier in QUALITY_TIERS]
+        if name not in names:
+            raise ValueError(f"Unknown quality tier {name}, expected one of {names}")
+        self.pinned = names.index(name)
+        self._set_level(self.pinned, "manual override")
+
+    def _set_level(self, level: int, reason: str):
+        """Activates the tier and starts measuring from scratch."""
+        self._frame_times.clear()
+        self._total = 0.0
+        self._good_frames = 0
+        if level == self.level:
+            return
+        old_tier, self.level = self.tier, level
+        self.log.append((self.frame, old_tier.name, self.tier.name, reason))
+        Logger.info("Quality: %s -> %s (%s)", old_tier.name, self.tier.name, reason)
+        self.on_change(self.tier)
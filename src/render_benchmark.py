@@ -0,0 +1,231 @@
+"""Implements a benchmark of the rendering cost of the game scene.
+
+The ``Game`` widget tree is drawn into an offscreen ``Fbo``, so the benchmark runs without a
+visible window, for example under Mesa llvmpipe on a CI box. Every scene is rendered for a fixed
+number of frames; the frames per second, the number of canvas instructions and optionally a PNG of
+the last frame are reported for each scene.
+"""
+
+import argparse
+import collections
+import os
+import time
+import typing
+
+# the benchmark parses its own arguments
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+# pylint: disable=wrong-import-position
+from kivy.clock import Clock
+from kivy.graphics import Fbo, InstructionGroup
+from kivy.graphics.opengl import (  # pylint: disable=no-name-in-module
+    GL_RENDERER,
+    glFinish,
+    glGetString,
+)
+from kivy.lang import Builder
+
+from src import behaviors, rng
+from src.main_screen import Game
+from src.obstacle import Obstacle
+from src.rules import WORLD_HEIGHT, WORLD_WIDTH
+from src.scaled_view import ScaledView
+
+SIZE = (1280, 720)
+"""The default size of the window the scenes are shown on."""
+
+SCENES = ("obstacles", "invincible", "highscores")
+"""The scenes the benchmark can render."""
+
+
+class SceneResult(typing.NamedTuple):
+    """The result of rendering one scene."""
+
+    scene: str
+    frames: int
+    fps: float
+    instructions: int
+    by_type: dict[str, int]
+
+
+def count_instructions(group: InstructionGroup) -> collections.Counter:
+    """Counts the drawing instructions below a canvas by type, without the groups themselves."""
+    counts: collections.Counter = collections.Counter()
+    for child in group.children:
+        if isinstance(child, InstructionGroup):
+            counts.update(count_instructions(child))
+        else:
+            counts[type(child).__name__] += 1
+    return counts
+
+
+def build_scene(
+    name: str,
+    obstacles: int = 5,
+    size: tuple[int, int] = SIZE,
+    render_scale: float = 1.0,
+    gpu_sprites: bool = False,
+) -> Game:
+    """Builds a game showing one of the ``SCENES`` in a view of the given size."""
+    if name not in SCENES:
+        raise ValueError(f"Unknown scene {name!r}")
+
+    game = Game()
+    game.view = ScaledView(render_scale=render_scale, size=size)
+    game.view.add_widget(game)
+    game.remove_start_screen()
+    game.init_score_label()
+    game.add_widget(game.score_label)
+    game.add_widget(game.bee)
+    game.timers.resume()
+    if gpu_sprites:
+        game.use_gpu_sprites()
+    if name == "obstacles":
+        game.obstacles = [
+            Obstacle(y=(index * 200) % WORLD_HEIGHT + 1) for index in range(obstacles)
+        ]
+        for index, obstacle in enumerate(game.obstacles):
+            obstacle.x = WORLD_WIDTH * index / obstacles
+            game.add_widget(obstacle)
+    elif name == "invincible":
+        game.bee.invincible = True
+        game.add_widget(game.invincible_effect)
+    else:
+        game.highscores = [300, 240, 180, 120, 60, 30]
+        game.show_highscore_label(180)
+    return game
+
+
+def advance(game: Game, frame: int):
+    """Moves the scene on by one frame the way a playing game does."""
+    game.timers.advance(1 / 60)
+    game.txupdate()
+    if game.sprites:
+        game.sprites.set_time(game.timers.now)
+    behaviors.step(game.obstacles, game.timers.now, game.bee.y)
+    for obstacle in game.obstacles:
+        if obstacle.right < 0:
+            obstacle.x = game.width
+        if frame % 6 == 0 and not game.sprites:
+            obstacle.update_frame(None)
+    if game.bee.invincible:
+        game.invincible_effect.update(game.bee)
+        game.invincible_effect.draw_glitter()
+
+
+def render(
+    game: Game, frames: int = 300, png: str | None = None
+) -> tuple[float, collections.Counter]:
+    """Renders the view of a game into an offscreen frame buffer and returns the frames per second.
+
+    Also returns the canvas instructions of the last frame and saves it as a PNG if ``png`` is
+    given.
+    """
+    view = game.view
+    if not view:
+        raise ValueError("The game is not shown in a view")
+
+    fbo = Fbo(size=view.size)
+    fbo.add(view.canvas)
+    start = time.perf_counter()
+    for frame in range(frames):
+        advance(game, frame)
+        # applies the pending canvas and label updates like the event loop does before a frame
+        Builder.sync()
+        Clock.tick_draw()
+        Builder.sync()
+        fbo.draw()
+        # waits for the GPU, otherwise only the submission of the commands would be measured
+        glFinish()
+    elapsed = time.perf_counter() - start
+    if png:
+        fbo.texture.save(png, flipped=True)
+    fbo.remove(view.canvas)
+    return frames / elapsed, count_instructions(game.canvas)
+
+
+def benchmark(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    scenes: typing.Iterable[str] = SCENES,
+    frames: int = 300,
+    obstacles: int = 5,
+    size: tuple[int, int] = SIZE,
+    render_scale: float = 1.0,
+    gpu_sprites: bool = False,
+    png_dir: str | None = None,
+    cosmetics: bool = True,
+) -> list[SceneResult]:
+    """Renders every scene and returns its results.
+
+    Without ``cosmetics`` the cosmetic random draws, e.g. the glitter, are skipped.
+    """
+    results = []
+    enabled, rng.cosmetic.enabled = rng.cosmetic.enabled, cosmetics
+    try:
+        for scene in scenes:
+            game = build_scene(scene, obstacles, size, render_scale, gpu_sprites)
+            png = os.path.join(png_dir, f"{scene}.png") if png_dir else None
+            fps, counts = render(game, frames, png)
+            results.append(
+                SceneResult(scene, frames, fps, sum(counts.values()), dict(counts))
+            )
+    finally:
+        rng.cosmetic.enabled = enabled
+    return results
+
+
+def renderer() -> str:
+    """Returns the name of the OpenGL renderer, e.g. llvmpipe for software rendering."""
+    name = glGetString(GL_RENDERER)
+    return name.decode() if isinstance(name, bytes) else str(name)
+
+
+def main(argv: list[str] | None = None):
+    """Prints the frames per second and the canvas instructions of every scene."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark rendering the game scenes into an offscreen buffer."
+    )
+    parser.add_argument("--scene", choices=SCENES, action="append")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--obstacles", type=int, default=5)
+    parser.add_argument("--size", type=int, nargs=2, default=SIZE)
+    parser.add_argument(
+        "--render-scale",
+        type=float,
+        default=1.0,
+        help="the internal resolution relative to the window",
+    )
+    parser.add_argument(
+        "--gpu-sprites",
+        action="store_true",
+        help="animates the sprites with the sprite shader",
+    )
+    parser.add_argument("--png-dir", help="saves the last frame of every scene here")
+    parser.add_argument(
+        "--no-cosmetics",
+        dest="cosmetics",
+        action="store_false",
+        help="skips the cosmetic random draws like the glitter",
+    )
+    args = parser.parse_args(argv)
+
+    if args.png_dir:
+        os.makedirs(args.png_dir, exist_ok=True)
+    print(f"renderer: {renderer()}")
+    for result in benchmark(
+        args.scene or SCENES,
+        args.frames,
+        args.obstacles,
+        tuple(args.size),
+        args.render_scale,
+        args.gpu_sprites,
+        args.png_dir,
+        args.cosmetics,
+    ):
+        print(
+            f"{result.scene}: {result.fps:.1f} fps, "
+            f"{result.instructions} canvas instructions per frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
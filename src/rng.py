@@ -0,0 +1,45 @@
+"""Implements the named random streams of the game.
+
+Gameplay and cosmetics draw from separate, independently seeded streams instead of the shared
+``random`` module. How many cosmetic numbers are drawn, or whether any are drawn at all, never
+changes the outcome of a game; only the gameplay stream is stored in snapshots.
+"""
+
+import math
+import random
+
+
+class Stream(random.Random):
+    """A random stream; consumers skip the draws of a disabled cosmetic stream."""
+
+    def __init__(self, x=None):
+        self.enabled = True
+        super().__init__(x)
+
+
+gameplay = Stream()
+"""Obstacles, their behaviors and the power ups."""
+
+cosmetic = Stream()
+"""The looks of the sprites and effects."""
+
+STREAMS = {"gameplay": gameplay, "cosmetic": cosmetic}
+"""The streams by name."""
+
+
+def seed(value: int | str | None = None):
+    """Seeds every stream from one value, each with its own derived seed.
+
+    Without a value the streams are seeded from the operating system.
+    """
+    for name, stream in STREAMS.items():
+        stream.seed(None if value is None else f"{value}/{name}")
+
+
+def ticks_until(stream: random.Random, chance: int) -> int:
+    """Draws the number of ticks until an event that happens with ``1 / (chance + 1)`` per tick.
+
+    One draw replaces a roll on every tick, with the same geometric distribution.
+    """
+    probability = 1 / (chance + 1)
+    return 1 + int(math.log(1 - stream.random()) / math.log(1 - probability))
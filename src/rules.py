@@ -0,0 +1,43 @@
+"""Defines the rules of the game shared by the widgets and the headless simulation."""
+
+SPRITE_SIZE = 260
+"""Width and height of the bee and the obstacles."""
+
+HITBOX_OFFSET = 85
+"""Transparent border of the sprites that does not count for collisions."""
+
+BEE_X = 200
+"""Horizontal start position of the bee."""
+
+FLY_VELOCITY = 10
+"""Upward velocity of a flying bee per tick."""
+
+GRAVITY = 0.5
+"""Velocity lost per tick by a bee that does not move."""
+
+POWER_UP_SIZE = 50
+"""Width and height of a PowerUp."""
+
+POWER_UP_VELOCITY = 7
+"""Distance a PowerUp moves to the left per tick."""
+
+POWER_UP_CHANCE = 1400
+"""A PowerUp appears with a chance of one in ``POWER_UP_CHANCE + 1`` per tick."""
+
+INVINCIBLE_DURATION = 8
+"""Duration of the invincibility after gaining a PowerUp in seconds."""
+
+OBSTACLE_SPEED = (10, 20)
+"""Range of the base speed of an obstacle per tick."""
+
+SCORE_PER_OBSTACLE = 30
+"""Every this many points one more obstacle is allowed on the screen."""
+
+SCORE_PER_REINFORCEMENT = 100
+"""Every this many points the obstacles get as fast again as at the start."""
+
+WORLD_WIDTH = 1920
+"""Width of the logical coordinate space the game is simulated and laid out in."""
+
+WORLD_HEIGHT = 1080
+"""Height of the logical coordinate space; it is scaled to fit the window."""
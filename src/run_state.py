@@ -0,0 +1,111 @@
+"""Implements the run states of the game and their power-saving profiles."""
+
+import enum
+import time
+import typing
+
+from kivy.clock import Clock
+
+
+class RunState(enum.Enum):
+    """The states the game can be in."""
+
+    MENU = "menu"
+    PLAYING = "playing"
+    PAUSED = "paused"
+    GAME_OVER = "game_over"
+    BACKGROUNDED = "backgrounded"
+
+
+MAX_FPS = {
+    RunState.MENU: 20,
+    RunState.PLAYING: 0,
+    RunState.PAUSED: 10,
+    RunState.GAME_OVER: 20,
+    RunState.BACKGROUNDED: 1,
+}
+"""The frame rate cap of the Kivy clock in each state. Static screens do not need 60 fps; a
+running game is not capped and paced by vsync at the refresh rate of the display."""
+
+TRANSITIONS = {
+    RunState.MENU: {RunState.PLAYING, RunState.BACKGROUNDED},
+    RunState.PLAYING: {RunState.PAUSED, RunState.GAME_OVER, RunState.BACKGROUNDED},
+    RunState.PAUSED: {RunState.PLAYING, RunState.BACKGROUNDED},
+    RunState.GAME_OVER: {RunState.PLAYING, RunState.BACKGROUNDED},
+    RunState.BACKGROUNDED: {RunState.MENU, RunState.PAUSED, RunState.GAME_OVER},
+}
+"""The states that can be entered from each state."""
+
+
+def set_max_fps(fps: float):
+    """Caps the frame rate of the Kivy clock while the app is running."""
+    # Kivy has no public setter: the maxfps config value is only read when the clock is created,
+    # while the clock reads _max_fps before every frame. Checked against Kivy 2.3.1.
+    Clock._max_fps = float(fps)  # pylint: disable=protected-access
+
+
+class RunStateMachine:
+    """Tracks the run state of the game and how often the CPU wakes up in each state.
+
+    Every transition calls ``on_enter`` with the new and the previous state, which tears down or
+    throttles the scheduled work of the game. The wakeups are the frames of the Kivy clock, which
+    are counted together with the time spent per state.
+    """
+
+    def __init__(
+        self,
+        on_enter: typing.Callable[[RunState, RunState], None],
+        timer: typing.Callable[[], float] = time.perf_counter,
+        frames: typing.Callable[[], int] = lambda: Clock.frames,
+    ):
+        self.on_enter = on_enter
+        self.timer = timer
+        self.frames = frames
+        self.state = RunState.MENU
+        self.previous_state = RunState.MENU
+        self.durations = dict.fromkeys(RunState, 0.0)
+        self.wakeups = dict.fromkeys(RunState, 0)
+        self._entered_at = self.timer()
+        self._entered_frame = self.frames()
+        self.on_enter(self.state, self.previous_state)
+
+    def transition(self, state: RunState):
+        """Enters the given state if it can be reached from the current state."""
+        if state is self.state:
+            return
+        if state not in TRANSITIONS[self.state]:
+            raise ValueError(f"Cannot change from {self.state.value} to {state.value}")
+
+        self._account()
+        self.previous_state = self.state
+        self.state = state
+        self.on_enter(state, self.previous_state)
+
+    def background(self):
+        """Enters the backgrounded state when the app is paused or minimized."""
+        self.transition(RunState.BACKGROUNDED)
+
+    def foreground(self):
+        """Leaves the backgrounded state; a running game comes back paused."""
+        if self.state is not RunState.BACKGROUNDED:
+            return
+        if self.previous_state is RunState.PLAYING:
+            self.transition(RunState.PAUSED)
+        else:
+            self.transition(self.previous_state)
+
+    def wakeups_per_second(self) -> dict[str, float]:
+        """Returns the CPU wakeups per second of every state that was entered."""
+        self._account()
+        return {
+            state.value: self.wakeups[state] / self.durations[state]
+            for state in RunState
+            if self.durations[state] > 0
+        }
+
+    def _account(self):
+        """Adds the time and frames since the last transition to the current state."""
+        now, frame = self.timer(), self.frames()
+        self.durations[self.state] += now - self._entered_at
+        self.wakeups[self.state] += frame - self._entered_frame
+        self._entered_at, self._entered_frame = now, frame
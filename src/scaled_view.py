@@ -0,0 +1,135 @@
+"""Implements drawing the game at an internal resolution independent of the window size."""
+
+from kivy.graphics import (
+    ClearBuffers,
+    ClearColor,
+    Color,
+    Fbo,
+    PopMatrix,
+    PushMatrix,
+    Rectangle,
+    Scale,
+)
+from kivy.uix.widget import Widget
+
+from src.rules import WORLD_HEIGHT, WORLD_WIDTH
+
+
+class ScaledView(Widget):
+    """Shows its children, which are laid out in world coordinates, scaled to fit the view.
+
+    The children are drawn into an offscreen buffer at ``render_scale`` times the resolution the
+    world takes on the window, and the buffer is stretched over the window. Rendering at 50-75%
+    fills far fewer pixels on weak GPUs and high-DPI screens while the game keeps the same layout.
+    The world keeps its aspect ratio and is centred; touches are mapped into world coordinates.
+    """
+
+    def __init__(self, render_scale: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        if render_scale <= 0:
+            raise ValueError("The render scale has to be positive")
+
+        self.render_scale = render_scale
+        self.quality_scale = 1.0
+        self.factor = 1.0  # window pixels per world unit
+        with self.canvas:
+            # the Image widgets clip their texture with the stencil buffer
+            self.fbo = Fbo(size=(WORLD_WIDTH, WORLD_HEIGHT), with_stencilbuffer=True)
+            Color(1, 1, 1, 1)
+            self.rect = Rectangle(texture=self.fbo.texture)
+        with self.fbo.before:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            PushMatrix()
+            self.scale = Scale(1, 1, 1)
+        with self.fbo.after:
+            PopMatrix()
+        self.bind(pos=self.layout, size=self.layout)
+        self.layout()
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        """The size of the offscreen buffer in pixels."""
+        return self.fbo.size
+
+    def layout(self, *args):
+        """Fits the world into the view and resizes the offscreen buffer to match."""
+
+        del args
+        self.factor = min(self.width / WORLD_WIDTH, self.height / WORLD_HEIGHT)
+        width, height = WORLD_WIDTH * self.factor, WORLD_HEIGHT * self.factor
+        self.rect.pos = (
+            self.x + (self.width - width) / 2,
+            self.y + (self.height - height) / 2,
+        )
+        self.rect.size = (width, height)
+        scale = self.render_scale * self.quality_scale
+        self.fbo.size = (max(round(width * scale), 1), max(round(height * scale), 1))
+        self.scale.x = self.fbo.size[0] / WORLD_WIDTH
+        self.scale.y = self.fbo.size[1] / WORLD_HEIGHT
+        # the buffer gets a new texture when it is resized
+        self.rect.texture = self.fbo.texture
+
+    def set_quality_scale(self, scale: float):
+        """Renders at ``scale`` of the configured internal resolution, e.g. for a quality tier."""
+
+        self.quality_scale = scale
+        self.layout()
+
+    def add_widget(self, widget, *args, **kwargs):
+        # the children draw into the offscreen buffer instead of the canvas of the view
+        canvas, self.canvas = self.canvas, self.fbo
+        super().add_widget(widget, *args, **kwargs)
+        self.canvas = canvas
+
+    def remove_widget(self, widget, *args, **kwargs):
+        canvas, self.canvas = self.canvas, self.fbo
+        super().remove_widget(widget, *args, **kwargs)
+        self.canvas = canvas
+
+    def clear_widgets(self, *args, **kwargs):
+        canvas, self.canvas = self.canvas, self.fbo
+        super().clear_widgets(*args, **kwargs)
+        self.canvas = canvas
+
+    def to_local(self, x, y, relative=False):
+        """Maps window coordinates into world coordinates.
+
+        With ``relative`` the coordinates are a distance, which is only scaled.
+        """
+
+        origin_x, origin_y = (0, 0) if relative else self.rect.pos
+        return (x - origin_x) / self.factor, (y - origin_y) / self.factor
+
+    def to_parent(self, x, y, relative=False):
+        """Maps world coordinates into window coordinates.
+
+        With ``relative`` the coordinates are a distance, which is only scaled.
+        """
+
+        origin_x, origin_y = (0, 0) if relative else self.rect.pos
+        return x * self.factor + origin_x, y * self.factor + origin_y
+
+    def on_touch_down(self, touch):
+        touch.push()
+        touch.apply_transform_2d(self.to_local)
+        try:
+            return super().on_touch_down(touch)
+        finally:
+            touch.pop()
+
+    def on_touch_move(self, touch):
+        touch.push()
+        touch.apply_transform_2d(self.to_local)
+        try:
+            return super().on_touch_move(touch)
+        finally:
+            touch.pop()
+
+    def on_touch_up(self, touch):
+        touch.push()
+        touch.apply_transform_2d(self.to_local)
+        try:
+            return super().on_touch_up(touch)
+        finally:
+            touch.pop()
@@ -0,0 +1,246 @@
+"""Implements a live export of the running world into shared memory for external tools.
+
+Every tick writes the bees, obstacles and power ups into a ``multiprocessing.shared_memory``
+block as fixed arrays with one array per field, so other processes read them without
+serialization. A sequence counter at the start of the block works like a seqlock: it is odd while
+a tick is written, and a reader copies the block and retries if the counter was odd or changed
+meanwhile. ``WorldReader`` is the reader library; ``python -m src.shared_world <name>`` prints the
+live world.
+"""
+
+import argparse
+import struct
+import time
+import typing
+from multiprocessing import resource_tracker, shared_memory
+
+from src.snapshot import MAX_BEES, MAX_OBSTACLES, MAX_POWER_UPS
+
+MAGIC = b"BEEW"
+"""The first bytes after the sequence counter."""
+
+VERSION = 1
+"""The version of the layout of the block."""
+
+SEQUENCE = struct.Struct("<Q")
+"""The sequence counter at the start of the block, odd while a tick is written."""
+
+HEADER = struct.Struct("<4sHIIBBB")
+"""Magic, version, tick, score and the bee, obstacle and power up counts after the counter."""
+
+ARRAYS_OFFSET = 32
+"""Where the arrays start, aligned for the floats."""
+
+ARRAYS = (
+    ("bee_x", "f", MAX_BEES),
+    ("bee_y", "f", MAX_BEES),
+    ("bee_velocity", "f", MAX_BEES),
+    ("obstacle_x", "f", MAX_OBSTACLES),
+    ("obstacle_y", "f", MAX_OBSTACLES),
+    ("obstacle_velocity", "f", MAX_OBSTACLES),
+    ("power_up_x", "f", MAX_POWER_UPS),
+    ("power_up_y", "f", MAX_POWER_UPS),
+    ("bee_flags", "B", MAX_BEES),
+)
+"""Name, ``struct`` format and length of every array, in the order of the block."""
+
+FLYING, ALIVE, INVINCIBLE = 1, 2, 4
+"""The bits of ``bee_flags``."""
+
+SIZE = ARRAYS_OFFSET + sum(struct.calcsize(fmt) * length for _, fmt, length in ARRAYS)
+"""The size of the block in bytes."""
+
+
+class ExportedBee(typing.Protocol):  # pylint: disable=too-few-public-methods
+    """A bee as seen by the exporter."""
+
+    pos: tuple[float, float]
+    velocity: list[float]
+    flying: bool
+    alive: bool
+    invincible: bool
+
+
+class SharedWorld(typing.NamedTuple):
+    """A consistent copy of the world of one tick.
+
+    ``arrays`` are views of the copy trimmed to the counts, e.g. ``arrays["obstacle_x"]``; they
+    support the buffer protocol, so ``numpy.asarray`` wraps them without copying. The next read of
+    the reader overwrites them.
+    """
+
+    sequence: int
+    tick: int
+    score: int
+    bees: int
+    obstacles: int
+    power_ups: int
+    arrays: dict[str, memoryview]
+
+
+def views(buffer: typing.Any) -> dict[str, typing.Any]:
+    """Returns the arrays of a block as typed views of the buffer."""
+    memory: typing.Any = memoryview(buffer)
+    arrays: dict[str, typing.Any] = {}
+    offset = ARRAYS_OFFSET
+    for name, fmt, length in ARRAYS:
+        size = struct.calcsize(fmt) * length
+        arrays[name] = memory[offset : offset + size].cast(fmt)
+        offset += size
+    return arrays
+
+
+class WorldExporter:
+    """Writes the world of every tick into the shared memory block ``name``."""
+
+    def __init__(self, name: str):
+        try:
+            self.memory = shared_memory.SharedMemory(name, create=True, size=SIZE)
+        except FileExistsError:
+            # left behind by a game that was killed
+            stale = shared_memory.SharedMemory(name)
+            stale.unlink()
+            stale.close()
+            self.memory = shared_memory.SharedMemory(name, create=True, size=SIZE)
+        self.buffer: typing.Any = self.memory.buf
+        self.arrays = views(self.buffer)
+        self.sequence = 0
+
+    def write(
+        self,
+        tick: int,
+        score: int,
+        bees: typing.Sequence[ExportedBee],
+        obstacles: typing.Sequence[typing.Any],
+        power_ups: typing.Sequence[typing.Any],
+    ):
+        """Writes a tick between two increments of the sequence counter.
+
+        Obstacles need ``pos`` and ``velocity``, power ups ``pos``; whatever does not fit into the
+        arrays is left out.
+        """
+        buffer = self.buffer
+        arrays = self.arrays
+        bees = bees[:MAX_BEES]
+        obstacles = obstacles[:MAX_OBSTACLES]
+        power_ups = power_ups[:MAX_POWER_UPS]
+        self.sequence += 1
+        SEQUENCE.pack_into(buffer, 0, self.sequence)
+        HEADER.pack_into(
+            buffer,
+            SEQUENCE.size,
+            MAGIC,
+            VERSION,
+            tick,
+            score,
+            len(bees),
+            len(obstacles),
+            len(power_ups),
+        )
+        for index, bee in enumerate(bees):
+            arrays["bee_x"][index], arrays["bee_y"][index] = bee.pos
+            arrays["bee_velocity"][index] = bee.velocity[1]
+            arrays["bee_flags"][index] = (
+                bee.flying * FLYING + bee.alive * ALIVE + bee.invincible * INVINCIBLE
+            )
+        for index, obstacle in enumerate(obstacles):
+            arrays["obstacle_x"][index], arrays["obstacle_y"][index] = obstacle.pos
+            arrays["obstacle_velocity"][index] = obstacle.velocity
+        for index, power_up in enumerate(power_ups):
+            arrays["power_up_x"][index], arrays["power_up_y"][index] = power_up.pos
+        self.sequence += 1
+        SEQUENCE.pack_into(buffer, 0, self.sequence)
+
+    def close(self):
+        """Removes the block; attached readers keep their mapping until they close."""
+        for array in self.arrays.values():
+            array.release()
+        self.memory.close()
+        self.memory.unlink()
+
+
+class WorldReader:
+    """Reads consistent copies of the world from the shared memory block ``name``."""
+
+    def __init__(self, name: str):
+        self.memory = shared_memory.SharedMemory(name)
+        # on POSIX attached blocks are registered with the resource tracker too, which would
+        # remove the block of the running game when the reader exits
+        resource_tracker.unregister(f"/{self.memory.name}", "shared_memory")
+        self.buffer = bytearray(SIZE)
+        self.arrays = views(self.buffer)
+
+    def read(self, retries: int = 100) -> SharedWorld | None:
+        """Copies the newest tick, or returns None if nothing was written yet or the writer kept
+        writing during every try.
+
+        Raises ValueError if the block has another layout.
+        """
+        source: typing.Any = self.memory.buf
+        for _ in range(retries):
+            (before,) = SEQUENCE.unpack_from(source)
+            if not before:
+                return None
+            if before % 2:
+                continue
+            self.buffer[:] = source[:SIZE]
+            (after,) = SEQUENCE.unpack_from(source)
+            if before == after:
+                return self._world(before)
+        return None
+
+    def _world(self, sequence: int) -> SharedWorld:
+        """Returns the copied tick."""
+        magic, version, tick, score, bees, obstacles, power_ups = HEADER.unpack_from(
+            self.buffer, SEQUENCE.size
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a shared world of this version")
+        counts = {"bee": bees, "obstacle": obstacles, "power_up": power_ups}
+        return SharedWorld(
+            sequence,
+            tick,
+            score,
+            bees,
+            obstacles,
+            power_ups,
+            {
+                name: array[: counts[name.rsplit("_", 1)[0]]]
+                for name, array in self.arrays.items()
+            },
+        )
+
+    def close(self):
+        """Detaches from the block."""
+        self.memory.close()
+
+
+def main(argv: list[str] | None = None):
+    """Prints the live world of a running game."""
+    parser = argparse.ArgumentParser(
+        description="Print the world a running BeeLazy game shares."
+    )
+    parser.add_argument("name", help="the BEELAZY_SHARED_WORLD name of the game")
+    parser.add_argument(
+        "--frames", type=int, default=60, help="how many worlds to print"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=1 / 60, help="seconds between the reads"
+    )
+    args = parser.parse_args(argv)
+
+    reader = WorldReader(args.name)
+    for _ in range(args.frames):
+        world = reader.read()
+        if world:
+            print(
+                f"tick {world.tick} score {world.score} "
+                f"bee y {', '.join(f'{y:.0f}' for y in world.arrays['bee_y'])} "
+                f"obstacles {world.obstacles} power ups {world.power_ups}"
+            )
+        time.sleep(args.interval)
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
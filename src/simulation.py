@@ -0,0 +1,244 @@
+"""Implements running the simulation of the game on a worker thread.
+
+The worker steps the headless ``BeeLazyEnv`` at a fixed rate and publishes every tick as an
+immutable ``Frame`` through a triple buffer. The main thread only reads the newest frame to place
+the sprites and sends the touches through a queue, so a slow frame on either side does not stall
+the other one.
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+import typing
+
+from src.environment import MAX_OBSTACLES, BeeLazyEnv
+from src.rules import WORLD_HEIGHT, WORLD_WIDTH
+from src.timer_wheel import TICK
+
+MAX_CATCH_UP = 5
+"""The most ticks the worker runs back to back to catch up after falling behind."""
+
+
+class Frame(typing.NamedTuple):
+    """The world after one tick of the simulation, as shown by the main thread.
+
+    ``obstacles`` holds the slot and the position of every obstacle, ``power_up`` the position of
+    the power up if there is one and ``crash`` the cause of a game over.
+    """
+
+    tick: int
+    score: int
+    bee_y: float
+    invincible: bool
+    obstacles: tuple[tuple[int, float, float], ...]
+    power_up: tuple[float, float] | None
+    crash: str | None
+
+
+class TripleBuffer:
+    """Hands the newest value of one writer thread to one reader thread without waiting.
+
+    The writer fills the back slot and swaps it with the middle one, the reader swaps the middle
+    slot with its front slot when it holds a newer value. Neither side ever waits for the other
+    to finish with a slot; the lock only guards the swaps.
+    """
+
+    def __init__(self, initial: typing.Any = None):
+        self._slots = [initial, initial, initial]
+        self._front, self._middle, self._back = 0, 1, 2
+        self._fresh = False
+        self._lock = threading.Lock()
+
+    def publish(self, value: typing.Any):
+        """Publishes a value; an older value that was not read yet is dropped."""
+        self._slots[self._back] = value
+        with self._lock:
+            self._back, self._middle = self._middle, self._back
+            self._fresh = True
+
+    def latest(self) -> typing.Any:
+        """Returns the newest published value."""
+        with self._lock:
+            if self._fresh:
+                self._front, self._middle = self._middle, self._front
+                self._fresh = False
+        return self._slots[self._front]
+
+
+class Simulation:
+    """Steps one game on a worker thread at ``rate`` ticks per second.
+
+    The simulation only runs between ``resume`` and ``pause`` and stops after a game over until
+    ``reset`` is called. ``max_obstacles`` follows the quality tier of the game.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1 / TICK,
+        seed: int | None = None,
+        max_obstacles: int = MAX_OBSTACLES,
+    ):
+        self.interval = 1 / rate
+        self.env = BeeLazyEnv(num_envs=1, seed=seed, max_obstacles=max_obstacles)
+        self.env.reset()
+        self.last_frame = self._frame()
+        self.frames = TripleBuffer(self.last_frame)
+        self.flying = False
+        self._inputs: queue.SimpleQueue = queue.SimpleQueue()
+        self._running = threading.Event()
+        self._stopping = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+
+    def start(self, size: tuple[int, int]) -> "Simulation":
+        """Starts the worker for a screen of the given size; the simulation starts paused."""
+        self.env.width, self.env.height = size
+        self.reset()
+        self._worker.start()
+        return self
+
+    def send(self, flying: bool):
+        """Queues a touch for the next tick."""
+        self._inputs.put(("fly", flying))
+
+    def reset(self):
+        """Starts a new game at the next tick."""
+        self._inputs.put(("reset", None))
+
+    def resume(self):
+        """Runs the simulation."""
+        self._running.set()
+
+    def pause(self):
+        """Stops the simulation after the current tick."""
+        self._running.clear()
+
+    def stop(self):
+        """Stops the worker."""
+        self._stopping = True
+        self._running.set()
+        if self._worker.is_alive():
+            self._worker.join()
+
+    def step(self) -> Frame:
+        """Applies the queued inputs, runs one tick and publishes its frame."""
+        crash = self.last_frame.crash
+        while not self._inputs.empty():
+            kind, value = self._inputs.get_nowait()
+            if kind == "fly":
+                self.flying = value
+            else:
+                self.env.reset()
+                self.flying, crash = False, None
+        if crash:
+            return self.last_frame
+
+        _, _, dones, infos = self.env.step([self.flying])
+        if dones[0]:
+            crash = "fell" if infos["fell"][0] else "obstacle"
+            # the environment already started over, only the score is left of the run
+            self.last_frame = self.last_frame._replace(
+                score=int(infos["score"][0]), crash=crash
+            )
+        else:
+            self.last_frame = self._frame()
+        self.frames.publish(self.last_frame)
+        return self.last_frame
+
+    def _frame(self) -> Frame:
+        """Copies the state of the environment into an immutable frame."""
+        env = self.env
+        return Frame(
+            int(env.ticks[0]),
+            int(env.score[0]),
+            float(env.bee_y[0]),
+            bool(env.invincible[0]),
+            tuple(
+                (
+                    int(slot),
+                    float(env.obstacles[0, slot, 0]),
+                    float(env.obstacles[0, slot, 1]),
+                )
+                for slot in env.obstacle_active[0].nonzero()[0]
+            ),
+            tuple(env.power_up[0].tolist()) if env.power_up_active[0] else None,
+            None,
+        )
+
+    def _run(self):
+        """Steps the simulation at a fixed rate while it is running."""
+        deadline = time.perf_counter()
+        while True:
+            if not self._running.is_set():
+                self._running.wait()
+                deadline = time.perf_counter()
+            if self._stopping:
+                return
+            now = time.perf_counter()
+            if now < deadline:
+                time.sleep(deadline - now)
+                continue
+            # after a stall only a few ticks are caught up, the rest is skipped
+            deadline = max(deadline, now - MAX_CATCH_UP * self.interval)
+            self.step()
+            deadline += self.interval
+
+
+def flapping(tick: int) -> bool:
+    """Flies for 8 of every 20 ticks, which keeps a bee in the air."""
+    return tick % 20 < 8
+
+
+def benchmark(game: typing.Any, frames: int = 600) -> dict[str, tuple[float, float]]:
+    """Measures the main thread time per frame of a playing ``Game`` without and with a worker.
+
+    The bee flaps on its own and a crash starts the run over, so every frame does the full work.
+    Returns the mean and the worst frame time in milliseconds of both modes.
+    """
+    game.bee.input_source = flapping
+    game.crash = lambda bee, cause: game.simulation and game.simulation.reset()
+    results = {}
+    for mode in ("main thread", "worker thread"):
+        if mode == "worker thread":
+            game.simulation = Simulation(seed=0).start((WORLD_WIDTH, WORLD_HEIGHT))
+            game.simulation.resume()
+        times = []
+        for frame in range(frames):
+            start = time.perf_counter()
+            if game.simulation:
+                game.simulation.send(flapping(frame))
+                game.present(TICK)
+            else:
+                game.update(TICK)
+            times.append((time.perf_counter() - start) * 1000)
+            time.sleep(TICK / 2)
+        results[mode] = (sum(times) / len(times), max(times))
+    game.simulation.stop()
+    return results
+
+
+def main(argv: list[str] | None = None):
+    """Prints the main thread frame times with and without the worker thread."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the main thread with and without the simulation thread."
+    )
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args(argv)
+
+    os.environ["KIVY_NO_ARGS"] = "1"
+    # pylint: disable=import-outside-toplevel
+    from kivy.uix.widget import Widget
+
+    from src.main_screen import Game
+
+    game = Game()
+    Widget().add_widget(game)
+    game.remove_start_screen()
+    game.init_score_label()
+    for mode, (mean, worst) in benchmark(game, args.frames).items():
+        print(f"{mode}: {mean:.2f} ms mean, {worst:.2f} ms worst")
+
+
+if __name__ == "__main__":
+    main()
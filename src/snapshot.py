@@ -0,0 +1,190 @@
+"""Implements a compact binary snapshot of a running game, so a killed app can resume its run.
+
+The world is packed with ``struct`` into a buffer that is allocated once with room for the
+largest world, and written to disk with a single write. Positions and velocities are stored as
+32 bit floats, the state of the gameplay random stream is stored in full.
+"""
+
+import math
+import os
+import struct
+import typing
+
+MAGIC = b"BEEZ"
+"""The first bytes of a snapshot file."""
+
+VERSION = 3
+"""The version of the snapshot layout; older snapshots are ignored."""
+
+HEADER = struct.Struct("<4sHIIIBBB")
+"""Magic, version, tick, score, next power up tick and the bee, obstacle and power up counts."""
+
+BEE = struct.Struct("<4f3?fI")
+"""Position, velocity, flying, alive, invincible, remaining power up seconds and score."""
+
+OBSTACLE = struct.Struct("<3fBHB2f")
+"""Position, velocity, sprite, the bit mask of the bees that passed the obstacle, behavior,
+base height and phase."""
+
+POWER_UP = struct.Struct("<2f")
+"""Position of a power up."""
+
+RANDOM = struct.Struct("<625Id")
+"""The Mersenne Twister state of the gameplay stream and its cached gauss value (NaN for None)."""
+
+MAX_BEES = 16
+"""The largest number of bees that fits into a snapshot."""
+
+MAX_OBSTACLES = 16
+"""The largest number of obstacles that fits into a snapshot."""
+
+MAX_POWER_UPS = 4
+"""The largest number of power ups that fits into a snapshot."""
+
+SIZE = (
+    HEADER.size
+    + MAX_BEES * BEE.size
+    + MAX_OBSTACLES * OBSTACLE.size
+    + MAX_POWER_UPS * POWER_UP.size
+    + RANDOM.size
+)
+"""The size of the largest snapshot in bytes."""
+
+
+class BeeState(typing.NamedTuple):
+    """The state of a bee."""
+
+    x: float
+    y: float
+    velocity_x: float
+    velocity_y: float
+    flying: bool
+    alive: bool
+    invincible: bool
+    power_up_left: float
+    score: int
+
+
+class ObstacleState(typing.NamedTuple):
+    """The state of an obstacle; bit ``i`` of ``passed_by`` is set if bee ``i`` passed it.
+
+    ``behavior`` is the index of the behavior in ``BEHAVIORS``; ``phase`` is the phase of its
+    wave relative to one launched at the time of the snapshot, as the game clock restarts on
+    restore.
+    """
+
+    x: float
+    y: float
+    velocity: float
+    sprite: int
+    passed_by: int
+    behavior: int
+    base_y: float
+    phase: float
+
+
+class WorldState(typing.NamedTuple):
+    """The state of a running game."""
+
+    tick: int
+    score: int
+    bees: list[BeeState]
+    obstacles: list[ObstacleState]
+    power_ups: list[tuple[float, float]]
+    random_state: tuple
+    next_power_up: int
+
+
+def pack_into(buffer: bytearray, world: WorldState) -> int:
+    """Packs a world into the start of the buffer and returns the number of bytes used."""
+    if (
+        len(world.bees) > MAX_BEES
+        or len(world.obstacles) > MAX_OBSTACLES
+        or len(world.power_ups) > MAX_POWER_UPS
+    ):
+        raise ValueError("The world is too large for a snapshot")
+
+    HEADER.pack_into(
+        buffer,
+        0,
+        MAGIC,
+        VERSION,
+        world.tick,
+        world.score,
+        world.next_power_up,
+        len(world.bees),
+        len(world.obstacles),
+        len(world.power_ups),
+    )
+    offset = HEADER.size
+    for layout, items in (
+        (BEE, world.bees),
+        (OBSTACLE, world.obstacles),
+        (POWER_UP, world.power_ups),
+    ):
+        for item in items:
+            layout.pack_into(buffer, offset, *item)
+            offset += layout.size
+    _, internal, gauss = world.random_state
+    RANDOM.pack_into(buffer, offset, *internal, math.nan if gauss is None else gauss)
+    return offset + RANDOM.size
+
+
+def unpack(data: bytes) -> WorldState:
+    """Unpacks a snapshot, raising ValueError if it is damaged or of another version."""
+    try:
+        magic, version, tick, score, next_power_up, *counts = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a snapshot of this version")
+        offset = HEADER.size
+        items: list = []
+        for layout, count in zip((BEE, OBSTACLE, POWER_UP), counts):
+            items.append(
+                [
+                    layout.unpack_from(data, offset + index * layout.size)
+                    for index in range(count)
+                ]
+            )
+            offset += count * layout.size
+        *internal, gauss = RANDOM.unpack_from(data, offset)
+    except struct.error as error:
+        raise ValueError("Truncated snapshot") from error
+    return WorldState(
+        tick,
+        score,
+        [BeeState(*bee) for bee in items[0]],
+        [ObstacleState(*obstacle) for obstacle in items[1]],
+        items[2],
+        (3, tuple(internal), None if math.isnan(gauss) else gauss),
+        next_power_up,
+    )
+
+
+class SnapshotFile:
+    """Saves and loads the snapshot of a run through a preallocated buffer."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.buffer = bytearray(SIZE)
+        self.view = memoryview(self.buffer)
+
+    def save(self, world: WorldState) -> int:
+        """Writes the snapshot of a world and returns its size in bytes."""
+        size = pack_into(self.buffer, world)
+        with open(self.path + ".tmp", "wb") as file:
+            file.write(self.view[:size])
+        os.replace(self.path + ".tmp", self.path)
+        return size
+
+    def load(self) -> WorldState | None:
+        """Returns the saved world, or None if there is no usable snapshot."""
+        try:
+            with open(self.path, "rb") as file:
+                return unpack(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def clear(self):
+        """Deletes the snapshot once its run is over."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
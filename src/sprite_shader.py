@@ -0,0 +1,198 @@
+"""Implements animating the sprites on the GPU instead of swapping their textures on the CPU.
+
+Every sprite is a quad in one mesh per sprite widget, drawn with a shader that picks the frame of
+the sprite from a single ``time`` uniform. The origins of all animation frames in the sprite atlas
+are uploaded once as a uniform table; each quad carries the first frame and the number of frames
+of its sheet, its frames per second and its phase as vertex attributes.
+"""
+
+import math
+import typing
+
+from kivy.graphics import Color, Mesh, RenderContext
+from kivy.uix.widget import Widget
+
+from src import assets
+
+VERTEX_SHADER = """
+$HEADER$
+uniform float time;
+uniform vec2 frame_origins[MAX_FRAMES];
+/* first frame, frame count, frames per second, phase in frames */
+attribute vec4 vAnimation;
+/* size of one frame in texture coordinates */
+attribute vec2 vFrameSize;
+
+void main(void) {
+    float frame = vAnimation.x + mod(floor(time * vAnimation.z + vAnimation.w), vAnimation.y);
+    frag_color = color * vec4(1.0, 1.0, 1.0, opacity);
+    tex_coord0 = frame_origins[int(frame)] + vTexCoords0 * vFrameSize;
+    gl_Position = projection_mat * modelview_mat * vec4(vPosition.xy, 0.0, 1.0);
+}
+"""
+"""Chooses the frame of a quad; ``vTexCoords0`` is the corner of the quad in the frame."""
+
+FRAGMENT_SHADER = """
+$HEADER$
+void main(void) {
+    gl_FragColor = frag_color * texture2D(texture0, tex_coord0);
+}
+"""
+"""Draws the chosen frame."""
+
+MAX_FRAMES = 32
+"""The size of the frame table; the frames of all sprites have to fit into it."""
+
+VERTEX_FORMAT = [
+    (b"vPosition", 2, "float"),
+    (b"vTexCoords0", 2, "float"),
+    (b"vAnimation", 4, "float"),
+    (b"vFrameSize", 2, "float"),
+]
+"""The vertex attributes of a sprite quad."""
+
+CORNERS = ((0, 0), (1, 0), (1, 1), (0, 1))
+"""The corners of a quad in counter-clockwise order."""
+
+
+class Sheet(typing.NamedTuple):
+    """The place of the frames of one sprite in the frame table."""
+
+    first: int
+    frames: int
+    size: tuple[int, int]
+    uv_size: tuple[float, float]
+
+
+class Sprite(typing.NamedTuple):
+    """A widget drawn by the batch and the animation of its quad."""
+
+    sheet: Sheet
+    mesh: Mesh
+    fps: float
+    phase: float
+
+
+class SpriteBatch:
+    """Draws the animated sprites of a game with the sprite shader.
+
+    ``canvas`` has to be added to the canvas of the game once. An attached sprite widget does not
+    draw itself anymore; its quad follows the position of the widget.
+    """
+
+    def __init__(self, tier: str, names: typing.Iterable[str]):
+        self.sheets: dict[str, Sheet] = {}
+        origins: list[list[float]] = []
+        texture = None
+        for name in names:
+            frames = assets.frames(name, tier)
+            # a region binds the texture of its whole atlas page
+            if texture and texture.id != frames[0].id:
+                raise ValueError("The sprites have to be on one atlas page")
+            texture = frames[0]
+            coords = frames[0].tex_coords
+            self.sheets[name] = Sheet(
+                len(origins),
+                len(frames),
+                tuple(frames[0].size),
+                (coords[2] - coords[0], coords[5] - coords[1]),
+            )
+            origins.extend(
+                [frame.tex_coords[0], frame.tex_coords[1]] for frame in frames
+            )
+        if len(origins) > MAX_FRAMES:
+            raise ValueError(f"More than {MAX_FRAMES} animation frames")
+
+        self.texture = texture
+        self.canvas = RenderContext(
+            use_parent_projection=True,
+            use_parent_modelview=True,
+            use_parent_frag_modelview=True,
+        )
+        self.canvas.shader.vs = VERTEX_SHADER.replace("MAX_FRAMES", str(MAX_FRAMES))
+        self.canvas.shader.fs = FRAGMENT_SHADER
+        if not self.canvas.shader.success:
+            raise ValueError("The sprite shader does not compile")
+        self.canvas["frame_origins"] = origins
+        self.canvas["time"] = 0.0
+        self.canvas.add(Color(1, 1, 1, 1))
+        self.sprites: dict[Widget, Sprite] = {}
+
+    def set_time(self, time: float):
+        """Sets the time in seconds that all sprites are animated by."""
+        self.canvas["time"] = float(time)
+
+    def attach(
+        self, widget: Widget, name: str, fps: float, time: float = 0.0, frame: int = 0
+    ):
+        """Draws a widget as an animated sprite until it is detached.
+
+        The sprite shows ``frame`` of its sheet at ``time`` and then runs at ``fps``.
+        """
+        if widget in self.sprites:
+            return
+        # the widget does not draw its own texture anymore
+        widget.canvas.clear()
+        mesh = Mesh(
+            fmt=VERTEX_FORMAT,
+            indices=[0, 1, 2, 2, 3, 0],
+            mode="triangles",
+            texture=self.texture,
+        )
+        phase = self.phase(frame, fps, time)
+        self.sprites[widget] = Sprite(self.sheets[name], mesh, fps, phase)
+        self.place(widget)
+        self.canvas.add(mesh)
+        widget.bind(pos=self.place, size=self.place)
+
+    def detach(self, widget: Widget):
+        """Stops drawing a widget, e.g. when it is removed from the game."""
+        sprite = self.sprites.pop(widget, None)
+        if sprite:
+            widget.unbind(pos=self.place, size=self.place)
+            self.canvas.remove(sprite.mesh)
+
+    def place(self, widget: Widget, *args):
+        """Moves the quad of a widget to its position.
+
+        Like an ``Image`` with ``fit_mode="contain"``, a frame is centred in the widget and
+        scaled to fit into it, so a sprite has the same size in every resolution tier.
+        """
+        del args
+        sheet, mesh, fps, phase = self.sprites[widget]
+        scale = min(widget.width / sheet.size[0], widget.height / sheet.size[1])
+        width, height = sheet.size[0] * scale, sheet.size[1] * scale
+        left = widget.center_x - width / 2
+        bottom = widget.center_y - height / 2
+        vertices: list[float] = []
+        for corner_x, corner_y in CORNERS:
+            vertices += [left + corner_x * width, bottom + corner_y * height]
+            vertices += [corner_x, corner_y, sheet.first, sheet.frames, fps, phase]
+            vertices += sheet.uv_size
+        mesh.vertices = vertices
+
+    def animate(self, widget: Widget, fps: float, time: float = 0.0):
+        """Changes the frames per second of a sprite without jumping to another frame.
+
+        With ``fps`` 0 the sprite stops at its current frame.
+        """
+        sprite = self.sprites[widget]
+        frame = math.floor(time * sprite.fps + sprite.phase)
+        self.sprites[widget] = sprite._replace(
+            fps=fps, phase=self.phase(frame, fps, time)
+        )
+        self.place(widget)
+
+    @staticmethod
+    def phase(frame: int, fps: float, time: float) -> float:
+        """Returns the phase that shows ``frame`` at ``time``.
+
+        The phase points into the middle of the frame, so rounding errors do not show the frame
+        before it.
+        """
+        return frame + 0.5 - time * fps
+
+    def frame(self, widget: Widget, time: float) -> int:
+        """Returns the frame of the sheet the shader shows for a widget at the given time."""
+        sprite = self.sprites[widget]
+        return math.floor(time * sprite.fps + sprite.phase) % sprite.sheet.frames
@@ -1,10 +1,11 @@
 """Implements classes of the start screen of the game."""
 
 from kivy.clock import Clock
-from kivy.core.window import Window
 from kivy.uix.button import Button
 from kivy.uix.widget import Widget
 
+from src.rules import WORLD_HEIGHT, WORLD_WIDTH
+
 
 class StartScreen(Widget):
     """The start screen of the game.
@@ -25,7 +26,7 @@ class StartScreen(Widget):
             text="Start",
             size_hint=(None, None),
             size=(250, 100),
-            pos=(Window.width / 2 - 100, Window.height / 3 - 25),
+            pos=(WORLD_WIDTH / 2 - 100, WORLD_HEIGHT / 3 - 25),
             outline_color=(0, 0, 0, 1),
             outline_width=2,
         )
@@ -35,7 +36,7 @@ class StartScreen(Widget):
             text="Highscores",
             size_hint=(None, None),
             size=(250, 100),
-            pos=(Window.width / 2 - 100, Window.height / 3 - 150),
+            pos=(WORLD_WIDTH / 2 - 100, WORLD_HEIGHT / 3 - 150),
             outline_color=(0, 0, 0, 1),
             outline_width=2,
         )
@@ -45,7 +46,7 @@ class StartScreen(Widget):
             text="Back",
             size_hint=(None, None),
             size=(250, 100),
-            pos=(Window.width / 2 - 100, Window.height / 3 - 150),
+            pos=(WORLD_WIDTH / 2 - 100, WORLD_HEIGHT / 3 - 150),
             outline_color=(0, 0, 0, 1),
             outline_width=2,
         )
@@ -61,10 +62,10 @@ class StartScreen(Widget):
 
         Always takes the largest text from all buttons."""
         del args
+        max_width = max((child.texture_size[0] for child in self.children), default=0)
+        if max_width > self.text_width:
+            self.text_width = max_width
         for child in self.children:
-            max_width = max(c.texture_size[0] for c in self.children)
-            if max_width > self.text_width:
-                self.text_width = max_width
             child.size_hint_x = None
             child.width = self.text_width + 60
 
@@ -0,0 +1,292 @@
+"""Implements the session telemetry store and its analytics command line.
+
+Events are buffered per session in memory and handed to a background thread in batches, which
+writes each batch in one transaction to a local SQLite database. The queue to the writer is
+bounded: when it is full the batch is dropped instead of blocking the game loop.
+
+Run ``python -m src.telemetry <database>`` to print a report of the collected sessions.
+"""
+
+import argparse
+import collections
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import typing
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started REAL NOT NULL,
+    ended REAL,
+    score INTEGER,
+    ticks INTEGER,
+    cause TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    session_id TEXT NOT NULL,
+    time REAL NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS frame_times (
+    session_id TEXT NOT NULL,
+    bucket_ms INTEGER NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS input_latency (
+    session_id TEXT NOT NULL,
+    device TEXT NOT NULL,
+    bucket_ms INTEGER NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started);
+CREATE INDEX IF NOT EXISTS sessions_cause ON sessions (cause);
+CREATE INDEX IF NOT EXISTS events_kind ON events (kind, session_id);
+CREATE INDEX IF NOT EXISTS frame_times_bucket ON frame_times (bucket_ms);
+CREATE INDEX IF NOT EXISTS input_latency_device ON input_latency (device, bucket_ms);
+"""
+"""The tables of the telemetry database."""
+
+MAX_FRAME_BUCKET_MS = 250
+"""Frame times above this many milliseconds are counted in the last bucket."""
+
+CLOSE_TIMEOUT = 2.0
+"""Seconds ``close`` waits for the writer thread before it gives up on the queued batches."""
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetrySink:
+    """Collects the events of game sessions and writes them to SQLite on a background thread."""
+
+    def __init__(self, path: str, batch_size: int = 256, max_batches: int = 64):
+        self.path = path
+        self.batch_size = batch_size
+        self.session_id: str | None = None
+        self.dropped = 0
+        self._events: list[tuple] = []
+        self._frame_times: typing.Counter[int] = collections.Counter()
+        self._latencies: typing.Counter[tuple[str, int]] = collections.Counter()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_batches)
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def start_session(self):
+        """Starts a new session and ends a still running one."""
+        if self.session_id:
+            self.end_session(None, None, "abandoned")
+        self.session_id = uuid.uuid4().hex
+        self._submit(
+            "INSERT INTO sessions (id, started) VALUES (?, ?)",
+            [(self.session_id, time.time())],
+        )
+
+    def record(self, kind: str, **data):
+        """Buffers an event of the running session."""
+        if not self.session_id:
+            return
+        self._events.append(
+            (self.session_id, time.time(), kind, json.dumps(data) if data else None)
+        )
+        if len(self._events) >= self.batch_size:
+            self.flush()
+
+    def record_frame(self, frame_time: float):
+        """Counts a frame time of the running session in its millisecond bucket."""
+        self._frame_times[min(int(frame_time * 1000), MAX_FRAME_BUCKET_MS)] += 1
+
+    def record_latency(self, device: str, latency: float):
+        """Counts a touch to frame latency of an input device in its millisecond bucket."""
+        self._latencies[device, min(int(latency * 1000), MAX_FRAME_BUCKET_MS)] += 1
+
+    def end_session(self, score: int | None, ticks: int | None, cause: str | None):
+        """Ends the running session and flushes all of its buffered data."""
+        if not self.session_id:
+            return
+        self.flush()
+        self._submit(
+            "INSERT INTO frame_times (session_id, bucket_ms, count) VALUES (?, ?, ?)",
+            [(self.session_id, *item) for item in sorted(self._frame_times.items())],
+        )
+        self._submit(
+            "INSERT INTO input_latency (session_id, device, bucket_ms, count) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (self.session_id, device, bucket, count)
+                for (device, bucket), count in sorted(self._latencies.items())
+            ],
+        )
+        self._submit(
+            "UPDATE sessions SET ended = ?, score = ?, ticks = ?, cause = ? WHERE id = ?",
+            [(time.time(), score, ticks, cause, self.session_id)],
+        )
+        self._frame_times.clear()
+        self._latencies.clear()
+        self.session_id = None
+
+    def flush(self):
+        """Hands the buffered events to the writer thread."""
+        if self._events:
+            self._submit(
+                "INSERT INTO events (session_id, time, kind, data) VALUES (?, ?, ?, ?)",
+                self._events,
+            )
+            self._events = []
+
+    def close(self):
+        """Writes everything that is still queued and stops the writer thread.
+
+        Waits at most ``CLOSE_TIMEOUT`` seconds each to queue the stop and for the writer, so a
+        stuck writer never holds up the shutdown of the app.
+        """
+        self.flush()
+        try:
+            self._queue.put(None, timeout=CLOSE_TIMEOUT)
+        except queue.Full:
+            logger.warning(
+                "Telemetry: the writer is stuck, the queued batches are lost"
+            )
+            return
+        self._writer.join(timeout=CLOSE_TIMEOUT)
+
+    def _submit(self, statement: str, rows: list):
+        """Queues a batch of rows without ever blocking the caller."""
+        try:
+            self._queue.put_nowait((statement, rows))
+        except queue.Full:
+            self.dropped += len(rows)
+
+    def _write(self):
+        """Writes the queued batches, each in its own transaction.
+
+        A batch that fails to be written is logged and dropped; the thread keeps draining the
+        queue, also without a database, so ``close`` can always stop it.
+        """
+        connection = None
+        try:
+            connection = connect(self.path)
+        except sqlite3.Error as error:
+            logger.error("Telemetry: cannot open %s: %s", self.path, error)
+        while (batch := self._queue.get()) is not None:
+            try:
+                if not connection:
+                    raise sqlite3.OperationalError("no database")
+                with connection:
+                    connection.executemany(*batch)
+            except sqlite3.Error as error:
+                self.dropped += len(batch[1])
+                logger.error("Telemetry: dropped a batch: %s", error)
+        if connection:
+            connection.close()
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Opens the telemetry database in WAL mode and creates its tables."""
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def percentile(histogram: list[tuple[int, int]], fraction: float) -> int:
+    """Returns the bucket below which the given fraction of a sorted histogram lies."""
+    total = sum(count for _, count in histogram)
+    seen = 0
+    for bucket, count in histogram:
+        seen += count
+        if seen >= total * fraction:
+            return bucket
+    return 0
+
+
+def report(connection: sqlite3.Connection) -> str:  # pylint: disable=too-many-locals
+    """Aggregates the collected sessions into a readable report."""
+    sessions, length, score = connection.execute(
+        "SELECT COUNT(*), AVG(ended - started), AVG(score) FROM sessions "
+        "WHERE ended IS NOT NULL"
+    ).fetchone()
+    lines = [
+        f"Sessions: {sessions}",
+        f"Average session length: {length or 0:.1f}s",
+        f"Average score: {score or 0:.1f}",
+        "Death causes:",
+    ]
+    for cause, count in connection.execute(
+        "SELECT cause, COUNT(*) FROM sessions WHERE ended IS NOT NULL "
+        "GROUP BY cause ORDER BY COUNT(*) DESC"
+    ):
+        lines.append(f"  {cause}: {count}")
+
+    (power_ups,) = connection.execute(
+        "SELECT COUNT(*) FROM events WHERE kind = 'power_up'"
+    ).fetchone()
+    lines.append(f"Power ups per session: {power_ups / (sessions or 1):.2f}")
+
+    histogram = connection.execute(
+        "SELECT bucket_ms, SUM(count) FROM frame_times GROUP BY bucket_ms ORDER BY bucket_ms"
+    ).fetchall()
+    lines.append(
+        "Frame times: "
+        + ", ".join(
+            f"p{int(fraction * 100)} {percentile(histogram, fraction)}ms"
+            for fraction in (0.5, 0.95, 0.99)
+        )
+    )
+
+    latencies: dict[str, list[tuple[int, int]]] = collections.defaultdict(list)
+    for device, bucket, count in connection.execute(
+        "SELECT device, bucket_ms, SUM(count) FROM input_latency "
+        "GROUP BY device, bucket_ms ORDER BY device, bucket_ms"
+    ):
+        latencies[device].append((bucket, count))
+    lines.append("Touch to frame latency:")
+    for device, histogram in latencies.items():
+        lines.append(
+            f"  {device}: "
+            + ", ".join(
+                f"p{int(fraction * 100)} {percentile(histogram, fraction)}ms"
+                for fraction in (0.5, 0.95, 0.99)
+            )
+        )
+
+    pauses, longest = connection.execute(
+        "SELECT AVG(json_extract(data, '$.count')), MAX(json_extract(data, '$.longest_ms')) "
+        "FROM events WHERE kind = 'gc_pauses'"
+    ).fetchone()
+    lines.append(
+        f"GC pauses during play: {pauses or 0:.1f} per session, longest {longest or 0:.1f}ms"
+    )
+
+    lines.append("Frame pacing:")
+    for refresh_hz, paced, jitter, p99, missed in connection.execute(
+        "SELECT json_extract(data, '$.refresh_hz'), COUNT(*), "
+        "AVG(json_extract(data, '$.jitter_ms')), MAX(json_extract(data, '$.p99_ms')), "
+        "AVG(json_extract(data, '$.missed')) FROM events WHERE kind = 'frame_pacing' "
+        "GROUP BY 1 ORDER BY 1"
+    ):
+        lines.append(
+            f"  {refresh_hz} Hz: {paced} sessions, jitter {jitter:.2f}ms, "
+            f"p99 {p99:.1f}ms, {missed:.1f} missed frames per session"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None):
+    """Prints the report of a telemetry database."""
+    parser = argparse.ArgumentParser(description="Report on BeeLazy session telemetry.")
+    parser.add_argument("database", help="path of the telemetry database")
+    args = parser.parse_args(argv)
+
+    connection = connect(args.database)
+    print(report(connection))
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
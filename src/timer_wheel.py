@@ -0,0 +1,159 @@
+"""Implements a pausable hierarchical timer wheel running on game time."""
+
+import math
+import typing
+
+TICK = 1.0 / 60.0
+"""Duration of one game tick in seconds."""
+
+SLOTS = 64
+"""Number of slots in every level of the wheel."""
+
+LEVELS = 4
+"""Number of levels of the wheel."""
+
+
+class Timer:
+    """A scheduled callback of the timer wheel.
+
+    Timers are returned by ``TimerWheel.schedule`` and ``TimerWheel.schedule_interval`` and can
+    be cancelled in constant time.
+    """
+
+    __slots__ = ("bucket", "callback", "expires", "period", "repeat")
+
+    def __init__(
+        self, expires: int, callback: typing.Callable, period: int, repeat: bool
+    ):
+        self.expires = expires
+        self.callback = callback
+        self.period = period
+        self.repeat = repeat
+        self.bucket: set | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether the timer is still waiting to fire."""
+        return self.bucket is not None
+
+    def cancel(self):
+        """Cancels the timer if it did not fire yet."""
+        if self.bucket is not None:
+            self.bucket.discard(self)
+            self.bucket = None
+
+
+class TimerWheel:
+    """A hierarchical timer wheel that is advanced by the game loop.
+
+    The wheel counts game ticks instead of wall time: it only moves forward when ``advance`` is
+    called, stands still while paused and runs slower or faster with ``time_scale``. Scheduling
+    and cancelling are O(1), expired timers are collected by cascading the upper levels into the
+    lowest one.
+    """
+
+    def __init__(self, resolution: float = TICK):
+        self.resolution = resolution
+        self.tick = 0
+        self.time_scale = 1.0
+        self.paused = False
+        self._accumulator = 0.0
+        self._wheels: list[list[set]] = [
+            [set() for _ in range(SLOTS)] for _ in range(LEVELS)
+        ]
+        self._overflow: set = set()
+
+    @property
+    def now(self) -> float:
+        """The elapsed game time in seconds."""
+        return self.tick * self.resolution + self._accumulator
+
+    def remaining(self, timer: Timer | None) -> float:
+        """Returns the game time in seconds until an active timer fires, otherwise 0."""
+        if timer is None or not timer.active:
+            return 0.0
+        return (timer.expires - self.tick) * self.resolution - self._accumulator
+
+    def to_ticks(self, seconds: float) -> int:
+        """Converts a duration in seconds to whole ticks, but at least one tick."""
+        return max(1, math.ceil(seconds / self.resolution - 1e-9))
+
+    def schedule(self, timeout: float, callback: typing.Callable) -> Timer:
+        """Calls ``callback(dt)`` once after ``timeout`` seconds of game time."""
+        ticks = self.to_ticks(timeout)
+        timer = Timer(self.tick + ticks, callback, ticks, False)
+        self._place(timer)
+        return timer
+
+    def schedule_interval(self, interval: float, callback: typing.Callable) -> Timer:
+        """Calls ``callback(dt)`` every ``interval`` seconds of game time."""
+        ticks = self.to_ticks(interval)
+        timer = Timer(self.tick + ticks, callback, ticks, True)
+        self._place(timer)
+        return timer
+
+    def cancel_all(self):
+        """Cancels every pending timer, e.g. when restarting the game."""
+        for bucket in [*(b for wheel in self._wheels for b in wheel), self._overflow]:
+            while bucket:
+                bucket.pop().bucket = None
+
+    def pause(self):
+        """Stops the game time."""
+        self.paused = True
+
+    def resume(self):
+        """Continues the game time."""
+        self.paused = False
+
+    def advance(self, dt: float):
+        """Advances the game time by ``dt`` seconds of wall time and fires expired timers."""
+        if self.paused:
+            return
+        self._accumulator += dt * self.time_scale
+        ticks = int(self._accumulator / self.resolution + 1e-9)
+        self._accumulator = max(self._accumulator - ticks * self.resolution, 0.0)
+        for _ in range(ticks):
+            if self.paused:
+                break
+            self._advance_tick()
+
+    def _advance_tick(self):
+        """Moves the wheel forward by one tick."""
+        self.tick += 1
+        span = 1
+        for level in range(1, LEVELS + 1):
+            span *= SLOTS
+            if self.tick % span:
+                break
+            bucket = (
+                self._wheels[level][(self.tick // span) % SLOTS]
+                if level < LEVELS
+                else self._overflow
+            )
+            pending = list(bucket)
+            bucket.clear()
+            for timer in pending:
+                self._place(timer)
+
+        bucket = self._wheels[0][self.tick % SLOTS]
+        while bucket:
+            timer = bucket.pop()
+            timer.bucket = None
+            if timer.repeat:
+                timer.expires += timer.period
+                self._place(timer)
+            timer.callback(timer.period * self.resolution)
+
+    def _place(self, timer: Timer):
+        """Puts the timer into the slot matching its remaining ticks."""
+        delta = max(timer.expires - self.tick, 0)
+        span = 1
+        for level in range(LEVELS):
+            if delta < span * SLOTS:
+                timer.bucket = self._wheels[level][(timer.expires // span) % SLOTS]
+                break
+            span *= SLOTS
+        else:
+            timer.bucket = self._overflow
+        timer.bucket.add(timer)
@@ -0,0 +1,51 @@
+"""Implements the cached geometry of the window for code that runs on every tick or spawn.
+
+The game is laid out in world coordinates and scaled to the window by ``ScaledView``, so the
+clamping of the bees, the spawn positions and the HUD never depend on the window size. What does
+is cached here: the window size and the resolution tier of the assets. The viewport is only
+updated when the window is resized or rotated and then pushes itself to its subscribers, so hot
+paths read plain attributes instead of window properties.
+"""
+
+import typing
+
+from kivy.core.window import Window
+
+from src import assets
+
+
+class Viewport:
+    """The size of the window and the values derived from it."""
+
+    def __init__(self, size: tuple[float, float]):
+        self.subscribers: list[typing.Callable[[Viewport], None]] = []
+        self.width, self.height = size
+        self.tier = ""
+        self.update(size)
+
+    def update(self, size: tuple[float, float]):
+        """Derives the cached values from a window size and notifies the subscribers of a change."""
+        width, height = size
+        if (width, height) == (self.width, self.height) and self.tier:
+            return
+        self.width, self.height = width, height
+        self.tier = assets.tier_for(height)
+        for subscriber in list(self.subscribers):
+            subscriber(self)
+
+    def resize(self, window, *args):
+        """Follows ``on_resize`` and ``on_rotate`` of a window, whose size is rotated already."""
+        del args
+        self.update(window.size)
+
+    def subscribe(self, callback: typing.Callable[["Viewport"], None]):
+        """Calls ``callback`` with the viewport whenever it changes."""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: typing.Callable[["Viewport"], None]):
+        """Stops calling ``callback``."""
+        self.subscribers.remove(callback)
+
+
+current = Viewport(Window.size)
+"""The viewport of the window; ``BeeLazy.build`` keeps it up to date."""
@@ -0,0 +1,157 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from PIL import Image
+
+from src.asset_build import (
+    SpriteSheet,
+    build,
+    content_hash,
+    main,
+    pack,
+    page_width,
+    slice_sheet,
+)
+from src.asset_pack import AssetPack
+
+SHEETS = {"dot": SpriteSheet("dot.png", 2, 2), "empty": SpriteSheet("empty.png", 1, 1)}
+BACKGROUNDS = {"sky": "sky.jpg"}
+
+
+class TestSliceSheet(unittest.TestCase):
+    def test_frames_keep_their_cells(self):
+        image = Image.new("RGBA", (40, 40))
+        image.putpixel((5, 6), (255, 0, 0, 255))
+        image.putpixel((29, 33), (0, 255, 0, 255))
+
+        frames = slice_sheet(image, SpriteSheet("", 2, 2))
+
+        self.assertEqual(len(frames), 4)
+        self.assertEqual({frame.size for frame in frames}, {(20, 20)})
+        self.assertEqual(frames[0].getpixel((5, 6)), (255, 0, 0, 255))
+        self.assertEqual(frames[3].getpixel((9, 13)), (0, 255, 0, 255))
+
+    def test_offset(self):
+        image = Image.new("RGBA", (20, 10))
+        image.putpixel((12, 0), (255, 0, 0, 255))
+        frames = slice_sheet(image, SpriteSheet("", 2, 1, 3))
+        self.assertEqual(frames[0].getpixel((9, 0)), (255, 0, 0, 255))
+        self.assertEqual(frames[1].getpixel((9, 0)), (0, 0, 0, 0))
+
+    def test_empty_sheet(self):
+        frames = slice_sheet(Image.new("RGBA", (10, 10)), SpriteSheet("", 2, 1))
+        self.assertEqual(frames[0].size, (5, 10))
+
+
+class TestPack(unittest.TestCase):
+    def test_pack(self):
+        positions, height = pack([(10, 5), (10, 20), (10, 10)], 30)
+        self.assertEqual(positions, [(2, 24), (2, 2), (14, 2)])
+        self.assertEqual(height, 31)
+
+    def test_frame_too_wide(self):
+        with self.assertRaises(ValueError):
+            pack([(40, 5)], 30)
+
+    def test_page_width(self):
+        self.assertEqual(page_width([(10, 10)] * 4), 32)
+        self.assertEqual(page_width([(100, 1)]), 128)
+        self.assertEqual(page_width([(1000, 1000)] * 16), 2048)
+
+
+class TestBuild(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = self.directory.name
+        self.output = os.path.join(self.source, "build")
+        sheet = Image.new("RGBA", (40, 40))
+        sheet.putpixel((5, 5), (255, 0, 0, 255))
+        sheet.save(os.path.join(self.source, "dot.png"))
+        Image.new("RGBA", (4, 4)).save(os.path.join(self.source, "empty.png"))
+        Image.new("RGB", (300, 200)).save(os.path.join(self.source, "sky.jpg"))
+        with open(os.path.join(self.source, "beep.wav"), "wb") as file:
+            file.write(b"beep")
+        patcher = patch.multiple(
+            "src.asset_build",
+            SPRITE_SHEETS=SHEETS,
+            BACKGROUNDS=BACKGROUNDS,
+            BACKGROUND_HEIGHT=100,
+            SOUNDS=("beep.wav",),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build(self):
+        built = build(self.source, self.output)
+
+        self.assertEqual(len(built), 6)
+        with open(os.path.join(self.output, "manifest.json"), encoding="utf-8") as file:
+            manifest = json.load(file)
+        self.assertEqual(
+            manifest["sprites"]["dot"], ["dot_0", "dot_1", "dot_2", "dot_3"]
+        )
+        self.assertEqual(manifest["heights"], {"high": 100, "medium": 50, "low": 25})
+        with Image.open(os.path.join(self.output, "medium", "sky.jpg")) as image:
+            self.assertEqual(image.size, (75, 50))
+        with open(
+            os.path.join(self.output, "high", "sprites.atlas"), encoding="utf-8"
+        ) as file:
+            atlas = json.load(file)
+        self.assertEqual(list(atlas), ["sprites-0.png"])
+        self.assertEqual(atlas["sprites-0.png"]["dot_0"][2:], [20, 20])
+
+    def test_unchanged_inputs_are_skipped(self):
+        build(self.source, self.output)
+        self.assertEqual(build(self.source, self.output), [])
+
+        Image.new("RGB", (300, 100)).save(os.path.join(self.source, "sky.jpg"))
+        self.assertEqual(
+            build(self.source, self.output),
+            [
+                os.path.join(self.output, f"{tier}/sky.jpg")
+                for tier in ("high", "medium", "low")
+            ],
+        )
+
+        os.remove(os.path.join(self.output, "low", "sprites.atlas"))
+        self.assertEqual(
+            build(self.source, self.output),
+            [os.path.join(self.output, "low/sprites.atlas")],
+        )
+        self.assertEqual(len(build(self.source, self.output, force=True)), 6)
+
+    def test_content_hash(self):
+        path = os.path.join(self.source, "dot.png")
+        self.assertEqual(content_hash(1, path), content_hash(1, path))
+        self.assertNotEqual(content_hash(1, path), content_hash(2, path))
+
+    def test_main(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--source", self.source, "--output", self.output])
+        self.assertIn("Built 6 outputs", output.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.source, "assets.pack")))
+
+    def test_pack(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--source", self.source, "--output", self.output, "--pack"])
+        self.assertIn("Packed 11 assets", output.getvalue())
+
+        pack = AssetPack(os.path.join(self.source, "assets.pack"))
+        self.assertEqual(bytes(pack.get("beep.wav")), b"beep")
+        self.assertIn("low/sprites-0.png", pack)
+        self.assertEqual(pack.verify(), [])
+        pack.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from src.asset_pack import HEADER, AssetPack, main, write_pack
+
+
+class TestAssetPack(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "assets.pack")
+        files = {}
+        for name, data in (("a.txt", b"first"), ("tier/b.bin", bytes(range(256)))):
+            files[name] = os.path.join(self.directory.name, name.replace("/", "_"))
+            with open(files[name], "wb") as file:
+                file.write(data)
+        write_pack(self.path, files)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_read(self):
+        pack = AssetPack(self.path)
+        self.assertIn("tier/b.bin", pack)
+        self.assertNotIn("c", pack)
+        self.assertEqual(bytes(pack.get("a.txt")), b"first")
+        data = pack.get("tier/b.bin")
+        self.assertIsInstance(data, memoryview)
+        self.assertEqual(data[255], 255)
+        self.assertEqual(pack.verify(), [])
+        data.release()
+        pack.close()
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+    def test_verify_finds_broken_contents(self):
+        with open(self.path, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b"x")
+        pack = AssetPack(self.path)
+        self.assertEqual(pack.verify(), ["tier/b.bin"])
+        pack.close()
+
+    def test_invalid_packs(self):
+        with open(self.path, "rb") as file:
+            data = file.read()
+        for broken in (
+            b"",
+            b"\0",
+            b"NOTAPACK" + data[8:],
+            data[: HEADER.size + 10],
+            data[:-1],
+        ):
+            with open(self.path, "wb") as file:
+                file.write(broken)
+            with self.assertRaises(ValueError):
+                AssetPack(self.path)
+
+    def test_main(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main([self.path])
+        self.assertIn("a.txt", output.getvalue())
+        self.assertIn("2 assets, 0 broken", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
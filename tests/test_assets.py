@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from kivy.core.window import Window
+from kivy.graphics.texture import Texture, TextureRegion
+
+from src import assets
+from src.asset_build import pack_files
+from src.asset_pack import write_pack
+
+
+def clear_caches():
+    for cached in (assets.pack, assets.manifest, assets.atlas):
+        cached.cache_clear()
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        # the textures need the GL context of the window
+        self.assertIsNotNone(Window)
+
+    def test_tier_for(self):
+        self.assertEqual(assets.tier_for(400), "low")
+        self.assertEqual(assets.tier_for(600), "medium")
+        self.assertEqual(assets.tier_for(1080), "medium")
+        self.assertEqual(assets.tier_for(4000), "high")
+
+    def test_frames(self):
+        frames = assets.frames("bee", "low")
+        self.assertEqual(len(frames), 8)
+        self.assertIsInstance(frames[0], TextureRegion)
+        self.assertIs(assets.atlas("low"), assets.atlas("low"))
+
+    def test_image(self):
+        texture = assets.image("background", "medium")
+        self.assertIsInstance(texture, Texture)
+        self.assertEqual(texture.height, 1080)
+
+    def test_loose_files_without_pack(self):
+        with patch.object(assets, "PACK_PATH", os.path.join("missing", "assets.pack")):
+            clear_caches()
+            self.addCleanup(clear_caches)
+            self.assertIsNone(assets.pack())
+            self.assertEqual(
+                assets.sound("theme.mp3", "unused"),
+                os.path.join(assets.ASSET_DIR, "theme.mp3"),
+            )
+            self.assertIn(b"sprites", bytes(assets.read("manifest.json")))
+
+
+class TestAssetsFromPack(unittest.TestCase):
+    def setUp(self):
+        self.assertIsNotNone(Window)
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, "assets.pack")
+        write_pack(path, pack_files(assets.ASSET_DIR, assets.BUILD_DIR))
+        patcher = patch.object(assets, "PACK_PATH", path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_caches()
+
+    def tearDown(self):
+        assets.pack().close()
+        clear_caches()
+        self.directory.cleanup()
+
+    def test_assets_are_read_from_pack(self):
+        self.assertIsNotNone(assets.pack())
+        self.assertIsInstance(assets.read("manifest.json"), memoryview)
+        self.assertEqual(assets.tier_for(400), "low")
+        self.assertEqual(len(assets.frames("swallow", "low")), 8)
+        self.assertIsInstance(assets.image("background", "low"), Texture)
+
+    def test_sound_is_extracted_once(self):
+        cache = os.path.join(self.directory.name, "cache")
+        path = assets.sound("theme.mp3", cache)
+        self.assertTrue(path.startswith(cache))
+        self.assertEqual(
+            os.path.getsize(path),
+            os.path.getsize(os.path.join(assets.ASSET_DIR, "theme.mp3")),
+        )
+
+        with patch("builtins.open") as mock_open:
+            self.assertEqual(assets.sound("theme.mp3", cache), path)
+        mock_open.assert_not_called()
+        self.assertEqual(
+            assets.sound("missing.mp3", cache),
+            os.path.join(assets.ASSET_DIR, "missing.mp3"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 import unittest
+from unittest.mock import patch
 
 from kivy.graphics.texture import TextureRegion
 
-from src.bee import Bee
+from src import viewport
+from src.bee import Bee, ReplayInput, hits, sweep
 
 
 class TestBee(unittest.TestCase):
@@ -14,9 +16,16 @@ class TestBee(unittest.TestCase):
         self.bee.load_spritesheet()
 
         # Check if the frames list is populated correctly
-        self.assertEqual(len(self.bee.frames), 16)
+        self.assertEqual(len(self.bee.frames), 8)
         self.assertIsInstance(self.bee.frames[0], TextureRegion)
 
+    def test_sprite_size_in_every_tier(self):
+        sizes = set()
+        for tier in ("low", "medium", "high"):
+            with patch.object(viewport.current, "tier", tier):
+                sizes.add(round(Bee().norm_image_size[0]))
+        self.assertEqual(sizes, {260})
+
     def test_update_frame(self):
         # Set the initial frame index
         self.bee.frame_idx = 0
@@ -55,6 +64,28 @@ class TestBee(unittest.TestCase):
         # Check if the collision is detected correctly
         self.assertTrue(result)
 
+    def test_check_collision_invincible(self):
+        class MockObstacle:
+            pos = (100, 100)
+            size = (300, 300)
+
+        self.bee.pos = (150, 150)
+        self.bee.invincible = True
+        self.assertFalse(self.bee.check_collision(MockObstacle()))
+
+    def test_hovering(self):
+        self.assertFalse(self.bee.hovering())
+
+        self.bee.last_positions.extend([300, 100, 102, 101, 100, 104])
+        self.assertTrue(self.bee.hovering())
+
+        self.bee.last_positions.append(120)
+        self.assertFalse(self.bee.hovering())
+
+    def test_last_positions_per_bee(self):
+        self.bee.update()
+        self.assertEqual(len(Bee().last_positions), 0)
+
     def test_update(self):
         # Set the bee's initial position and velocity
         self.bee.pos = (-5000, 200)
@@ -127,5 +158,46 @@ class TestBee(unittest.TestCase):
         self.assertIsNotNone(self.bee.old_move_pos)
 
 
+class TestReplayInput(unittest.TestCase):
+    def test_call(self):
+        replay = ReplayInput([True, False, True])
+        self.assertFalse(replay(0))
+        self.assertTrue(replay(1))
+        self.assertFalse(replay(2))
+        self.assertTrue(replay(3))
+        self.assertFalse(replay(4))
+
+
+class TestSweep(unittest.TestCase):
+    hitbox = (200, 375, 300, 475)
+
+    def test_fast_obstacle_does_not_tunnel(self):
+        # the obstacle is right of the bee before the tick and left of it after the tick
+        obstacle = (400, 300, 260, 260)
+        self.assertFalse(hits(self.hitbox, obstacle))
+        self.assertFalse(hits(self.hitbox, (-400, 300, 260, 260)))
+
+        self.assertAlmostEqual(
+            sweep(self.hitbox, (0, 0), obstacle, (-800, 0)), 25 / 800
+        )
+
+    def test_overlapping_at_start(self):
+        self.assertEqual(sweep(self.hitbox, (0, 10), (300, 300, 260, 260), (-5, 0)), 0)
+
+    def test_miss(self):
+        # passes above the bee
+        self.assertIsNone(sweep(self.hitbox, (0, 0), (400, 500, 260, 260), (-800, 0)))
+        # moves away from the bee
+        self.assertIsNone(sweep(self.hitbox, (0, 0), (400, 300, 260, 260), (10, 0)))
+        # too slow to reach the bee within the tick
+        self.assertIsNone(sweep(self.hitbox, (0, 0), (400, 300, 260, 260), (-20, 0)))
+
+    def test_vertical_motion(self):
+        # the bee falls onto an obstacle below it
+        obstacle = (200, 0, 260, 260)
+        self.assertEqual(sweep(self.hitbox, (0, -200), obstacle, (0, 0)), 125 / 200)
+        self.assertIsNone(sweep(self.hitbox, (0, 200), obstacle, (0, 0)))
+
+
 if __name__ == "__main__":
     unittest.main()
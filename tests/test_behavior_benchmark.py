@@ -0,0 +1,48 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from src.behavior_benchmark import (
+    IMPLEMENTATIONS,
+    benchmark,
+    build_obstacles,
+    main,
+    step_each,
+)
+from src.behaviors import BEHAVIORS, step
+
+
+class TestBehaviorBenchmark(unittest.TestCase):
+    def test_build_obstacles(self):
+        obstacles = build_obstacles(8)
+        self.assertEqual(
+            [obstacle.behavior for obstacle in obstacles],
+            list(BEHAVIORS.values()) * 2,
+        )
+
+    def test_step_each(self):
+        stepped, each = build_obstacles(8), build_obstacles(8)
+        for time in (0.1, 0.2, 0.3):
+            step(stepped, time, 300)
+            step_each(each, time, 300)
+        for moved, expected in zip(each, stepped):
+            self.assertEqual(tuple(moved.pos), tuple(expected.pos))
+            self.assertEqual(moved.motion, expected.motion)
+        step_each(each, 0.4, None)
+        self.assertEqual(each[2].motion[1], 0)
+
+    def test_benchmark(self):
+        results = benchmark(4, 130, 2)
+        self.assertEqual([result.name for result in results], list(IMPLEMENTATIONS))
+        self.assertGreater(results[0].tick_us, 0)
+
+    def test_main(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--obstacles", "2", "--ticks", "1", "--rounds", "1"])
+        self.assertIn("steps:", output.getvalue())
+        self.assertIn("branches:", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import math
+import types
+import unittest
+from unittest.mock import patch
+
+from src import rng
+from src.behaviors import BEHAVIORS, Behavior, choose, phase, step
+
+
+def moving(behavior: Behavior, x: float = 100, y: float = 200, time: float = 0):
+    return types.SimpleNamespace(
+        pos=(x, y),
+        velocity=5,
+        behavior=behavior,
+        base_y=y,
+        phase=phase(behavior, time),
+        motion=(0, 0),
+    )
+
+
+class TestBehaviors(unittest.TestCase):
+    def test_choose(self):
+        self.assertEqual(choose(0, 5), BEHAVIORS["straight"])
+        with patch.object(
+            rng.gameplay, "choices", side_effect=lambda items, weights: items
+        ) as mock:
+            self.assertEqual(choose(20, 2), BEHAVIORS["straight"])
+            self.assertNotIn(BEHAVIORS["formation"], mock.call_args.args[0])
+            self.assertEqual(len(mock.call_args.args[0]), 3)
+            choose(20, 3)
+            self.assertEqual(mock.call_args.args[1], [1.0, 1.0, 0.5, 0.5])
+
+    def test_step_linear(self):
+        obstacle = moving(BEHAVIORS["straight"])
+        step([obstacle], 1, 0)
+        self.assertEqual(obstacle.pos, (95, 200))
+        self.assertEqual(obstacle.motion, (-5, 0))
+
+    def test_step_sine(self):
+        wave = BEHAVIORS["wave"]
+        obstacle = moving(wave, time=3)
+        step([obstacle], 3, None)
+        self.assertAlmostEqual(obstacle.pos[1], 200)
+        step([obstacle], 3 + wave.period / 4, None)
+        self.assertEqual(obstacle.pos[0], 90)
+        self.assertAlmostEqual(obstacle.pos[1], 200 + wave.amplitude)
+        self.assertAlmostEqual(obstacle.motion[1], wave.amplitude)
+
+    def test_step_dive(self):
+        dive = BEHAVIORS["dive"]
+        obstacle = moving(dive)
+        step([obstacle], 0, None)
+        self.assertEqual(obstacle.pos, (95, 200))
+        step([obstacle], 0, 0)
+        self.assertEqual(obstacle.pos, (90, 200 - dive.dive_speed))
+        step([obstacle], 0, 199)
+        self.assertEqual(obstacle.pos[1], 199)
+        self.assertEqual(obstacle.motion, (-5, 1))
+
+    def test_step_mixed(self):
+        obstacles = [moving(behavior) for behavior in BEHAVIORS.values()]
+        step(obstacles, 0.5, 0)
+        self.assertEqual([obstacle.pos[0] for obstacle in obstacles], [95] * 4)
+        self.assertEqual(obstacles[0].pos[1], 200)
+        self.assertAlmostEqual(
+            obstacles[1].pos[1],
+            200 + BEHAVIORS["wave"].amplitude * math.sin(math.pi / 2),
+        )
+        self.assertEqual(obstacles[2].pos[1], 198)
+
+
+if __name__ == "__main__":
+    unittest.main()
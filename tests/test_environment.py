@@ -0,0 +1,277 @@
+import itertools
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from src import behaviors
+from src.bee import sweep
+from src.behaviors import BEHAVIORS
+from src.environment import (
+    BEHAVIOR_LIST,
+    MAX_OBSTACLES,
+    BeeLazyEnv,
+    overlaps,
+    sweeps,
+)
+from src.rules import (
+    BEE_X,
+    FLY_VELOCITY,
+    GRAVITY,
+    HITBOX_OFFSET,
+    INVINCIBLE_DURATION,
+    SPRITE_SIZE,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+from src.timer_wheel import TICK
+
+
+class TestBeeLazyEnv(unittest.TestCase):
+    def setUp(self):
+        self.env = BeeLazyEnv(num_envs=4, seed=1)
+        self.observation = self.env.reset()
+
+    def test_reset(self):
+        self.assertEqual(self.observation.shape, (4, BeeLazyEnv.observation_size))
+        self.assertEqual(self.observation.dtype, np.float32)
+        np.testing.assert_array_equal(self.env.bee_y, WORLD_HEIGHT / 2)
+        np.testing.assert_array_equal(self.observation[:, 0], 0.5)
+        np.testing.assert_array_equal(self.observation[:, 5::3], 1)
+
+    def test_step_flies_and_falls(self):
+        observation, rewards, dones, infos = self.env.step([1, 0, 1, 0])
+
+        np.testing.assert_array_equal(
+            self.env.bee_y, [540 + FLY_VELOCITY - GRAVITY, 540 - GRAVITY] * 2
+        )
+        np.testing.assert_array_equal(rewards, 0)
+        np.testing.assert_array_equal(dones, False)
+        np.testing.assert_array_equal(infos["ticks"], 1)
+        self.assertTrue(self.env.obstacle_active.any(axis=1).all())
+        self.assertTrue((observation[:, 5] < 1).all())
+
+    def test_bee_stays_below_top(self):
+        for _ in range(100):
+            self.env.step(np.ones(4))
+        self.assertTrue((self.env.bee_y <= WORLD_HEIGHT - SPRITE_SIZE / 2).all())
+
+    def test_fall_ends_game_and_resets(self):
+        self.env.obstacle_active[:] = False
+        self.env.bee_y[:] = -SPRITE_SIZE + 0.1
+        self.env.obstacles[:, :, 0] = 1000
+
+        _, rewards, dones, infos = self.env.step(np.zeros(4))
+
+        np.testing.assert_array_equal(dones, True)
+        np.testing.assert_array_equal(rewards, -1)
+        np.testing.assert_array_equal(infos["ticks"], 1)
+        np.testing.assert_array_equal(self.env.bee_y, WORLD_HEIGHT / 2)
+        np.testing.assert_array_equal(self.env.ticks, 0)
+
+    def test_collision_and_invincibility(self):
+        self.env.step(np.zeros(4))
+        self.env.obstacles[:, 0] = (BEE_X, 540, 0)
+        self.env.invincible[1] = 10
+
+        _, rewards, dones, _ = self.env.step(np.zeros(4))
+
+        np.testing.assert_array_equal(dones, [True, False, True, True])
+        np.testing.assert_array_equal(rewards, [-1, 0, -1, -1])
+
+    def test_passed_obstacle_scores_once(self):
+        self.env.step(np.zeros(4))
+        self.env.obstacles[:, 0] = (BEE_X - SPRITE_SIZE, 900, 1)
+
+        _, rewards, _, infos = self.env.step(np.zeros(4))
+        np.testing.assert_array_equal(rewards, 1)
+        np.testing.assert_array_equal(infos["score"], 1)
+
+        _, rewards, _, _ = self.env.step(np.zeros(4))
+        np.testing.assert_array_equal(rewards, 0)
+
+    def test_obstacles_grow_with_score(self):
+        self.env.score[:] = 1000
+        for _ in range(MAX_OBSTACLES + 1):
+            self.env._spawn_obstacles(np.ones(4, dtype=bool))
+        np.testing.assert_array_equal(
+            self.env.obstacle_active.sum(axis=1), MAX_OBSTACLES
+        )
+        self.assertTrue((self.env.obstacles[:, :, 2] >= 110).all())
+
+    def test_max_obstacles(self):
+        env = BeeLazyEnv(num_envs=4, seed=1, max_obstacles=3)
+        env.reset()
+        env.score[:] = 1000
+        for _ in range(MAX_OBSTACLES):
+            env._spawn_obstacles(np.ones(4, dtype=bool))
+        np.testing.assert_array_equal(env.obstacle_active.sum(axis=1), 3)
+
+    def test_formation_shares_height_and_speed(self):
+        self.env.score[:] = 90
+        self.env.rng = np.random.default_rng(5)
+        formation = BEHAVIOR_LIST.index(BEHAVIORS["formation"])
+        while not (self.env.obstacle_behavior == formation).any():
+            self.env._reset(np.ones(4, dtype=bool))
+            self.env.score[:] = 90
+            self.env._spawn_obstacles(np.ones(4, dtype=bool))
+
+        row = np.flatnonzero((self.env.obstacle_behavior == formation).any(axis=1))[0]
+        members = self.env.obstacles[row, self.env.obstacle_active[row]]
+        self.assertEqual(len(members), 3)
+        np.testing.assert_array_equal(
+            members[:, 0], WORLD_WIDTH + np.arange(3) * BEHAVIORS["formation"].spacing
+        )
+        self.assertEqual(len(set(members[:, 1])), 1)
+        self.assertEqual(len(set(members[:, 2])), 1)
+
+    def test_obstacles_move_like_the_game(self):
+        self.env.step(np.zeros(4))
+        self.env.obstacle_active[:] = False
+        self.env.obstacle_active[:, :3] = True
+        obstacles = []
+        for slot, behavior in enumerate(["straight", "wave", "dive"]):
+            self.env.obstacle_behavior[:, slot] = BEHAVIOR_LIST.index(
+                BEHAVIORS[behavior]
+            )
+            self.env.obstacles[:, slot] = (700 + 100 * slot, 200, 4)
+            self.env.obstacle_base_y[:, slot] = 200
+            self.env.obstacle_phase[:, slot] = behaviors.phase(BEHAVIORS[behavior], 0.5)
+            obstacles.append(
+                SimpleNamespace(
+                    pos=(700 + 100 * slot, 200),
+                    velocity=4,
+                    behavior=BEHAVIORS[behavior],
+                    base_y=200,
+                    phase=behaviors.phase(BEHAVIORS[behavior], 0.5),
+                )
+            )
+
+        for _ in range(10):
+            self.env.step(np.ones(4))
+            behaviors.step(obstacles, self.env.ticks[0] * TICK, self.env.bee_y[0])
+            np.testing.assert_allclose(
+                self.env.obstacles[0, :3, :2], [obstacle.pos for obstacle in obstacles]
+            )
+
+    def test_obstacle_targets_hovering_bee(self):
+        self.env.recent_y[:] = 123
+        self.env.bee_y[:] = 123
+        self.env._spawn_obstacles(np.ones(4, dtype=bool))
+        np.testing.assert_array_equal(self.env.obstacles[:, 0, 1], 123)
+
+    def test_obstacles_leave_screen(self):
+        self.env.step(np.zeros(4))
+        self.env.obstacles[:, 0, 0] = -SPRITE_SIZE + 1
+        self.env.obstacles[:, 0, 2] = 5
+        self.env.obstacle_active[:, 1:] = False
+        self.env.step(np.zeros(4))
+        np.testing.assert_array_equal(self.env.obstacle_active[:, 0], False)
+
+    def test_power_up_grants_invincibility(self):
+        self.env.rng = np.random.default_rng(0)
+        self.env.power_up_active[:] = True
+        self.env.power_up[:] = (BEE_X + 7, 640)
+
+        observation, _, _, _ = self.env.step(np.zeros(4))
+
+        np.testing.assert_array_equal(
+            self.env.invincible, round(INVINCIBLE_DURATION / TICK)
+        )
+        np.testing.assert_array_equal(self.env.power_up_active, False)
+        np.testing.assert_array_equal(observation[:, 2], 1)
+
+    def test_power_up_spawns(self):
+        env = BeeLazyEnv(num_envs=64, seed=3)
+        env.reset()
+        spawned = False
+        for _ in range(100):
+            env.step(np.ones(64))
+            spawned |= env.power_up_active.any()
+        self.assertTrue(spawned)
+
+    def test_frame_skip(self):
+        env = BeeLazyEnv(num_envs=2, frame_skip=4, seed=1)
+        env.reset()
+        _, _, _, infos = env.step([1, 1])
+        np.testing.assert_array_equal(infos["ticks"], 4)
+
+    def test_frame_skip_stops_finished_games(self):
+        env = BeeLazyEnv(num_envs=2, frame_skip=4, seed=1)
+        env.reset()
+        env.bee_y[0] = -SPRITE_SIZE + 0.1
+        _, rewards, dones, infos = env.step([0, 0])
+        np.testing.assert_array_equal(dones, [True, False])
+        np.testing.assert_array_equal(rewards, [-1, 0])
+        np.testing.assert_array_equal(infos["ticks"], [1, 4])
+
+    def test_stationary_bee_falls(self):
+        self.env.recent_y[:] = 540
+        self.env.step(np.ones(4))
+        np.testing.assert_array_equal(self.env.bee_y, 540 - GRAVITY)
+
+    def test_random_games_end(self):
+        env = BeeLazyEnv(num_envs=8, frame_skip=4, seed=2)
+        env.reset()
+        finished = 0
+        for _ in range(500):
+            _, _, dones, _ = env.step(env.rng.integers(0, 2, 8))
+            finished += dones.sum()
+        self.assertGreater(finished, 0)
+
+
+class TestSweeps(unittest.TestCase):
+    def test_sweeps_like_the_game(self):
+        values = itertools.product(
+            [100, 300, 390],
+            [-60, 0, 25],
+            [BEE_X - 150, BEE_X, BEE_X + 150],
+            [-40, 0, 40],
+        )
+        for bee_y, bee_motion, rect_x, rect_motion_y in values:
+            hitbox = (
+                BEE_X,
+                BEE_X + SPRITE_SIZE - HITBOX_OFFSET,
+                bee_y,
+                bee_y + SPRITE_SIZE - HITBOX_OFFSET,
+            )
+            expected = sweep(
+                hitbox,
+                (0, bee_motion),
+                (rect_x, 300, SPRITE_SIZE, SPRITE_SIZE),
+                (-200, rect_motion_y),
+            )
+            with self.subTest(bee_y=bee_y, bee_motion=bee_motion, rect_x=rect_x):
+                self.assertEqual(
+                    sweeps(
+                        np.array(bee_y, dtype=float),
+                        np.array(bee_motion, dtype=float),
+                        (np.array(rect_x, dtype=float), np.array(300.0)),
+                        (np.array(-200.0), np.array(rect_motion_y, dtype=float)),
+                        SPRITE_SIZE,
+                    ),
+                    expected is not None,
+                )
+
+    def test_fast_obstacle_does_not_pass_through(self):
+        env = BeeLazyEnv(num_envs=1, seed=1)
+        env.reset()
+        env.step([0])
+        env.obstacle_active[:] = False
+        env.obstacle_active[0, 0] = True
+        env.obstacle_behavior[0, 0] = 0
+        env.obstacles[0, 0] = (
+            BEE_X + 2 * SPRITE_SIZE,
+            env.bee_y[0] - GRAVITY,
+            4 * SPRITE_SIZE,
+        )
+        _, _, dones, infos = env.step([0])
+        self.assertTrue(dones[0])
+        self.assertFalse(infos["fell"][0])
+
+
+class TestOverlaps(unittest.TestCase):
+    def test_overlaps(self):
+        self.assertTrue(overlaps(300, BEE_X, 300, SPRITE_SIZE))
+        self.assertFalse(overlaps(300, BEE_X + SPRITE_SIZE, 300, SPRITE_SIZE))
+        self.assertFalse(overlaps(300, BEE_X, 300 + SPRITE_SIZE, SPRITE_SIZE))
@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.flight_recorder import FIELDS, FlightRecorder, load
+
+
+class TestFlightRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.recorder = FlightRecorder(self.directory.name, capacity=3, max_dumps=2)
+
+    def tearDown(self):
+        self.recorder.close()
+        self.directory.cleanup()
+
+    def record(self, tick, frame_time=0.016):
+        self.recorder.record(
+            tick, tick / 60, 300, -0.5, 2, tick // 2, 0.001, frame_time, 1
+        )
+
+    def test_record(self):
+        self.assertEqual(self.recorder.rows(), [])
+        self.record(1)
+        self.assertEqual(self.recorder.rows(), [(1, 1 / 60, 300, -0.5, 2, 0, 1, 16, 1)])
+        for tick in range(2, 6):
+            self.record(tick)
+        self.assertEqual([row[0] for row in self.recorder.rows()], [3, 4, 5])
+        self.assertEqual(len(self.recorder.rows()[0]), len(FIELDS))
+
+    def test_dump(self):
+        for tick in range(1, 5):
+            self.record(tick)
+        path = self.recorder.dump("game-over")
+        self.assertTrue(path.endswith("-1-game-over.flight"))
+
+        header, rows = load(path)
+        self.assertEqual(header["reason"], "game-over")
+        self.assertEqual(header["fields"], list(FIELDS))
+        self.assertEqual(header["rows"], 3)
+        self.assertEqual(rows, self.recorder.rows())
+
+    def test_load_other_byteorder(self):
+        self.record(1)
+        path = self.recorder.dump("game-over")
+        with open(path, "rb") as file:
+            header = json.loads(file.readline())
+            data = bytearray(file.read())
+        data.reverse()  # one row of doubles in the opposite byte order, last field first
+        header["byteorder"] = "big" if sys.byteorder == "little" else "little"
+        with open(path, "wb") as file:
+            file.write(json.dumps(header).encode() + b"\n" + data)
+
+        self.assertEqual(load(path)[1], [tuple(reversed(self.recorder.rows()[0]))])
+
+    def test_prune(self):
+        paths = [self.recorder.dump(reason) for reason in ("a", "b", "c")]
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            sorted(os.path.basename(path) for path in paths[1:]),
+        )
+
+    @patch("time.monotonic", side_effect=[100, 105, 110])
+    def test_long_frame(self, mock_monotonic):
+        del mock_monotonic
+        self.record(1, 0.5)
+        self.record(2, 0.5)
+        self.record(3)
+        self.record(4, 0.5)
+        dumps = sorted(os.listdir(self.directory.name))
+        self.assertEqual(len(dumps), 2)
+        self.assertTrue(all(dump.endswith("long-frame.flight") for dump in dumps))
+
+    def test_dump_on_exception(self):
+        hook, thread_hook = MagicMock(), MagicMock()
+        with (
+            patch("sys.excepthook", hook),
+            patch("threading.excepthook", thread_hook),
+        ):
+            self.recorder.dump_on_exception()
+            error = KeyError("tick")
+            sys.excepthook(KeyError, error, None)
+            hook.assert_called_once_with(KeyError, error, None)
+
+            thread = threading.Thread(target=lambda: 1 / 0)
+            thread.start()
+            thread.join()
+            thread_hook.assert_called_once()
+
+            dumps = sorted(os.listdir(self.directory.name))
+            self.assertEqual(len(dumps), 2)
+            self.assertTrue(any("exception-KeyError" in dump for dump in dumps))
+            self.assertTrue(
+                any("exception-ZeroDivisionError" in dump for dump in dumps)
+            )
+
+            self.recorder.close()
+            self.assertIs(sys.excepthook, hook)
+            self.assertIs(threading.excepthook, thread_hook)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from PIL import Image
+
+from src.flight_recorder import FlightRecorder
+from src.flight_viewer import CHART_SIZE, PLOTTED, main, plot, summary
+
+
+class TestFlightViewer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.recorder = FlightRecorder(self.directory.name)
+        for tick in range(1, 4):
+            self.recorder.record(tick, tick / 60, 300, 0, 1, 0, tick / 1000, 0.02, 0)
+        self.path = self.recorder.dump("game-over")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_summary(self):
+        header = {"reason": "long-frame", "fields": ["tick", "tick_ms", "frame_ms"]}
+        self.assertEqual(summary(header, []), "long-frame: 0 ticks")
+        self.assertEqual(
+            summary(header, [(7, 1, 40), (8, 3, 20)]).splitlines(),
+            [
+                "long-frame: 2 ticks",
+                "ticks 7 to 8",
+                "slowest tick 3.00 ms at tick 8",
+                "longest frame 40.00 ms at tick 7",
+            ],
+        )
+
+    def test_plot(self):
+        png = os.path.join(self.directory.name, "plot.png")
+        plot({"fields": PLOTTED}, [], png)
+        with Image.open(png) as image:
+            self.assertEqual(image.width, CHART_SIZE[0] + 8)
+            self.assertEqual(image.height, len(PLOTTED) * (CHART_SIZE[1] + 8))
+
+    def test_main(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main([self.path])
+        png = os.path.splitext(self.path)[0] + ".png"
+        self.assertTrue(os.path.exists(png))
+        self.assertIn("game-over: 3 ticks", output.getvalue())
+        self.assertIn("slowest tick 3.00 ms at tick 3", output.getvalue())
+        self.assertIn(f"plot: {png}", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
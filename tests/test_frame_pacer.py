@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock
+
+from src.frame_pacer import MAX_TICKS, FramePacer
+from src.timer_wheel import TICK
+
+
+class TestFramePacer(unittest.TestCase):
+    def setUp(self):
+        self.on_refresh = MagicMock()
+        self.pacer = FramePacer(self.on_refresh, window=8)
+
+    def test_jitter_at_60_hz(self):
+        ticks = [
+            self.pacer.ticks(TICK + jitter)
+            for jitter in (0.001, -0.001, 0.002, -0.002) * 10
+        ]
+        self.assertEqual(ticks, [1] * 40)
+        self.on_refresh.assert_not_called()
+
+    def test_120_hz(self):
+        for _ in range(8):
+            self.pacer.ticks(1 / 120)
+        self.on_refresh.assert_called_once_with(1 / 120, True)
+
+        ticks = [self.pacer.ticks(1 / 120 + jitter) for jitter in (0.0005, -0.0005) * 8]
+        self.assertEqual(ticks, [ticks[0], 1 - ticks[0]] * 8)
+
+    def test_not_synced(self):
+        for _ in range(8):
+            self.pacer.ticks(0.001)
+        self.on_refresh.assert_called_once_with(TICK, False)
+        self.assertEqual(self.pacer.snap(0.001), 0.001)
+
+    def test_uncapped_frame_rate(self):
+        for jitter in (0.001, -0.0008, 0.0002, -0.0012) * 2:
+            self.pacer.ticks(1 / 250 + jitter)
+        self.on_refresh.assert_called_once_with(TICK, False)
+
+    def test_synced_again(self):
+        for _ in range(8):
+            self.pacer.ticks(0.001)
+        for _ in range(8):
+            self.pacer.ticks(1 / 120)
+        self.assertEqual(self.on_refresh.call_args.args, (1 / 120, True))
+
+    def test_slower_display(self):
+        for _ in range(8):
+            self.pacer.ticks(1 / 50)
+        self.on_refresh.assert_not_called()
+        self.assertEqual(self.pacer.refresh_interval, TICK)
+        self.assertEqual(self.pacer.snap(1 / 50), 1 / 50)
+
+    def test_long_frame(self):
+        self.assertEqual(self.pacer.ticks(1.0), MAX_TICKS)
+        self.assertEqual(self.pacer.accumulator, 0)
+
+    def test_session_stats(self):
+        for interval in [TICK] * 98 + [2 * TICK, 3 * TICK]:
+            self.pacer.ticks(interval)
+
+        stats = self.pacer.session_stats()
+
+        self.assertEqual(stats["refresh_hz"], 60)
+        self.assertEqual(stats["frames"], 100)
+        self.assertAlmostEqual(stats["mean_ms"], 1.03 * TICK * 1000)
+        self.assertGreater(stats["jitter_ms"], 0)
+        self.assertEqual(stats["p99_ms"], 33.3)
+        self.assertEqual(stats["missed"], 2)
+        self.assertEqual(self.pacer.session_stats()["frames"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import gc
+import unittest
+from unittest.mock import patch
+
+from src.gc_policy import PLAY_THRESHOLDS, GcPolicy
+from src.run_state import RunState
+
+
+class TestGcPolicy(unittest.TestCase):
+    def setUp(self):
+        self.thresholds = gc.get_threshold()
+        self.times = iter(range(100))
+        self.policy = GcPolicy(timer=lambda: next(self.times) / 1000)
+
+    def tearDown(self):
+        self.policy.stop()
+        self.assertNotIn(self.policy.measure, gc.callbacks)
+        self.assertEqual(gc.get_threshold(), self.thresholds)
+        self.assertTrue(gc.isenabled())
+
+    def test_play_thresholds(self):
+        self.policy.enter(RunState.PLAYING)
+        self.assertEqual(gc.get_threshold(), PLAY_THRESHOLDS)
+        self.assertTrue(gc.isenabled())
+
+        self.policy.enter(RunState.GAME_OVER)
+        self.assertEqual(gc.get_threshold(), self.thresholds)
+
+    def test_disabled_during_play(self):
+        self.policy.thresholds = None
+        self.policy.enter(RunState.PLAYING)
+        self.assertFalse(gc.isenabled())
+
+        self.policy.enter(RunState.PAUSED)
+        self.assertTrue(gc.isenabled())
+
+    @patch("src.gc_policy.gc.collect")
+    def test_collects_at_safe_points(self, mock_collect):
+        self.policy.enter(RunState.PLAYING)
+        mock_collect.assert_not_called()
+        for state in (RunState.MENU, RunState.PAUSED, RunState.GAME_OVER):
+            self.policy.enter(state)
+        self.assertEqual(mock_collect.call_count, 3)
+
+    def test_measures_pauses(self):
+        gc.collect()
+        self.assertEqual(self.policy.collections[2], 1)
+        self.assertAlmostEqual(self.policy.longest_pause, 0.001)
+
+        self.policy.enter(RunState.PLAYING)
+        self.policy.measure("start", {"generation": 0})
+        self.policy.measure("stop", {"generation": 0})
+        self.assertEqual(self.policy.collections[0], 1)
+        self.assertAlmostEqual(self.policy.pause_time, 0.002)
+
+        stats = self.policy.session_stats()
+        self.assertEqual(stats["count"], 1)
+        self.assertAlmostEqual(stats["longest_ms"], 1)
+        self.assertEqual(self.policy.session_stats()["count"], 0)
+
+    @patch("src.gc_policy.Logger")
+    def test_freeze(self, mock_logger):
+        self.policy.freeze()
+        self.assertGreater(gc.get_freeze_count(), 0)
+        mock_logger.info.assert_called_once()
+        self.policy.stop()
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import itertools
+import unittest
+
+from src.input_latency import LatencyOverlay, LatencyTracker
+from src.rules import WORLD_HEIGHT
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.tracker = LatencyTracker(timer=lambda: self.now)
+
+    def test_touch_to_frame(self):
+        self.tracker.tick()
+        self.assertEqual(self.tracker.frame(), [])
+        self.tracker.touch("linux/mouse")
+        self.now = 0.004
+        self.tracker.touch("linux/mouse")
+        self.now = 0.010
+        self.tracker.tick()
+        self.now = 0.030
+        self.assertEqual(
+            self.tracker.frame(None),
+            [("linux/mouse", 0.030), ("linux/mouse", 0.026)],
+        )
+        self.assertEqual(self.tracker.percentiles("linux/mouse", "tick"), (6, 10, 10))
+        self.assertEqual(self.tracker.percentiles("linux/mouse", "frame"), (26, 30, 30))
+        self.assertEqual(self.tracker.consumed, [])
+
+    def test_discard(self):
+        self.tracker.touch("linux/mouse")
+        self.tracker.tick()
+        self.tracker.touch("linux/mouse")
+        self.tracker.discard()
+        self.assertEqual(self.tracker.frame(), [])
+        self.assertEqual(self.tracker.pending, [])
+
+    def test_count_caps_latency(self):
+        self.tracker.count("android/android", "frame", 2.0)
+        self.assertEqual(
+            self.tracker.percentiles("android/android", "frame"), (250, 250, 250)
+        )
+
+    def test_summary(self):
+        self.assertEqual(self.tracker.summary(), "No touches yet")
+        for latency in itertools.islice(itertools.cycle((0.012, 0.020)), 4):
+            self.tracker.count("linux/mouse", "frame", latency)
+        self.assertEqual(
+            self.tracker.summary(),
+            "linux/mouse touch to frame: p50 12 p95 20 p99 20 ms (4 touches)",
+        )
+
+
+class TestLatencyOverlay(unittest.TestCase):
+    def test_refresh(self):
+        tracker = LatencyTracker()
+        overlay = LatencyOverlay(tracker)
+        self.assertEqual(overlay.text, "No touches yet")
+        tracker.count("linux/mouse", "tick", 0.005)
+        overlay.refresh(0.5)
+        self.assertIn("linux/mouse touch to tick: p50 5", overlay.text)
+        overlay.texture_update()
+        self.assertEqual(overlay.size, overlay.texture_size)
+        self.assertEqual(overlay.top, WORLD_HEIGHT - 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ import unittest
 from kivy.graphics import Ellipse, Line
 from kivy.uix.widget import Widget
 
+from src import rng
 from src.bee import Bee
 from src.invincible_effect import InvincibleEffect
 
@@ -95,6 +96,12 @@ class TestInvincibleEffect(unittest.TestCase):
                 self.invincible_effect.pos[1] + self.invincible_effect.size[0] / 2,
             )
 
+    def test_draw_glitter_without_cosmetics(self):
+        rng.cosmetic.enabled = False
+        self.addCleanup(setattr, rng.cosmetic, "enabled", True)
+        self.invincible_effect.draw_glitter()
+        self.assertEqual(self.invincible_effect.glitters, [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+from src.job_queue import JobQueue
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.queue = JobQueue(budget=0.002, timer=self.timer)
+        self.log = []
+
+    def work(self, name, duration=0.0):
+        def task():
+            self.log.append(name)
+            self.timer.now += duration
+
+        return task
+
+    def test_runs_by_priority_within_budget(self):
+        self.queue.submit(self.work("late", 0.001), priority=1)
+        self.queue.submit(self.work("first", 0.001))
+        self.queue.submit(self.work("second", 0.001))
+
+        self.assertEqual(self.queue.run(), 2)
+        self.assertEqual(self.log, ["first", "second"])
+        self.assertEqual(len(self.queue), 1)
+        self.assertEqual(self.queue.run(), 1)
+        self.assertEqual(self.log[-1], "late")
+        self.assertEqual(self.queue.overruns, 0)
+
+    def test_incremental_job(self):
+        def steps():
+            for index in range(3):
+                self.log.append(index)
+                self.timer.now += 0.0015
+                yield
+
+        job = self.queue.submit(steps)
+        self.queue.submit(self.work("other"), priority=1)
+        self.assertEqual(job.name, "steps")
+
+        self.queue.run()
+        self.assertEqual(self.log, [0, 1])
+        self.assertEqual(self.queue.stats()["depth"], 2)
+        self.queue.run()
+        self.assertEqual(self.log, [0, 1, 2, "other"])
+        self.assertTrue(job.done)
+        self.assertEqual(job.steps, 4)
+
+    def test_overdue_jobs_run_over_budget(self):
+        self.queue.submit(self.work("slow", 0.005))
+        self.queue.submit(self.work("deadline"), priority=5, deadline=0.001)
+        self.queue.submit(self.work("waits"), priority=5, deadline=1)
+
+        self.queue.run()
+
+        self.assertEqual(self.log, ["slow", "deadline"])
+        self.assertEqual(self.queue.overruns, 1)
+        self.assertAlmostEqual(self.queue.stats()["longest_run_ms"], 5)
+
+    def test_cancel(self):
+        job = self.queue.submit(self.work("cancelled"))
+        job.cancel()
+        self.assertEqual(self.queue.run(), 0)
+        self.assertTrue(job.done)
+        self.assertEqual(self.queue.stats()["max_depth"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import http.client
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock, patch
+
+from src.leaderboard import ConnectionPool, LeaderboardClient, RequestRejected
+from src.leaderboard_server import LeaderboardServer, benchmark, main
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.server = LeaderboardServer().start()
+        self.pool = ConnectionPool(self.server.url, size=1)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.stop()
+
+    def test_request_reuses_connection(self):
+        self.assertIsNone(self.pool.request("POST", "/scores", {"scores": [3, 1]}))
+        connection = self.pool._idle.queue[0]
+        self.assertEqual(self.pool.request("GET", "/scores?limit=1"), [3])
+        self.assertIs(self.pool._idle.queue[0], connection)
+
+    def test_request_error_status(self):
+        with self.assertRaises(RequestRejected):
+            self.pool.request("GET", "/unknown")
+        with self.assertRaises(RequestRejected):
+            self.pool.request("POST", "/unknown", {})
+        self.server.fail_requests = True
+        with self.assertRaises(http.client.HTTPException) as caught:
+            self.pool.request("GET", "/scores")
+        self.assertNotIsInstance(caught.exception, RequestRejected)
+
+    def test_request_replaces_closed_connection(self):
+        stale = MagicMock()
+        stale.getresponse.side_effect = http.client.RemoteDisconnected()
+        self.pool._release(stale)
+        self.assertEqual(self.pool.request("GET", "/scores"), [])
+        stale.close.assert_called_once()
+
+    def test_request_connection_refused(self):
+        pool = ConnectionPool("http://127.0.0.1:9/", size=1)
+        with self.assertRaises(OSError):
+            pool.request("GET", "/scores")
+
+    def test_connection_follows_scheme(self):
+        connection = ConnectionPool("https://scores.example.com/api")._connect()
+        self.assertIsInstance(connection, http.client.HTTPSConnection)
+        self.assertEqual(
+            (connection.host, connection.port), ("scores.example.com", 443)
+        )
+
+        connection = ConnectionPool("http://scores.example.com/api")._connect()
+        self.assertNotIsInstance(connection, http.client.HTTPSConnection)
+        self.assertEqual(connection.port, 80)
+
+    def test_full_pool_closes_connection(self):
+        connections = [self.pool._connect(), self.pool._connect()]
+        for connection in connections:
+            self.pool._release(connection)
+        self.assertEqual(self.pool._idle.qsize(), 1)
+
+
+class TestLeaderboardClient(unittest.TestCase):
+    def setUp(self):
+        self.server = LeaderboardServer().start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.queue_path = os.path.join(self.directory.name, "leaderboard.json")
+
+    def tearDown(self):
+        self.server.stop()
+        self.directory.cleanup()
+
+    def test_submit(self):
+        client = LeaderboardClient(self.server.url, self.queue_path, batch_size=2)
+        for score in (5, 9, 7):
+            client.submit(score)
+
+        self.assertTrue(wait_for(lambda: sorted(self.server.scores) == [5, 7, 9]))
+        self.assertTrue(wait_for(lambda: client.pending == []))
+        client.close()
+
+    def test_pending_scores_survive_restart(self):
+        self.server.fail_requests = True
+        client = LeaderboardClient(self.server.url, self.queue_path)
+        client.submit(42)
+        self.assertTrue(wait_for(lambda: client.failures > 0))
+        client.close()
+        self.assertEqual(client.pending, [42])
+
+        self.server.fail_requests = False
+        client = LeaderboardClient(self.server.url, self.queue_path)
+        self.assertTrue(wait_for(lambda: self.server.scores == [42]))
+        self.assertTrue(wait_for(lambda: client.failures == 0))
+        client.close()
+
+    def test_retry_with_backoff(self):
+        self.server.fail_requests = True
+        with patch("src.leaderboard.BACKOFF_BASE", 0.01):
+            client = LeaderboardClient(self.server.url, self.queue_path)
+            client.submit(1)
+            self.assertTrue(wait_for(lambda: client.failures >= 2))
+            self.server.fail_requests = False
+            self.assertTrue(wait_for(lambda: self.server.scores == [1]))
+            client.close()
+
+    def test_rejected_batch_is_dropped(self):
+        with open(self.queue_path, "w", encoding="utf-8") as file:
+            json.dump({"pending": ["bad", 3]}, file)
+        with self.assertLogs("src.leaderboard", "WARNING"):
+            client = LeaderboardClient(self.server.url, self.queue_path, batch_size=1)
+            self.assertTrue(wait_for(lambda: self.server.scores == [3]))
+        self.assertTrue(wait_for(lambda: client.pending == []))
+        self.assertEqual(client.failures, 0)
+        client.close()
+
+    def test_submit_does_not_cut_backoff_short(self):
+        client = LeaderboardClient(self.server.url, self.queue_path)
+        with patch.object(client.pool, "request", side_effect=OSError) as request:
+            client.submit(1)
+            self.assertTrue(wait_for(lambda: client.failures == 1))
+            for score in range(5):
+                client.submit(score)
+            time.sleep(0.1)
+            self.assertEqual(request.call_count, 1)
+        client.close()
+
+    def test_top_is_cached(self):
+        self.server.scores.extend([1, 8, 3])
+        client = LeaderboardClient(self.server.url, self.queue_path, ttl=60)
+        self.assertEqual(client.top(2), [])
+        self.assertTrue(wait_for(lambda: client.top(2) == [8, 3]))
+
+        self.server.scores.append(10)
+        self.assertEqual(client.top(2), [8, 3])
+
+        client.ttl = 0
+        self.assertTrue(wait_for(lambda: client.top(2) == [10, 8]))
+        client.close()
+
+    def test_top_rejected(self):
+        client = LeaderboardClient(self.server.url, self.queue_path)
+        with (
+            patch.object(client.pool, "request", side_effect=RequestRejected),
+            self.assertLogs("src.leaderboard", "WARNING"),
+        ):
+            client.top()
+            self.assertTrue(wait_for(lambda: client._fetched_at is not None))
+        self.assertEqual(client.failures, 0)
+        client.close()
+
+    def test_top_invalid_response(self):
+        client = LeaderboardClient(self.server.url, self.queue_path)
+        with patch.object(client.pool, "request", return_value={"top": []}):
+            client.top()
+            self.assertTrue(wait_for(lambda: client.failures > 0))
+        client.close()
+
+
+class TestLeaderboardServer(unittest.TestCase):
+    def test_benchmark(self):
+        server = LeaderboardServer().start()
+        rate = benchmark(server.url, clients=2, batches=10, batch_size=5)
+        self.assertGreater(rate, 0)
+        self.assertEqual(len(server.scores), 50)
+        self.assertEqual(server.batches, 10)
+        server.stop()
+
+    def test_main_benchmark(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--benchmark", "--clients", "2", "--batches", "4"])
+        self.assertIn("scores/s with 2 clients", output.getvalue())
+
+    @patch.object(LeaderboardServer, "serve_forever")
+    def test_main_serve(self, mock_serve_forever):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--port", "0"])
+        mock_serve_forever.assert_called_once()
+        self.assertIn("Serving the leaderboard on http://127.0.0.1:", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,36 @@
+import itertools
+import json
 import os
+import random
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from kivy.app import App
 from kivy.clock import Clock
 from kivy.core.window import Window
 from kivy.graphics import Color, Rectangle
+from kivy.tests.common import UnitTestTouch
 from kivy.uix.button import Button
 from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.uix.widget import Widget
+from kivy.utils import platform
 
-from src.bee import Bee
+from src import behaviors, rng
+from src.bee import Bee, ReplayInput
+from src.behaviors import BEHAVIORS
+from src.flight_recorder import FIELDS, FlightRecorder
+from src.input_latency import LatencyOverlay, LatencyTracker
 from src.main_screen import TOP_TEXT, BeeLazy, Game, PowerUp
 from src.obstacle import Obstacle
+from src.rules import WORLD_HEIGHT, WORLD_WIDTH
+from src.run_state import RunState
+from src.scaled_view import ScaledView
+from src.simulation import Frame, Simulation
+from src.snapshot import MAX_BEES
+from src.timer_wheel import TICK
+from src.viewport import Viewport
 
 
 class TestPowerUp(unittest.TestCase):
@@ -25,9 +42,9 @@ class TestPowerUp(unittest.TestCase):
         self.assertEqual(tuple(self.power_up.size), (50, 50))
         self.assertEqual(self.power_up.velocity, 7)
         self.assertGreaterEqual(self.power_up.pos[0], 0)
-        self.assertLessEqual(self.power_up.pos[0], Window.width)
+        self.assertLessEqual(self.power_up.pos[0], WORLD_WIDTH)
         self.assertGreaterEqual(self.power_up.pos[1], 50)
-        self.assertLessEqual(self.power_up.pos[1], Window.height - 50)
+        self.assertLessEqual(self.power_up.pos[1], WORLD_HEIGHT - 50)
         self.assertIsInstance(self.power_up.color, Color)
         self.assertIsInstance(self.power_up.rect, Rectangle)
 
@@ -54,7 +71,6 @@ class TestMainScreen(unittest.TestCase):
 
     def test_txupdate(self):
         boot_time = 0.0
-        Clock.get_boottime = lambda: boot_time
 
         self.game.txupdate()
 
@@ -75,6 +91,23 @@ class TestMainScreen(unittest.TestCase):
         self.game.update_background()
         self.assertEqual(self.game.rect_1.size, initial_size)
 
+    def test_viewport_changed(self):
+        texture = self.game.rect_1.texture
+        bee = self.game.bee
+        bee.load_spritesheet = MagicMock()
+        self.game.viewport_changed(Viewport((WORLD_WIDTH, WORLD_HEIGHT)))
+        self.assertIs(self.game.rect_1.texture, texture)
+
+        self.game.viewport_changed(Viewport((3840, 2160)))
+        self.assertEqual(self.game.tier, "high")
+        self.assertIsNot(self.game.rect_1.texture, texture)
+        bee.load_spritesheet.assert_called_once()
+
+        self.game.sprites = MagicMock()
+        self.game.viewport_changed(Viewport((960, 540)))
+        self.assertEqual(self.game.tier, "low")
+        bee.load_spritesheet.assert_called_once()
+
     @patch("src.main_screen.Game.load_highscores")
     def test_start_game(self, mock_load_highscores):
         mock_load_highscores.return_value = None
@@ -134,6 +167,7 @@ class TestMainScreen(unittest.TestCase):
         self.game.score = 0
         self.game.score_label = Label()
         self.game.game_over = False
+        self.game.run_state.transition(RunState.PLAYING)
 
         self.game.update()
 
@@ -143,6 +177,7 @@ class TestMainScreen(unittest.TestCase):
         self.assertGreaterEqual(self.game.score, 0)
         self.assertIsInstance(self.game.score_label, Label)
         self.assertTrue(self.game.game_over)
+        self.assertIs(self.game.run_state.state, RunState.GAME_OVER)
 
     def test_update_with_power_ups(self):
         self.game.bee = Bee()
@@ -174,13 +209,12 @@ class TestMainScreen(unittest.TestCase):
         self.game.score_label = Label()
         self.game.game_over = False
 
-        with patch("random.randint") as mock_randint:
-            # Set the return value of randint
-            mock_randint.return_value = 0
-            self.game.update()
+        self.game.next_power_up = 1
+        self.game.update()
 
         self.assertIsInstance(self.game.bee, Bee)
-        self.assertGreaterEqual(len(self.game.power_ups), 0)
+        self.assertEqual(len(self.game.power_ups), 1)
+        self.assertGreater(self.game.next_power_up, 1)
         self.assertGreaterEqual(len(self.game.obstacles), 0)
         self.assertGreaterEqual(self.game.score, 0)
         self.assertIsInstance(self.game.score_label, Label)
@@ -191,11 +225,187 @@ class TestMainScreen(unittest.TestCase):
         self.game.timeout_power_up(arg)
         self.assertFalse(self.game.bee.invincible)
 
+    def test_update_advances_timers(self):
+        self.game.bee = Bee()
+        self.game.power_ups = []
+        self.game.obstacles = []
+        self.game.score_label = Label()
+        self.game.bee.invincible = True
+        self.game.bee.power_up_timer = self.game.timers.schedule(
+            0.5, self.game.timeout_power_up
+        )
+        self.game.run_state.transition(RunState.PLAYING)
+
+        for _ in range(30):
+            self.game.update()
+
+        self.assertFalse(self.game.bee.invincible)
+        self.assertIsNone(self.game.bee.power_up_timer)
+
+    def test_animate(self):
+        self.game.bee = Bee()
+        self.game.obstacles = [Obstacle()]
+        self.game.animate(None)
+        self.assertEqual(self.game.bee.frame_idx, 1)
+        self.assertEqual(self.game.obstacles[0].frame_idx, 1)
+
+    def test_apply_quality(self):
+        self.game.run_state.transition(RunState.PLAYING)
+        self.game.quality.override("low")
+        self.assertEqual(self.game.invincible_effect.num_glitters, 2)
+        self.assertEqual(self.game.bee.anim_delay, 0.2)
+        self.assertTrue(self.game.animation_timer.active)
+
+        self.game.quality.override("medium")
+        self.assertEqual(self.game.invincible_effect.num_glitters, 5)
+
+    def test_gpu_sprites(self):
+        with patch.object(self.game, "load_highscores"):
+            self.game.start_game()
+        self.game.use_gpu_sprites()
+        sprites = self.game.sprites
+        self.assertIn(sprites.canvas, self.game.canvas.before.children)
+        self.assertEqual(list(sprites.sprites), [self.game.bee])
+        self.assertFalse(self.game.animation_timer.active)
+
+        obstacle = Obstacle()
+        self.game.obstacles = [obstacle]
+        self.game.add_widget(obstacle)
+        self.assertEqual(sprites.sprites[obstacle].fps, 10)
+        self.game.update(0.5)
+        self.assertEqual(obstacle.frame_idx, 0)
+        self.assertEqual(sprites.canvas["time"], self.game.timers.now)
+
+        self.game.quality.override("low")
+        self.assertEqual(sprites.sprites[obstacle].fps, 5)
+        self.game.remove_widget(obstacle)
+        self.assertNotIn(obstacle, sprites.sprites)
+
+        self.game.simulation = MagicMock()
+        self.game.simulation.frames.latest.return_value = Frame(
+            1, 0, 250.0, False, (), None, None
+        )
+        self.game.present(0.5)
+        self.assertEqual(sprites.canvas["time"], self.game.timers.now)
+
+    def test_update_limits_obstacles(self):
+        self.game.bee = Bee()
+        self.game.power_ups = []
+        self.game.obstacles = []
+        self.game.score = 300
+        self.game.score_label = Label()
+        self.game.quality.override("low")
+
+        for _ in range(5):
+            self.game.update()
+
+        self.assertLessEqual(len(self.game.obstacles), 3)
+
     def test_fly(self):
         self.game.bee = Bee()
         self.game.fly()
         self.assertTrue(self.game.bee.flying)
 
+    def test_fly_continues_paused_game(self):
+        self.game.score_label = Label()
+        self.game.run_state.transition(RunState.PLAYING)
+        self.game.run_state.transition(RunState.PAUSED)
+        self.assertEqual(self.game.score_label.text, "Paused")
+
+        self.game.fly()
+
+        self.assertIs(self.game.run_state.state, RunState.PLAYING)
+        self.assertEqual(self.game.score_label.text, "Score: 0")
+
+    def test_enter_run_state(self):
+        self.game.run_state.transition(RunState.PLAYING)
+        self.assertFalse(self.game.timers.paused)
+        self.assertEqual(Clock._max_fps, 0)
+
+        self.game.run_state.transition(RunState.GAME_OVER)
+        self.assertTrue(self.game.timers.paused)
+        self.assertEqual(Clock._max_fps, 20)
+
+    def test_frame(self):
+        self.game.score_label = Label()
+        self.game.run_state.transition(RunState.PLAYING)
+        coords = self.game.rect_1.tex_coords
+
+        self.game.frame(2 * TICK)
+
+        self.assertEqual(self.game.tick, 2)
+        self.assertEqual(self.game.timers.now, 2 * TICK)
+        self.assertNotEqual(self.game.rect_1.tex_coords, coords)
+
+        with patch.object(self.game, "update") as update:
+            update.side_effect = lambda: self.game.run_state.transition(
+                RunState.GAME_OVER
+            )
+            self.game.frame(3 * TICK)
+        update.assert_called_once()
+
+    def test_refresh_detected(self):
+        self.game.score_label = Label()
+        self.game.refresh_detected(1 / 120, True)
+        self.assertEqual(self.game.playing_fps, 0)
+
+        self.game.refresh_detected(TICK, False)
+        self.game.run_state.transition(RunState.PLAYING)
+        self.assertEqual(Clock._max_fps, 60)
+        self.game.refresh_detected(TICK, False)
+        self.assertEqual(Clock._max_fps, 60)
+
+        # the cap paces the frames itself, which does not prove vsync
+        self.game.refresh_detected(TICK, True)
+        self.assertEqual(Clock._max_fps, 60)
+
+        self.game.run_state.transition(RunState.PAUSED)
+        self.game.run_state.transition(RunState.PLAYING)
+        self.assertEqual(self.game.playing_fps, 0)
+        self.assertEqual(Clock._max_fps, 0)
+        self.game.refresh_detected(1 / 120, True)
+        self.assertEqual(Clock._max_fps, 0)
+
+        self.game.refresh_detected(TICK, False)
+        self.game.run_state.transition(RunState.PAUSED)
+        self.game.viewport_changed(Viewport((1280, 720)))
+        self.assertEqual(self.game.playing_fps, 0)
+        self.assertEqual(Clock._max_fps, 10)
+
+    def test_cap_stays_without_vsync(self):
+        self.game.run_state.transition(RunState.PLAYING)
+        jitter = random.Random(7)
+        changes = 0
+        for _ in range(3000):
+            if Clock._max_fps:
+                interval = 1 / Clock._max_fps + jitter.uniform(-0.0008, 0.0008)
+            else:
+                interval = jitter.uniform(0.002, 0.006)
+            capped = Clock._max_fps
+            self.game.pacer.ticks(interval)
+            changes += Clock._max_fps != capped
+        self.assertEqual(changes, 1)
+        self.assertEqual(Clock._max_fps, 60)
+
+    def test_enter_run_state_backgrounded(self):
+        theme_song = MagicMock()
+        self.game.theme_song = theme_song
+        self.game.score_label = Label()
+
+        self.game.run_state.background()
+        theme_song.stop.assert_called_once()
+        self.assertEqual(Clock._max_fps, 1)
+
+        self.game.run_state.foreground()
+        theme_song.play.assert_called_once()
+        self.assertIs(self.game.run_state.state, RunState.MENU)
+
+        self.game.run_state.transition(RunState.PLAYING)
+        self.game.run_state.transition(RunState.GAME_OVER)
+        self.game.run_state.background()
+        self.game.run_state.foreground()
+        theme_song.play.assert_called_once()
+
     def test_fall(self):
         self.game.bee = Bee()
         self.game.fall()
@@ -214,7 +424,7 @@ class TestMainScreen(unittest.TestCase):
     def test_init_score_label(self):
         self.game.init_score_label()
         self.assertIsInstance(self.game.score_label, Label)
-        self.assertEqual(self.game.score_label.center_x, Window.width / 2)
+        self.assertEqual(self.game.score_label.center_x, WORLD_WIDTH / 2)
         self.assertEqual(self.game.score_label.top, TOP_TEXT)
 
     def test_remove_start_screen(self):
@@ -236,6 +446,7 @@ class TestMainScreen(unittest.TestCase):
         self.assertIn(self.game.score_label, self.game.children)
         self.assertIn(self.game.bee, self.game.children)
         self.assertIs(self.game.restart_button, None)
+        self.assertIsNone(self.game.bee.power_up_timer)
 
     def test_show_restart_button(self):
         self.game.show_restart_button()
@@ -245,7 +456,7 @@ class TestMainScreen(unittest.TestCase):
         self.assertEqual(self.game.restart_button.size, [200, 100])
         self.assertEqual(
             self.game.restart_button.pos,
-            [Window.width / 2 - 100, Window.height / 3 - 150],
+            [WORLD_WIDTH / 2 - 100, WORLD_HEIGHT / 3 - 150],
         )
         self.assertEqual(self.game.restart_button.outline_color, [0, 0, 0, 1])
         self.assertEqual(self.game.restart_button.outline_width, 2)
@@ -255,7 +466,7 @@ class TestMainScreen(unittest.TestCase):
         self.game.highscores = [5, 8, 12, 15, 20]
         self.game.show_highscore_label(current_score)
         self.assertIsInstance(self.game.highscore_label, Label)
-        self.assertEqual(self.game.highscore_label.center_x, Window.width / 2)
+        self.assertEqual(self.game.highscore_label.center_x, WORLD_WIDTH / 2)
         self.assertIn("Highscore", self.game.highscore_label.text)
 
     def test_show_highscore_label_with_marked_score(self):
@@ -263,9 +474,17 @@ class TestMainScreen(unittest.TestCase):
         self.game.highscores = [5, 8, 10, 15, 20]
         self.game.show_highscore_label(current_score)
         self.assertIsInstance(self.game.highscore_label, Label)
-        self.assertEqual(self.game.highscore_label.center_x, Window.width / 2)
+        self.assertEqual(self.game.highscore_label.center_x, WORLD_WIDTH / 2)
         self.assertIn("Highscore", self.game.highscore_label.text)
 
+    def test_show_highscore_label_with_global_scores(self):
+        self.game.leaderboard = MagicMock()
+        self.game.leaderboard.top.return_value = [99, 50]
+        self.game.show_highscore_label()
+        self.assertIn(
+            "Global:\n      1. 99\n      2. 50\n", self.game.highscore_label.text
+        )
+
     def test_remove_highscore_label(self):
         self.game.remove_highscore_label()
         self.assertNotIn(self.game.highscore_label, self.game.children)
@@ -307,14 +526,489 @@ class TestMainScreen(unittest.TestCase):
         self.assertEqual(self.game.highscores, expected_highscores)
         self.assertEqual(self.game.highscores[:1000], expected_highscores)
 
+    def test_save_highscores_submits_score(self):
+        self.game.store = MagicMock()
+        self.game.leaderboard = MagicMock()
+        self.game.score = 7
+        self.game.save_highscores()
+        self.game.leaderboard.submit.assert_called_once_with(7)
+
+
+class TestMultipleBees(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+        self.game.parent = Image()
+        self.game.theme_song = MagicMock()
+        self.game.store = MagicMock()
+        self.game.score_label = Label()
+        self.game.obstacles = []
+        self.game.power_ups = []
+
+    def test_add_bee(self):
+        ghost = self.game.add_bee(lambda tick: True)
+        self.assertEqual(self.game.bees, [self.game.bee, ghost])
+        self.assertNotIn(ghost, self.game.children)
+
+        self.game.run_state.transition(RunState.PLAYING)
+        player = self.game.add_bee()
+        self.assertIn(player, self.game.children)
+
+    def test_update_input_sources(self):
+        flying = self.game.add_bee(lambda tick: True)
+        falling = self.game.add_bee(lambda tick: False)
+        flying.pos = falling.pos = (200, 300)
+
+        self.game.update()
+
+        self.assertGreater(flying.pos[1], 300)
+        self.assertLess(falling.pos[1], 300)
+        self.assertEqual(self.game.recording, [False])
+
+    def test_update_scores_per_bee(self):
+        ghost = self.game.add_bee(lambda tick: False)
+        obstacle = Obstacle()
+        obstacle.velocity = 0
+        obstacle.pos = (-100, WORLD_HEIGHT)
+        self.game.obstacles = [obstacle]
+        self.game.bee.pos = (500, 300)
+        ghost.pos = (600, 300)
+
+        self.game.update()
+
+        self.assertEqual(obstacle.passed_by, {self.game.bee, ghost})
+        self.assertEqual(ghost.score, 1)
+        self.assertEqual(self.game.score, 1)
+
+    def test_update_fast_obstacle_does_not_tunnel(self):
+        obstacle = Obstacle()
+        obstacle.velocity = 800
+        obstacle.pos = (500, 300)
+        self.game.obstacles = [obstacle]
+        self.game.bee.pos = (200, 300)
+        self.game.run_state.transition(RunState.PLAYING)
+
+        with patch.object(self.game, "crash") as crash:
+            self.game.update()
+
+        self.assertLess(obstacle.pos[0] + obstacle.size[0], 200)
+        crash.assert_called_once_with(self.game.bee, "obstacle")
+
+    def test_crash_ghost_keeps_game_running(self):
+        ghost = self.game.add_bee(lambda tick: False)
+        obstacle = Obstacle()
+        obstacle.velocity = 0
+        obstacle.size = (50000, 50000)
+        obstacle.pos = (0, 0)
+        self.game.obstacles = [obstacle]
+        self.game.bee.invincible = True
+        self.game.bee.pos = (200, 300)
+        ghost.pos = (200, 300)
+        ghost.power_up_timer = self.game.timers.schedule(1, lambda dt: None)
+
+        self.game.update()
+
+        self.assertFalse(ghost.alive)
+        self.assertFalse(ghost.power_up_timer.active)
+        self.assertTrue(self.game.bee.alive)
+        self.assertFalse(self.game.game_over)
+
+    def test_crash_all_players_ends_game(self):
+        second = self.game.add_bee()
+        self.game.run_state.transition(RunState.PLAYING)
+
+        self.game.crash(self.game.bee)
+        self.assertFalse(self.game.game_over)
+
+        self.game.crash(second)
+        self.assertTrue(self.game.game_over)
+
+    def test_game_over_screen_is_built_over_frames(self):
+        self.game.run_state.transition(RunState.PLAYING)
+        self.game.crash(self.game.bee)
+        self.assertIsNone(self.game.restart_button)
+        self.assertEqual(len(self.game.jobs), 1)
+
+        # one step per frame: the budget is spent after the first step
+        with patch.object(
+            self.game.jobs, "timer", itertools.cycle([0, 0, 1, 1]).__next__
+        ):
+            self.game.run_jobs()
+            self.game.store.put.assert_called_once()
+            self.assertIsNone(self.game.highscore_label)
+            self.game.run_jobs()
+            self.assertIn(self.game.highscore_label, self.game.children)
+            self.game.run_jobs()
+        self.assertIsNotNone(self.game.restart_button)
+        self.assertEqual(len(self.game.jobs), 0)
+
+    def test_spare_obstacles(self):
+        self.game.prepare_obstacles()
+        job = self.game.obstacle_job
+        self.game.prepare_obstacles()
+        self.assertIs(self.game.obstacle_job, job)
+        while self.game.jobs:
+            self.game.run_jobs()
+        spares = list(self.game.spare_obstacles)
+        self.assertEqual(len(spares), self.game.quality.tier.max_obstacles)
+
+        self.game.bee.pos = (200, 300)
+        self.game.bee.last_positions.extend([300] * 5)
+        self.game.spawn_obstacle([self.game.bee])
+        self.assertIs(self.game.obstacles[0], spares[-1])
+        self.assertEqual(tuple(self.game.obstacles[0].pos), (WORLD_WIDTH, 300))
+        self.assertIsNot(self.game.obstacle_job, job)
+
+    def test_spare_obstacles_keep_the_seeded_game(self):
+        def spawn(build_spares: bool) -> list:
+            game = Game()
+            game.obstacles = []
+            rng.seed(42)
+            if build_spares:
+                game.prepare_obstacles()
+                while game.jobs:
+                    game.run_jobs()
+            game.score = 90
+            for _ in range(3):
+                game.spawn_obstacle([])
+            return [
+                (obstacle.pos[1], obstacle.velocity, obstacle.behavior)
+                for obstacle in game.obstacles
+            ]
+
+        spawned = spawn(build_spares=False)
+        self.assertGreater(len(spawned), 1)
+        self.assertEqual(spawn(build_spares=True), spawned)
+
+    @patch("src.behaviors.choose", return_value=BEHAVIORS["formation"])
+    def test_spawn_formation(self, mock_choose):
+        self.game.score = 90
+        self.game.prepare_obstacles()
+        while self.game.jobs:
+            self.game.run_jobs()
+        self.game.spawn_obstacle([self.game.bee])
+        mock_choose.assert_called_once_with(90, 3)
+        self.assertEqual(len({obstacle.base_y for obstacle in self.game.obstacles}), 1)
+        self.assertEqual(
+            [obstacle.pos[0] for obstacle in self.game.obstacles],
+            [
+                WORLD_WIDTH + index * BEHAVIORS["formation"].spacing
+                for index in range(3)
+            ],
+        )
+        self.assertEqual(
+            len({obstacle.velocity for obstacle in self.game.obstacles}), 1
+        )
+
+    @patch("src.main_screen.Game.spawn_obstacle")
+    def test_replay_follows_recording(self, mock_spawn_obstacle):
+        del mock_spawn_obstacle
+        ghost = self.game.add_bee(ReplayInput(self.game.recording))
+        heights = []
+        for flying in [True] * 10 + [False] * 15 + [True] * 5 + [False] * 10:
+            if flying:
+                self.game.bee.fly()
+            else:
+                self.game.bee.fall()
+            self.game.update()
+            heights.append((self.game.bee.pos[1], ghost.pos[1]))
+
+        self.assertGreater(len(set(heights)), 1)
+        self.assertTrue(all(player == replay for player, replay in heights))
+
+    def test_restart_keeps_input_sources(self):
+        replay = ReplayInput([True])
+        self.game.add_bee(replay)
+        self.game.recording = [True, False]
+
+        self.game.restart_game(Button())
+
+        self.assertEqual(len(self.game.bees), 2)
+        self.assertIs(self.game.bees[1].input_source, replay)
+        self.assertEqual(self.game.last_recording, [True, False])
+        self.assertEqual(self.game.recording, [])
+
+    @patch("src.main_screen.Game.load_highscores")
+    def test_telemetry(self, mock_load_highscores):
+        del mock_load_highscores
+        telemetry = MagicMock()
+        self.game.telemetry = telemetry
+        power_up = PowerUp()
+        power_up.size = (500, 500)
+        power_up.pos = (200, -5100)
+        self.game.power_ups = [power_up]
+        self.game.start_game()
+        self.game.bee.pos = (200, -5000)
+
+        self.game.frame(TICK)
+
+        telemetry.start_session.assert_called_once()
+        telemetry.record_frame.assert_called_once()
+        telemetry.record.assert_any_call("power_up", bee=0)
+        telemetry.record.assert_any_call("death", bee=0, cause="fell")
+        telemetry.end_session.assert_called_once_with(0, 1, "fell")
+
+        self.game.restart_game(Button())
+        self.assertEqual(telemetry.start_session.call_count, 2)
+
+    @patch("src.main_screen.Game.load_highscores")
+    def test_gc_policy(self, mock_load_highscores):
+        del mock_load_highscores
+        self.game.telemetry = MagicMock()
+        self.game.gc_policy = MagicMock()
+        self.game.gc_policy.session_stats.return_value = {"count": 1}
+        self.game.start_game()
+        self.game.gc_policy.enter.assert_called_once_with(RunState.PLAYING)
+
+        self.game.crash(self.game.bee)
+
+        self.game.gc_policy.enter.assert_called_with(RunState.GAME_OVER)
+        self.game.telemetry.record.assert_any_call("gc_pauses", count=1)
+        self.game.telemetry.record.assert_called_with(
+            "frame_pacing", **self.game.pacer.session_stats()
+        )
+        self.game.telemetry.end_session.assert_called_once_with(0, 0, "obstacle")
+
+    @patch("src.main_screen.Game.load_highscores")
+    def test_flight_recorder(self, mock_load_highscores):
+        del mock_load_highscores
+        ghost = self.game.add_bee(lambda tick: True)
+        ghost.last_positions.append(-1)
+        self.game.start_game()
+        with tempfile.TemporaryDirectory() as directory:
+            self.game.flight_recorder = FlightRecorder(directory)
+            self.game.bee.pos = (200, 300)
+            self.game.update()
+            self.assertEqual(len(self.game.flight_recorder.rows()), 1)
+            row = dict(zip(FIELDS, self.game.flight_recorder.rows()[0]))
+            self.assertEqual(row["tick"], 1)
+            self.assertEqual(row["entities"], 1)
+            self.assertEqual(row["inputs"], 0b10)
+            self.assertAlmostEqual(row["frame_ms"], TICK * 1000)
+
+            self.game.crash(self.game.bee)
+            (dump,) = os.listdir(directory)
+            self.assertTrue(dump.endswith("-game-over.flight"))
+
+    @patch("src.main_screen.Game.load_highscores")
+    def test_shared_world(self, mock_load_highscores):
+        del mock_load_highscores
+        self.game.start_game()
+        self.game.shared_world = MagicMock()
+        self.game.bee.pos = (200, 300)
+
+        self.game.update()
+
+        self.game.shared_world.write.assert_called_once_with(
+            1, 0, self.game.bees, self.game.obstacles, self.game.power_ups
+        )
+
+    @patch("src.main_screen.Game.load_highscores")
+    def test_input_latency_of_synthetic_touches(self, mock_load_highscores):
+        del mock_load_highscores
+        now = [0.0]
+        self.game.latency = LatencyTracker(timer=lambda: now[0])
+        self.game.telemetry = MagicMock()
+        self.game.start_game()
+
+        for _ in range(3):
+            self.game.dispatch("on_touch_down", UnitTestTouch(100, 100))
+            now[0] += 8 / 1024
+            self.game.update()
+            now[0] += 12 / 1024
+            self.game.frame_shown()
+            self.game.dispatch("on_touch_up", UnitTestTouch(100, 100))
+        self.assertFalse(self.game.bee.flying)
+
+        device = f"{platform}/UnitTestTouch"
+        self.assertEqual(self.game.latency.percentiles(device, "tick"), (7, 7, 7))
+        self.assertEqual(self.game.latency.percentiles(device, "frame"), (19, 19, 19))
+        self.assertEqual(self.game.telemetry.record_latency.call_count, 3)
+
+        self.game.run_state.transition(RunState.GAME_OVER)
+        self.game.fly()
+        self.assertEqual(self.game.latency.pending, [])
+
+    @patch("src.main_screen.Game.load_highscores")
+    def test_world_state_and_restore(self, mock_load_highscores):
+        del mock_load_highscores
+        ghost = self.game.add_bee(lambda tick: False)
+        self.game.start_game()
+        self.game.bee.pos = (200, 300)
+        self.game.bee.velocity = [0, -1.5]
+        self.game.bee.invincible = True
+        self.game.bee.power_up_timer = self.game.timers.schedule(2, lambda dt: None)
+        ghost.alive = False
+        obstacle = Obstacle(sprite="swallow")
+        obstacle.launch(100, 50, BEHAVIORS["wave"], 0.3)
+        obstacle.pos = (100, 80)
+        obstacle.velocity = 12
+        obstacle.passed_by = {ghost}
+        self.game.obstacles = [obstacle]
+        power_up = PowerUp()
+        power_up.pos = (600, 200)
+        self.game.power_ups = [power_up]
+        self.game.tick = 42
+        self.game.score = 7
+        self.game.timers.advance(1.25)
+        world = self.game.world_state()
+        expected = rng.gameplay.random()
+
+        game = Game()
+        game.telemetry = MagicMock()
+        input_source = game.bee.input_source = MagicMock()
+        game.restore(world)
+
+        self.assertEqual(
+            game.world_state()._replace(random_state=None),
+            world._replace(random_state=None),
+        )
+        self.assertEqual(rng.gameplay.random(), expected)
+        self.assertEqual(game.next_power_up, self.game.next_power_up)
+        self.assertIs(game.bee.input_source, input_source)
+        self.assertIsNone(game.bees[1].input_source)
+        self.assertIn(game.bee, game.children)
+        self.assertIn(game.effect_of(game.bee), game.children)
+        self.assertNotIn(game.bees[1], game.children)
+        self.assertIn(game.obstacles[0], game.children)
+        self.assertEqual(game.obstacles[0].sprite, "swallow")
+        self.assertEqual(game.obstacles[0].passed_by, {game.bees[1]})
+        self.assertEqual(game.obstacles[0].behavior, BEHAVIORS["wave"])
+        self.assertAlmostEqual(
+            behaviors.sine(
+                BEHAVIORS["wave"], game.obstacles[0], game.timers.now + 0.5, None
+            ),
+            behaviors.sine(
+                BEHAVIORS["wave"], obstacle, self.game.timers.now + 0.5, None
+            ),
+        )
+        self.assertEqual(tuple(game.power_ups[0].rect.pos), (600, 200))
+        self.assertIs(game.run_state.state, RunState.PAUSED)
+        self.assertEqual(game.score_label.text, "Paused")
+        game.telemetry.record.assert_called_once_with("resume", tick=42)
+
+        game.run_state.transition(RunState.PLAYING)
+        game.timers.advance(2)
+        self.assertFalse(game.bee.invincible)
+
+    def test_game_over_clears_snapshot(self):
+        self.game.snapshot = MagicMock()
+        self.game.theme_song = MagicMock()
+        self.game.store = MagicMock()
+        self.game.score_label = Label()
+        self.game.run_state.transition(RunState.PLAYING)
+        with patch.object(self.game, "show_restart_button"):
+            self.game.crash(self.game.bee)
+        self.game.snapshot.clear.assert_called_once()
+
+    def test_present(self):
+        self.game.simulation = MagicMock()
+        self.game.telemetry = MagicMock()
+        self.game.init_score_label()
+        self.game.run_state.transition(RunState.PLAYING)
+        self.game.simulation.resume.assert_called_once()
+        frame = Frame(
+            5,
+            2,
+            250.0,
+            True,
+            ((0, 700.0, 100.0), (3, 400.0, 50.0)),
+            (600.0, 80.0),
+            None,
+        )
+        self.game.simulation.frames.latest.return_value = frame
+
+        self.game.frame(TICK)
+
+        self.game.telemetry.record_frame.assert_called_once_with(TICK)
+        self.assertEqual(self.game.tick, 5)
+        self.assertEqual(self.game.bee.pos[1], 250)
+        self.assertIn(self.game.effect_of(self.game.bee), self.game.children)
+        self.assertEqual(
+            [obstacle.pos for obstacle in self.game.obstacles], [[700, 100], [400, 50]]
+        )
+        self.assertEqual(self.game.power_ups[0].pos, [600, 80])
+        self.assertEqual(self.game.score_label.text, "Score: 2")
+
+        first = self.game.obstacle_slots[0]
+        self.game.simulation.frames.latest.return_value = frame._replace(
+            invincible=False,
+            obstacles=((0, 690.0, 100.0),),
+            power_up=None,
+            crash="obstacle",
+        )
+        with patch.object(self.game, "crash") as crash:
+            self.game.present()
+
+        self.assertEqual(self.game.obstacles, [first])
+        self.assertEqual(first.pos, [690, 100])
+        self.assertEqual(self.game.power_ups, [])
+        self.assertNotIn(self.game.effect_of(self.game.bee), self.game.children)
+        crash.assert_called_once_with(self.game.bee, "obstacle")
+
+        self.game.run_state.transition(RunState.PAUSED)
+        self.game.simulation.pause.assert_called_once()
+
+    def test_present_without_simulation(self):
+        self.game.present()
+        self.assertEqual(self.game.tick, 0)
+
+    def test_simulation_input_and_restart(self):
+        self.game.simulation = MagicMock()
+        self.game.theme_song = MagicMock()
+        self.game.fly()
+        self.game.fall()
+        self.assertEqual(
+            self.game.simulation.send.call_args_list, [((True,),), ((False,),)]
+        )
+        self.game.restart_game(Button())
+        self.game.simulation.reset.assert_called_once()
+
+    def test_touched_bee(self):
+        second = self.game.add_bee()
+        self.game.add_bee(lambda tick: False)
+
+        class MockTouch:
+            pos = (WORLD_WIDTH - 1, 100)
+
+        self.assertIs(self.game.touched_bee(()), self.game.bee)
+        self.assertIs(self.game.touched_bee((None, MockTouch)), second)
+
+        self.game.fly(None, MockTouch)
+        self.assertTrue(second.flying)
+        self.assertFalse(self.game.bee.flying)
+
+    def test_update_sixteen_bees(self):
+        for _ in range(15):
+            self.game.add_bee(ReplayInput([True, False] * 30))
+        self.game.run_state.transition(RunState.PLAYING)
+
+        for _ in range(60):
+            self.game.update()
+
+        self.assertEqual(len(self.game.bees), 16)
+        self.assertEqual(self.game.tick, 60)
+
 
 class TestBeeLazy(unittest.TestCase):
+    def setUp(self):
+        # the policy changes the collector of the whole test process
+        patcher = patch("src.main_screen.GcPolicy")
+        self.mock_gc_policy = patcher.start()
+        self.addCleanup(patcher.stop)
+        # the flight recorder of every built app hooks into the unhandled exceptions
+        for hook in (patch("sys.excepthook"), patch("threading.excepthook")):
+            hook.start()
+            self.addCleanup(hook.stop)
+
     @patch("src.main_screen.SoundLoader")
     def test_build(self, mock_soundloader):
         mock_theme_song = mock_soundloader.load.return_value
-        game = BeeLazy().build()
+        view = BeeLazy().build()
+        game = view.children[0]
 
+        self.assertIsInstance(view, ScaledView)
         self.assertIsInstance(game, Game)
+        self.assertIs(game.view, view)
         self.assertEqual(game.theme_song, mock_theme_song)
         self.assertTrue(mock_theme_song.loop)
         mock_theme_song.play.assert_called_once()
@@ -322,10 +1016,169 @@ class TestBeeLazy(unittest.TestCase):
     @patch("src.main_screen.SoundLoader")
     def test_build_no_theme_song(self, mock_soundloader):
         mock_soundloader.load.return_value = None
-        game = BeeLazy().build()
+        app = BeeLazy()
+        app.build()
 
-        self.assertIsInstance(game, Game)
-        self.assertIsNone(game.theme_song)
+        self.assertIsNone(app.game.theme_song)
+
+    @patch.dict(os.environ, {"BEELAZY_RENDER_SCALE": "0.5"})
+    @patch("src.main_screen.SoundLoader")
+    def test_build_with_render_scale(self, mock_soundloader):
+        mock_soundloader.load.return_value = None
+        app = BeeLazy()
+        view = app.build()
+        view.size = (WORLD_WIDTH, WORLD_HEIGHT)
+
+        self.assertEqual(view.resolution, (WORLD_WIDTH // 2, WORLD_HEIGHT // 2))
+        app.game.quality.override("low")
+        self.assertEqual(view.resolution, (WORLD_WIDTH // 4, WORLD_HEIGHT // 4))
+
+    @patch("src.main_screen.SoundLoader")
+    def test_pause_and_resume(self, mock_soundloader):
+        mock_soundloader.load.return_value = None
+        app = BeeLazy()
+        app.build()
+        game = app.game
+
+        self.assertTrue(app.on_pause())
+        self.assertIs(game.run_state.state, RunState.BACKGROUNDED)
+        app.on_resume()
+        self.assertIs(game.run_state.state, RunState.MENU)
+
+        app.on_minimize()
+        self.assertIs(game.run_state.state, RunState.BACKGROUNDED)
+        app.on_restore()
+        self.assertIs(game.run_state.state, RunState.MENU)
+
+    @patch.dict(os.environ, {"BEELAZY_LEADERBOARD_URL": "http://127.0.0.1:9"})
+    @patch("src.main_screen.LeaderboardClient")
+    @patch("src.main_screen.SoundLoader")
+    def test_build_with_leaderboard(self, mock_soundloader, mock_client):
+        mock_soundloader.load.return_value = None
+        app = BeeLazy()
+        app.build()
+        game = app.game
+
+        self.assertIs(game.leaderboard, mock_client.return_value)
+        game.leaderboard.top.assert_called_once_with(5)
+        app.on_stop()
+        game.leaderboard.close.assert_called_once()
+
+    @patch("src.main_screen.Logger")
+    @patch("src.main_screen.SoundLoader")
+    def test_pause_saves_and_build_restores_run(self, mock_soundloader, mock_logger):
+        mock_soundloader.load.return_value = None
+        with tempfile.TemporaryDirectory() as directory, patch.object(
+            BeeLazy, "user_data_dir", directory
+        ), patch("src.main_screen.Game.load_highscores"):
+            app = BeeLazy()
+            app.build()
+            app.on_pause()
+            self.assertFalse(os.path.exists(app.game.snapshot.path))
+            app.on_resume()
+            app.game.start_game()
+            app.game.score = 12
+
+            app.on_pause()
+            mock_logger.info.assert_called_once()
+            app.on_resume()
+            for _ in range(MAX_BEES):
+                app.game.add_bee()
+            app.on_pause()
+            mock_logger.warning.assert_called_once()
+            self.assertIs(app.game.run_state.state, RunState.BACKGROUNDED)
+
+            restored = BeeLazy()
+            restored.build()
+            game = restored.game
+            self.assertEqual(game.score, 12)
+            self.assertIs(game.run_state.state, RunState.PAUSED)
+            app.game.telemetry.close()
+            game.telemetry.close()
+
+    @patch.dict(os.environ, {"BEELAZY_GPU_SPRITES": "1"})
+    @patch("src.main_screen.SoundLoader")
+    def test_build_with_gpu_sprites(self, mock_soundloader):
+        mock_soundloader.load.return_value = None
+        app = BeeLazy()
+        app.build()
+
+        self.assertIsNotNone(app.game.sprites)
+
+    @patch.dict(os.environ, {"BEELAZY_LATENCY_OVERLAY": "1", "BEELAZY_SEED": "3"})
+    @patch("src.main_screen.SoundLoader")
+    def test_build_with_latency_overlay(self, mock_soundloader):
+        mock_soundloader.load.return_value = None
+        app = BeeLazy()
+        with patch.object(Window, "bind") as mock_bind:
+            view = app.build()
+        overlay = view.children[0]
+        self.assertIsInstance(overlay, LatencyOverlay)
+        self.assertIs(overlay.tracker, app.game.latency)
+        mock_bind.assert_any_call(on_flip=app.game.frame_shown)
+        Clock.unschedule(overlay.refresh)
+
+    @patch.dict(os.environ, {"BEELAZY_SHARED_WORLD": "beelazy"})
+    @patch("src.main_screen.WorldExporter")
+    @patch("src.main_screen.SoundLoader")
+    def test_build_with_shared_world(self, mock_soundloader, mock_exporter):
+        mock_soundloader.load.return_value = None
+        app = BeeLazy()
+        app.build()
+
+        mock_exporter.assert_called_once_with("beelazy")
+        app.on_stop()
+        app.game.shared_world.close.assert_called_once()
+
+    @patch("src.main_screen.SoundLoader")
+    def test_build_with_profiler(self, mock_soundloader):
+        mock_soundloader.load.return_value = None
+        with tempfile.TemporaryDirectory() as directory:
+            trace = os.path.join(directory, "trace.json")
+            update = Game.update
+            with patch.dict(os.environ, {"BEELAZY_PROFILE": trace}):
+                app = BeeLazy()
+                app.build()
+            self.assertIs(Game.update.__wrapped__, update)
+            app.game.start_game()
+            app.game.update()
+            app.on_stop()
+
+            self.assertIsNone(app.profiler.sampler)
+            self.assertIs(Game.update, update)
+            with open(trace, encoding="utf-8") as file:
+                names = {event["name"] for event in json.load(file)}
+        self.assertIn("Game.update", names)
+
+    @patch.dict(os.environ, {"BEELAZY_SIMULATION_THREAD": "1"})
+    @patch("src.main_screen.SoundLoader")
+    def test_build_with_simulation_thread(self, mock_soundloader):
+        mock_soundloader.load.return_value = None
+        app = BeeLazy()
+        app.build()
+        game = app.game
+
+        self.assertIsInstance(game.simulation, Simulation)
+        self.assertEqual(game.simulation.env.max_obstacles, 5)
+        game.quality.override("low")
+        self.assertEqual(game.simulation.env.max_obstacles, 3)
+        app.on_stop()
+        self.assertFalse(game.simulation._worker.is_alive())
+
+    @patch("src.main_screen.Logger")
+    @patch("src.main_screen.SoundLoader")
+    def test_on_stop(self, mock_soundloader, mock_logger):
+        mock_soundloader.load.return_value = None
+        app = BeeLazy()
+        app.build()
+        app.game.run_state.timer = lambda: 1e9
+
+        app.on_stop()
+
+        self.assertEqual(mock_logger.info.call_count, 3)
+        self.mock_gc_policy.return_value.freeze.assert_called_once()
+        self.mock_gc_policy.return_value.stop.assert_called_once()
+        self.assertIsNone(app.game.flight_recorder._hooks)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
+import math
 import unittest
 
 from kivy.graphics.texture import TextureRegion
 
-from src.obstacle import Obstacle
+from src import rng
+from src.behaviors import BEHAVIORS
+from src.obstacle import SPRITES, Obstacle
 
 
 class TestObstacle(unittest.TestCase):
@@ -38,6 +41,20 @@ class TestObstacle(unittest.TestCase):
         self.assertIsInstance(self.obstacle.texture, TextureRegion)
         self.assertEqual(self.obstacle.texture, self.obstacle.frames[0])
 
+    def test_without_cosmetics(self):
+        rng.cosmetic.enabled = False
+        self.addCleanup(setattr, rng.cosmetic, "enabled", True)
+        self.assertEqual(Obstacle().sprite, SPRITES[0])
+
+    def test_launch(self):
+        self.obstacle.motion = (-5, 1)
+        self.obstacle.launch(800, 300, BEHAVIORS["wave"], 1)
+        self.assertEqual(tuple(self.obstacle.pos), (800, 300))
+        self.assertEqual(self.obstacle.base_y, 300)
+        self.assertEqual(self.obstacle.behavior, BEHAVIORS["wave"])
+        self.assertEqual(self.obstacle.phase, -math.pi)
+        self.assertEqual(self.obstacle.motion, (0, 0))
+
 
 if __name__ == "__main__":
     unittest.main()
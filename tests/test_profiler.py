@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from src.profiler import Profiler, StackSampler, TraceWriter, collapse
+
+
+class Traced:
+    def work(self, value):
+        return value * 2
+
+    def fail(self):
+        raise ValueError
+
+
+class TestTraceWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "trace.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_spans(self):
+        writer = TraceWriter(self.path, buffer_size=2)
+        writer.span("first", 1.0, 0.5)
+        self.assertEqual(len(writer._spans), 1)
+        writer.span("second", 2.0, 0.25)
+        self.assertEqual(writer._spans, [])
+        writer.span("third", 3.0, 0.001)
+        writer.close()
+
+        with open(self.path, encoding="utf-8") as file:
+            events = json.load(file)
+        self.assertEqual(events[0]["ph"], "M")
+        self.assertEqual(
+            [event["name"] for event in events[1:]], ["first", "second", "third"]
+        )
+        self.assertEqual(events[1]["ts"], 1e6)
+        self.assertEqual(events[1]["dur"], 5e5)
+        self.assertEqual(events[3]["dur"], 1000)
+
+
+class TestStackSampler(unittest.TestCase):
+    def test_collapse(self):
+        stack = collapse(sys._getframe())
+        self.assertTrue(stack.endswith(";test_collapse (test_profiler.py)"))
+        self.assertEqual(collapse(None), "")
+
+    def test_sampling(self):
+        sampler = StackSampler(threading.get_ident(), interval=0.001)
+        sampler.start()
+        deadline = time.perf_counter() + 0.1
+        while not sampler.stacks and time.perf_counter() < deadline:
+            sum(range(1000))
+        sampler.stop()
+        self.assertGreater(sum(sampler.stacks.values()), 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stacks.txt")
+            sampler.write(path)
+            with open(path, encoding="utf-8") as file:
+                line = file.readline()
+        self.assertIn("test_sampling (test_profiler.py)", line)
+        self.assertTrue(line.rstrip().rsplit(" ", 1)[1].isdigit())
+
+    def test_unknown_thread(self):
+        sampler = StackSampler(-1, interval=0.001)
+        sampler.start()
+        time.sleep(0.01)
+        sampler.stop()
+        self.assertEqual(sampler.stacks, {})
+
+
+class TestProfiler(unittest.TestCase):
+    def test_trace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            trace = os.path.join(directory, "trace.json")
+            samples = os.path.join(directory, "stacks.txt")
+            original = Traced.work
+            profiler = Profiler(trace, samples)
+            profiler.trace(Traced, "work", "fail")
+            profiler.start()
+
+            self.assertEqual(Traced().work(2), 4)
+            with self.assertRaises(ValueError):
+                Traced().fail()
+            profiler.stop()
+
+            self.assertIs(Traced.work, original)
+            with open(trace, encoding="utf-8") as file:
+                names = [event["name"] for event in json.load(file)]
+            self.assertEqual(names[1:], ["Traced.work", "Traced.fail"])
+            self.assertTrue(os.path.exists(samples))
+
+    def test_without_sampler(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = Profiler(os.path.join(directory, "trace.json"))
+            profiler.start()
+            profiler.stop()
+            self.assertIsNone(profiler.sampler)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from src.quality import QUALITY_TIERS, QualityGovernor
+from src.timer_wheel import TICK
+
+
+class TestQualityGovernor(unittest.TestCase):
+    def setUp(self):
+        self.tiers: list = []
+        self.governor = QualityGovernor(self.tiers.append, window=10, upgrade_after=20)
+
+    def test_init(self):
+        self.assertEqual(self.governor.tier, QUALITY_TIERS[-1])
+        self.assertEqual(self.governor.log, [])
+
+    def test_downgrade(self):
+        for _ in range(9):
+            self.governor.record(TICK * 2)
+        self.assertEqual(self.governor.tier.name, "high")
+
+        self.governor.record(TICK * 2)
+        self.assertEqual(self.governor.tier.name, "medium")
+        self.assertEqual(self.tiers, [QUALITY_TIERS[1]])
+        self.assertEqual(self.governor.log[0][:3], (10, "high", "medium"))
+
+    def test_downgrade_stops_at_lowest_tier(self):
+        for _ in range(100):
+            self.governor.record(TICK * 2)
+        self.assertEqual(self.governor.tier.name, "low")
+        self.assertEqual(len(self.tiers), 2)
+
+    def test_upgrade_needs_sustained_good_frames(self):
+        for _ in range(10):
+            self.governor.record(TICK * 2)
+        self.assertEqual(self.governor.tier.name, "medium")
+
+        for _ in range(28):
+            self.governor.record(TICK)
+        self.assertEqual(self.governor.tier.name, "medium")
+
+        self.governor.record(TICK)
+        self.assertEqual(self.governor.tier.name, "high")
+
+    def test_no_change_between_thresholds(self):
+        for _ in range(100):
+            self.governor.record(TICK * 1.15)
+        self.assertEqual(self.governor.tier.name, "high")
+        self.assertEqual(self.tiers, [])
+
+    def test_override(self):
+        self.governor.override("low")
+        self.assertEqual(self.governor.tier.name, "low")
+        self.assertEqual(self.governor.log[-1][3], "manual override")
+
+        for _ in range(100):
+            self.governor.record(TICK)
+        self.assertEqual(self.governor.tier.name, "low")
+
+        self.governor.override("low")
+        self.governor.override(None)
+        for _ in range(29):
+            self.governor.record(TICK)
+        self.assertEqual(self.governor.tier.name, "medium")
+        self.assertEqual(len(self.tiers), 2)
+
+    def test_override_unknown_tier(self):
+        with self.assertRaises(ValueError):
+            self.governor.override("ultra")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from kivy.graphics import Color, InstructionGroup, Rectangle
+
+from src import rng
+from src.render_benchmark import (
+    SCENES,
+    benchmark,
+    build_scene,
+    count_instructions,
+    main,
+    render,
+)
+from src.rules import WORLD_WIDTH
+
+
+class TestRenderBenchmark(unittest.TestCase):
+    def test_count_instructions(self):
+        group = InstructionGroup()
+        inner = InstructionGroup()
+        inner.add(Color(1, 1, 1))
+        inner.add(Rectangle())
+        group.add(inner)
+        group.add(Rectangle())
+        self.assertEqual(
+            count_instructions(group), {"Rectangle": 2, "BindTexture": 2, "Color": 1}
+        )
+
+    def test_build_scene(self):
+        self.assertEqual(len(build_scene("obstacles", 3, (320, 240)).obstacles), 3)
+        self.assertTrue(build_scene("invincible").bee.invincible)
+        self.assertIsNotNone(build_scene("highscores").highscore_label)
+        with self.assertRaises(ValueError):
+            build_scene("credits")
+
+    def test_render(self):
+        game = build_scene("obstacles", 2, (320, 240))
+        game.obstacles[0].x = -game.obstacles[0].width
+        with tempfile.TemporaryDirectory() as directory:
+            png = os.path.join(directory, "frame.png")
+            fps, counts = render(game, 12, png)
+            self.assertTrue(os.path.exists(png))
+        self.assertGreater(fps, 0)
+        # the bee and both obstacles are Image widgets
+        self.assertEqual(counts["StencilPush"], 3)
+        self.assertEqual(game.obstacles[0].x, WORLD_WIDTH - 5 * 11)
+
+        game.view = None
+        with self.assertRaises(ValueError):
+            render(game)
+
+    def test_benchmark(self):
+        results = benchmark(frames=7, size=(160, 120), gpu_sprites=True)
+        self.assertEqual([result.scene for result in results], list(SCENES))
+        self.assertGreater(results[1].by_type["Line"], 0)
+        self.assertEqual(results[0].instructions, sum(results[0].by_type.values()))
+
+    def test_benchmark_without_cosmetics(self):
+        (result,) = benchmark(["invincible"], 3, size=(160, 120), cosmetics=False)
+        self.assertNotIn("Line", result.by_type)
+        self.assertTrue(rng.cosmetic.enabled)
+
+    def test_main(self):
+        output = io.StringIO()
+        with tempfile.TemporaryDirectory() as directory, redirect_stdout(output):
+            main(
+                [
+                    *("--frames", "1", "--scene", "highscores", "--no-cosmetics"),
+                    *("--png-dir", directory),
+                ]
+            )
+            self.assertEqual(os.listdir(directory), ["highscores.png"])
+        self.assertIn("renderer:", output.getvalue())
+        self.assertIn("highscores:", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
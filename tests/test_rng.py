@@ -0,0 +1,36 @@
+import random
+import statistics
+import unittest
+
+from src import rng
+from src.rng import Stream, seed, ticks_until
+
+
+class TestRng(unittest.TestCase):
+    def tearDown(self):
+        seed()
+
+    def test_seed(self):
+        seed(7)
+        gameplay = [rng.gameplay.random() for _ in range(3)]
+        seed(7)
+        rng.cosmetic.random()
+        self.assertEqual([rng.gameplay.random() for _ in range(3)], gameplay)
+        self.assertNotEqual(rng.cosmetic.random(), gameplay[0])
+        seed(8)
+        self.assertNotEqual(rng.gameplay.random(), gameplay[0])
+
+    def test_stream(self):
+        stream = Stream(3)
+        self.assertTrue(stream.enabled)
+        self.assertEqual(stream.random(), random.Random(3).random())
+
+    def test_ticks_until(self):
+        stream = Stream(1)
+        ticks = [ticks_until(stream, 99) for _ in range(20000)]
+        self.assertEqual(min(ticks), 1)
+        self.assertAlmostEqual(statistics.mean(ticks), 100, delta=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
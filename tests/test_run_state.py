@@ -0,0 +1,62 @@
+import unittest
+
+from src.run_state import RunState, RunStateMachine
+
+
+class TestRunStateMachine(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.frame = 0
+        self.entered: list = []
+        self.machine = RunStateMachine(
+            lambda state, previous: self.entered.append((state, previous)),
+            timer=lambda: self.now,
+            frames=lambda: self.frame,
+        )
+
+    def test_init(self):
+        self.assertIs(self.machine.state, RunState.MENU)
+        self.assertEqual(self.entered, [(RunState.MENU, RunState.MENU)])
+
+    def test_transition(self):
+        self.machine.transition(RunState.PLAYING)
+        self.machine.transition(RunState.PLAYING)
+        self.assertIs(self.machine.state, RunState.PLAYING)
+        self.assertIs(self.machine.previous_state, RunState.MENU)
+        self.assertEqual(self.entered[-1], (RunState.PLAYING, RunState.MENU))
+        self.assertEqual(len(self.entered), 2)
+
+    def test_invalid_transition(self):
+        with self.assertRaises(ValueError):
+            self.machine.transition(RunState.GAME_OVER)
+        self.assertIs(self.machine.state, RunState.MENU)
+
+    def test_background_while_playing(self):
+        self.machine.transition(RunState.PLAYING)
+        self.machine.background()
+        self.assertIs(self.machine.state, RunState.BACKGROUNDED)
+
+        self.machine.foreground()
+        self.assertIs(self.machine.state, RunState.PAUSED)
+
+        self.machine.foreground()
+        self.assertIs(self.machine.state, RunState.PAUSED)
+
+    def test_background_in_menu(self):
+        self.machine.background()
+        self.machine.foreground()
+        self.assertIs(self.machine.state, RunState.MENU)
+
+    def test_wakeups_per_second(self):
+        self.now, self.frame = 2.0, 40
+        self.machine.transition(RunState.PLAYING)
+        self.now, self.frame = 3.0, 100
+
+        self.assertEqual(
+            self.machine.wakeups_per_second(),
+            {"menu": 20.0, "playing": 60.0},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
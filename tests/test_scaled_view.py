@@ -0,0 +1,96 @@
+import unittest
+
+from kivy.input.motionevent import MotionEvent
+from kivy.uix.widget import Widget
+
+from src.rules import WORLD_HEIGHT, WORLD_WIDTH
+from src.scaled_view import ScaledView
+
+
+class Touch(MotionEvent):
+    def depack(self, args):
+        self.sx, self.sy = args
+        super().depack(args)
+
+
+class RecordingWidget(Widget):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.touches = []
+
+    def on_touch_down(self, touch):
+        self.touches.append(("down", touch.pos))
+
+    def on_touch_move(self, touch):
+        self.touches.append(("move", touch.pos))
+
+    def on_touch_up(self, touch):
+        self.touches.append(("up", touch.pos))
+
+
+class TestScaledView(unittest.TestCase):
+    def setUp(self):
+        # a narrow view: the world is scaled to half its size and centred vertically
+        self.view = ScaledView(render_scale=0.5, size=(960, 1080))
+
+    def test_layout(self):
+        self.assertEqual(self.view.factor, 0.5)
+        self.assertEqual(self.view.rect.pos, (0, 270))
+        self.assertEqual(self.view.rect.size, (960, 540))
+        self.assertEqual(self.view.resolution, (480, 270))
+        self.assertEqual(self.view.scale.x, 480 / WORLD_WIDTH)
+        self.assertIs(self.view.rect.texture, self.view.fbo.texture)
+
+        self.view.set_quality_scale(0.5)
+        self.assertEqual(self.view.resolution, (240, 135))
+
+        self.view.pos = (100, 0)
+        self.assertEqual(self.view.rect.pos, (100, 270))
+
+    def test_invalid_render_scale(self):
+        with self.assertRaises(ValueError):
+            ScaledView(render_scale=0)
+
+    def test_coordinates(self):
+        self.assertEqual(
+            self.view.to_local(480, 540), (WORLD_WIDTH / 2, WORLD_HEIGHT / 2)
+        )
+        self.assertEqual(self.view.to_parent(WORLD_WIDTH, 0), (960, 270))
+
+    def test_relative_coordinates(self):
+        self.assertEqual(self.view.to_local(480, 540, relative=True), (960, 1080))
+        self.assertEqual(self.view.to_parent(960, 1080, relative=True), (480, 540))
+
+    def test_children_draw_into_buffer(self):
+        child = Widget()
+        self.view.add_widget(child)
+        self.assertIn(child.canvas, self.view.fbo.children)
+        self.assertNotIn(child.canvas, self.view.canvas.children)
+
+        self.view.remove_widget(child)
+        self.assertNotIn(child.canvas, self.view.fbo.children)
+
+        self.view.add_widget(child)
+        self.view.clear_widgets()
+        self.assertEqual(self.view.children, [])
+        self.assertNotIn(child.canvas, self.view.fbo.children)
+
+    def test_touches_in_world_coordinates(self):
+        child = RecordingWidget()
+        self.view.add_widget(child)
+        touch = Touch("test", 1, (0.5, 0.5))
+        touch.scale_for_screen(961, 1081)
+
+        self.view.on_touch_down(touch)
+        self.view.on_touch_move(touch)
+        self.view.on_touch_up(touch)
+
+        center = (WORLD_WIDTH / 2, WORLD_HEIGHT / 2)
+        self.assertEqual(
+            child.touches, [("down", center), ("move", center), ("up", center)]
+        )
+        self.assertEqual(touch.pos, (480, 540))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.shared_world import (
+    ALIVE,
+    FLYING,
+    INVINCIBLE,
+    SEQUENCE,
+    WorldExporter,
+    WorldReader,
+    main,
+)
+from src.snapshot import MAX_OBSTACLES
+
+
+class TestSharedWorld(unittest.TestCase):
+    def setUp(self):
+        self.name = f"beelazy-test-{os.getpid()}"
+        self.exporter = WorldExporter(self.name)
+        # the reader normally runs in another process, with a resource tracker of its own
+        tracker = patch("src.shared_world.resource_tracker")
+        self.resource_tracker = tracker.start()
+        self.addCleanup(tracker.stop)
+        self.reader = WorldReader(self.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.exporter.close()
+
+    def write(self, tick: int = 7, obstacles: int = 2):
+        bees = [
+            SimpleNamespace(
+                pos=(200, 300.5),
+                velocity=[0, -3],
+                flying=True,
+                alive=True,
+                invincible=False,
+            ),
+            SimpleNamespace(
+                pos=(200, -10),
+                velocity=[0, 0],
+                flying=False,
+                alive=False,
+                invincible=True,
+            ),
+        ]
+        self.exporter.write(
+            tick,
+            12,
+            bees,
+            [SimpleNamespace(pos=(700 - i, 50), velocity=5) for i in range(obstacles)],
+            [SimpleNamespace(pos=(600, 80))],
+        )
+
+    def test_nothing_written(self):
+        self.assertIsNone(self.reader.read())
+        self.resource_tracker.unregister.assert_called_with(
+            f"/{self.name}", "shared_memory"
+        )
+
+    def test_read(self):
+        self.write()
+
+        world = self.reader.read()
+
+        self.assertEqual(world.sequence, 2)
+        self.assertEqual((world.tick, world.score), (7, 12))
+        self.assertEqual((world.bees, world.obstacles, world.power_ups), (2, 2, 1))
+        self.assertEqual(world.arrays["bee_y"].tolist(), [300.5, -10])
+        self.assertEqual(world.arrays["bee_velocity"].tolist(), [-3, 0])
+        self.assertEqual(
+            world.arrays["bee_flags"].tolist(), [FLYING | ALIVE, INVINCIBLE]
+        )
+        self.assertEqual(world.arrays["obstacle_x"].tolist(), [700, 699])
+        self.assertEqual(world.arrays["obstacle_velocity"].tolist(), [5, 5])
+        self.assertEqual(world.arrays["power_up_y"].tolist(), [80])
+
+        self.write(tick=8, obstacles=MAX_OBSTACLES + 1)
+        world = self.reader.read()
+        self.assertEqual((world.sequence, world.tick), (4, 8))
+        self.assertEqual(world.obstacles, MAX_OBSTACLES)
+
+    def test_writer_busy(self):
+        self.write()
+        SEQUENCE.pack_into(self.exporter.memory.buf, 0, 3)
+        self.assertIsNone(self.reader.read(retries=3))
+
+    def test_torn_read_is_retried(self):
+        self.write()
+        sequence = MagicMock(size=SEQUENCE.size)
+        sequence.unpack_from.side_effect = [(2,), (4,), (4,), (4,)]
+        with patch("src.shared_world.SEQUENCE", sequence):
+            world = self.reader.read()
+        self.assertEqual(world.sequence, 4)
+        self.assertEqual(sequence.unpack_from.call_count, 4)
+
+    def test_other_layout(self):
+        self.write()
+        self.exporter.memory.buf[8:12] = b"XXXX"
+        with self.assertRaises(ValueError):
+            self.reader.read()
+
+    def test_stale_block(self):
+        self.write()
+        stale = self.exporter
+        self.exporter = WorldExporter(self.name)
+        self.exporter.write(1, 0, [], [], [])
+
+        reader = WorldReader(self.name)
+        self.assertEqual(reader.read().tick, 1)
+        self.assertEqual(self.reader.read().tick, 7)
+        reader.close()
+        for array in stale.arrays.values():
+            array.release()
+        stale.memory.close()
+
+    def test_main(self):
+        self.write()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main([self.name, "--frames", "1", "--interval", "0"])
+        self.assertEqual(
+            output.getvalue(),
+            "tick 7 score 12 bee y 300, -10 obstacles 2 power ups 1\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import io
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from kivy.uix.widget import Widget
+
+from src.main_screen import Game
+from src.rules import SPRITE_SIZE, WORLD_HEIGHT, WORLD_WIDTH
+from src.simulation import Frame, Simulation, TripleBuffer, benchmark, flapping, main
+
+
+class TestTripleBuffer(unittest.TestCase):
+    def test_latest(self):
+        buffer = TripleBuffer(0)
+        self.assertEqual(buffer.latest(), 0)
+
+        buffer.publish(1)
+        buffer.publish(2)
+        self.assertEqual(buffer.latest(), 2)
+        self.assertEqual(buffer.latest(), 2)
+
+        buffer.publish(3)
+        self.assertEqual(buffer.latest(), 3)
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        self.simulation = Simulation(seed=1)
+
+    def test_step(self):
+        self.simulation.send(True)
+        frame = self.simulation.step()
+
+        self.assertIsInstance(frame, Frame)
+        self.assertEqual(frame.tick, 1)
+        self.assertGreater(frame.bee_y, WORLD_HEIGHT / 2)
+        self.assertEqual(len(frame.obstacles), 1)
+        self.assertLess(frame.obstacles[0][1], WORLD_WIDTH)
+        self.assertIsNone(frame.crash)
+        self.assertIs(self.simulation.frames.latest(), frame)
+
+    def test_power_up(self):
+        self.simulation.env.power_up_active[0] = True
+        self.simulation.env.power_up[0] = (700, 100)
+        self.assertEqual(self.simulation.step().power_up, (693, 100))
+
+    def test_crash_stops_until_reset(self):
+        self.simulation.step()
+        self.simulation.env.bee_y[0] = -SPRITE_SIZE
+
+        frame = self.simulation.step()
+        self.assertEqual(frame.crash, "fell")
+        self.assertIs(self.simulation.step(), frame)
+
+        self.simulation.reset()
+        frame = self.simulation.step()
+        self.assertIsNone(frame.crash)
+        self.assertEqual(frame.tick, 1)
+
+    def test_crash_into_obstacle(self):
+        self.simulation.step()
+        self.simulation.env.obstacles[0, :, :2] = (200, WORLD_HEIGHT / 2)
+        self.assertEqual(self.simulation.step().crash, "obstacle")
+
+    def test_worker(self):
+        self.simulation.interval = 0.001
+        self.simulation.start((1000, 700))
+        self.assertEqual(self.simulation.frames.latest().tick, 0)
+
+        self.simulation.resume()
+        deadline = time.monotonic() + 5
+        while self.simulation.frames.latest().tick < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.simulation.pause()
+        time.sleep(0.01)
+        tick = self.simulation.frames.latest().tick
+
+        self.assertGreaterEqual(tick, 3)
+        self.assertEqual(self.simulation.env.width, 1000)
+        time.sleep(0.01)
+        self.assertEqual(self.simulation.frames.latest().tick, tick)
+        self.simulation.stop()
+        self.simulation.stop()
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_flapping(self):
+        self.assertTrue(flapping(0))
+        self.assertFalse(flapping(10))
+
+    def test_benchmark(self):
+        game = Game()
+        Widget().add_widget(game)
+        game.init_score_label()
+
+        results = benchmark(game, frames=20)
+
+        self.assertEqual(list(results), ["main thread", "worker thread"])
+        self.assertTrue(all(mean <= worst for mean, worst in results.values()))
+
+    def test_main(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--frames", "5"])
+        self.assertIn("worker thread", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.snapshot import (
+    MAX_POWER_UPS,
+    SIZE,
+    BeeState,
+    ObstacleState,
+    SnapshotFile,
+    WorldState,
+    pack_into,
+    unpack,
+)
+
+
+def make_world(random_state=None) -> WorldState:
+    return WorldState(
+        tick=1234,
+        score=56,
+        bees=[
+            BeeState(200.0, 300.5, 0.0, -2.5, True, True, True, 3.25, 56),
+            BeeState(210.0, 10.0, 0.0, 10.0, False, False, False, 0.0, 3),
+        ],
+        obstacles=[ObstacleState(400.0, 120.0, 24.0, 1, 0b10, 1, 150.0, -2.5)],
+        power_ups=[(700.0, 90.0)],
+        random_state=random_state or random.Random(4).getstate(),
+        next_power_up=1500,
+    )
+
+
+class TestPacking(unittest.TestCase):
+    def test_round_trip(self):
+        world = make_world()
+        buffer = bytearray(SIZE)
+
+        size = pack_into(buffer, world)
+
+        self.assertLess(size, SIZE)
+        self.assertEqual(unpack(bytes(buffer[:size])), world)
+
+    def test_random_state_with_gauss(self):
+        generator = random.Random(4)
+        generator.gauss()
+        world = make_world(generator.getstate())
+        buffer = bytearray(SIZE)
+        pack_into(buffer, world)
+
+        restored = random.Random()
+        restored.setstate(unpack(buffer).random_state)
+        self.assertEqual(restored.gauss(), generator.gauss())
+        self.assertEqual(restored.random(), generator.random())
+
+    def test_world_too_large(self):
+        world = make_world()._replace(power_ups=[(0.0, 0.0)] * (MAX_POWER_UPS + 1))
+        with self.assertRaises(ValueError):
+            pack_into(bytearray(SIZE), world)
+
+    def test_damaged(self):
+        buffer = bytearray(SIZE)
+        size = pack_into(buffer, make_world())
+        with self.assertRaises(ValueError):
+            unpack(bytes(buffer[: size - 1]))
+        with self.assertRaises(ValueError):
+            unpack(b"JUNK" + bytes(buffer[4:size]))
+
+
+class TestSnapshotFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot = SnapshotFile(os.path.join(self.directory.name, "snapshot.bin"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load(self):
+        self.assertIsNone(self.snapshot.load())
+        world = make_world()
+
+        size = self.snapshot.save(world)
+
+        self.assertEqual(os.path.getsize(self.snapshot.path), size)
+        self.assertEqual(self.snapshot.load(), world)
+
+    def test_load_damaged(self):
+        with open(self.snapshot.path, "wb") as file:
+            file.write(b"BEEZ")
+        self.assertIsNone(self.snapshot.load())
+
+    def test_clear(self):
+        self.snapshot.save(make_world())
+        self.snapshot.clear()
+        self.snapshot.clear()
+        self.assertFalse(os.path.exists(self.snapshot.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch
+
+from kivy.core.window import Window
+from kivy.uix.widget import Widget
+
+from src import assets, sprite_shader
+from src.sprite_shader import SpriteBatch
+
+
+class TestSpriteBatch(unittest.TestCase):
+    def setUp(self):
+        # the shader needs the GL context of the window
+        self.assertIsNotNone(Window)
+        self.batch = SpriteBatch("low", ("bee", "bird"))
+        self.widget = Widget(pos=(100, 50), size=(260, 260))
+
+    def test_frame_table(self):
+        bee, bird = self.batch.sheets["bee"], self.batch.sheets["bird"]
+        self.assertEqual((bee.first, bee.frames), (0, 8))
+        self.assertEqual((bird.first, bird.frames), (8, 6))
+        self.assertEqual(len(self.batch.canvas["frame_origins"]), 14)
+        self.assertTrue(self.batch.canvas.shader.success)
+
+    def test_attach_and_detach(self):
+        self.batch.attach(self.widget, "bee", 10, time=2.0, frame=3)
+        self.batch.attach(self.widget, "bee", 10)
+        mesh = self.batch.sprites[self.widget].mesh
+        self.assertEqual(self.batch.canvas.children.count(mesh), 1)
+        self.assertEqual(self.batch.frame(self.widget, 2.0), 3)
+        self.assertEqual(self.batch.frame(self.widget, 2.5), 0)
+
+        self.batch.detach(self.widget)
+        self.batch.detach(self.widget)
+        self.assertNotIn(mesh, self.batch.canvas.children)
+        self.assertEqual(self.batch.sprites, {})
+
+    def test_place(self):
+        self.batch.attach(self.widget, "bee", 10)
+        width, height = self.batch.sheets["bee"].size
+        # the frame is wider than high and scaled up to the width of the widget
+        height = 260 * height / width
+        vertices = self.batch.sprites[self.widget].mesh.vertices
+        self.assertEqual(len(vertices), 4 * 10)
+        self.assertEqual(vertices[0], 100)
+        self.assertAlmostEqual(vertices[1], 180 - height / 2)
+        self.assertEqual(vertices[10] - vertices[0], 260)
+
+        self.widget.pos = (0, 0)
+        vertices = self.batch.sprites[self.widget].mesh.vertices
+        self.assertEqual(vertices[0], 0)
+
+        # and scaled down to fit into a narrower widget
+        self.widget.size = (130, 260)
+        vertices = self.batch.sprites[self.widget].mesh.vertices
+        self.assertEqual(vertices[10] - vertices[0], 130)
+
+    def test_animate_keeps_frame(self):
+        self.batch.attach(self.widget, "bee", 10)
+        self.assertEqual(self.batch.frame(self.widget, 0), 0)
+        self.assertEqual(self.batch.frame(self.widget, 0.25), 3)
+
+        self.batch.animate(self.widget, 5, 0.25)
+        self.assertEqual(self.batch.frame(self.widget, 0.25), 3)
+        self.assertEqual(self.batch.frame(self.widget, 0.45), 4)
+
+        self.batch.animate(self.widget, 0, 0.45)
+        self.assertEqual(self.batch.frame(self.widget, 100), 4)
+
+    def test_set_time(self):
+        self.batch.set_time(1)
+        self.assertEqual(self.batch.canvas["time"], 1.0)
+
+    def test_sprites_on_other_pages(self):
+        pages = [assets.frames("bee", "low"), assets.frames("bee", "medium")]
+        with (
+            patch.object(assets, "frames", side_effect=pages),
+            self.assertRaises(ValueError),
+        ):
+            SpriteBatch("low", ("bee", "bird"))
+
+    def test_too_many_frames(self):
+        with (
+            patch.object(sprite_shader, "MAX_FRAMES", 10),
+            self.assertRaises(ValueError),
+        ):
+            SpriteBatch("low", ("bee", "bird"))
+
+    def test_broken_shader(self):
+        with (
+            patch.object(sprite_shader, "FRAGMENT_SHADER", "void main(void) {"),
+            self.assertRaises(ValueError),
+        ):
+            SpriteBatch("low", ("bee",))
+
+
+if __name__ == "__main__":
+    unittest.main()
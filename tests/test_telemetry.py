@@ -0,0 +1,151 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from src.telemetry import TelemetrySink, connect, main, percentile, report
+
+
+class TestTelemetrySink(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "telemetry.sqlite3")
+        self.sink = TelemetrySink(self.path, batch_size=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def query(self, statement):
+        connection = connect(self.path)
+        rows = connection.execute(statement).fetchall()
+        connection.close()
+        return rows
+
+    def test_session(self):
+        self.sink.record("ignored")
+        self.sink.end_session(1, 1, "ignored")
+        self.sink.start_session()
+        self.sink.record("power_up", bee=0)
+        self.sink.record("power_up", bee=1)
+        self.sink.record("death", cause="fell")
+        self.sink.record_frame(0.016)
+        self.sink.record_frame(0.017)
+        self.sink.record_frame(1.0)
+        self.sink.end_session(12, 600, "fell")
+        self.sink.close()
+
+        self.assertEqual(
+            self.query("SELECT score, ticks, cause FROM sessions"), [(12, 600, "fell")]
+        )
+        self.assertEqual(
+            self.query("SELECT kind, data FROM events"),
+            [
+                ("power_up", '{"bee": 0}'),
+                ("power_up", '{"bee": 1}'),
+                ("death", '{"cause": "fell"}'),
+            ],
+        )
+        self.assertEqual(
+            self.query("SELECT bucket_ms, count FROM frame_times"),
+            [(16, 1), (17, 1), (250, 1)],
+        )
+        self.assertEqual(self.query("PRAGMA journal_mode"), [("wal",)])
+
+    def test_start_session_ends_running_session(self):
+        self.sink.start_session()
+        self.sink.start_session()
+        self.sink.close()
+
+        self.assertEqual(
+            self.query("SELECT cause FROM sessions ORDER BY ended IS NULL"),
+            [("abandoned",), (None,)],
+        )
+
+    def test_full_queue_drops(self):
+        sink = TelemetrySink(self.path, max_batches=1)
+        sink._queue.put(None)
+        sink._writer.join()
+        sink.start_session()
+        sink.start_session()
+        self.assertGreater(sink.dropped, 0)
+
+    def test_failed_batch_is_logged(self):
+        with self.assertLogs("src.telemetry", "ERROR"):
+            self.sink._submit("INSERT INTO unknown VALUES (?)", [(1,), (2,)])
+            self.sink.start_session()
+            self.sink.close()
+        self.assertEqual(self.sink.dropped, 2)
+        self.assertEqual(len(self.query("SELECT id FROM sessions")), 1)
+
+    def test_no_database(self):
+        with self.assertLogs("src.telemetry", "ERROR"):
+            sink = TelemetrySink(self.directory.name)
+            sink.start_session()
+            sink.close()
+        self.assertEqual(sink.dropped, 1)
+
+    @patch("src.telemetry.CLOSE_TIMEOUT", 0.01)
+    def test_close_with_stuck_writer(self):
+        with patch.object(TelemetrySink, "_write"):
+            sink = TelemetrySink(self.path, max_batches=1)
+        sink._writer.join()
+        sink.start_session()
+        with self.assertLogs("src.telemetry", "WARNING"):
+            sink.close()
+
+
+class TestReport(unittest.TestCase):
+    def test_percentile(self):
+        histogram = [(16, 90), (33, 9), (100, 1)]
+        self.assertEqual(percentile(histogram, 0.5), 16)
+        self.assertEqual(percentile(histogram, 0.95), 33)
+        self.assertEqual(percentile(histogram, 1), 100)
+        self.assertEqual(percentile([], 0.5), 0)
+
+    def test_report_empty(self):
+        connection = connect(":memory:")
+        self.assertIn("Sessions: 0", report(connection))
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "telemetry.sqlite3")
+            sink = TelemetrySink(path)
+            sink.start_session()
+            sink.record("power_up")
+            sink.record("gc_pauses", count=2, total_ms=3.0, longest_ms=2.5)
+            sink.record(
+                "frame_pacing",
+                refresh_hz=120,
+                frames=600,
+                mean_ms=8.3,
+                jitter_ms=0.25,
+                p99_ms=9.1,
+                missed=2,
+            )
+            sink.record_frame(0.016)
+            sink.record_latency("linux/mouse", 0.042)
+            sink.end_session(3, 100, "obstacle")
+            sink.close()
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main([path])
+
+        self.assertIn("Sessions: 1", output.getvalue())
+        self.assertIn("obstacle: 1", output.getvalue())
+        self.assertIn("Power ups per session: 1.00", output.getvalue())
+        self.assertIn("p50 16ms", output.getvalue())
+        self.assertIn("  linux/mouse: p50 42ms, p95 42ms", output.getvalue())
+        self.assertIn(
+            "GC pauses during play: 2.0 per session, longest 2.5ms", output.getvalue()
+        )
+        self.assertIn(
+            "  120 Hz: 1 sessions, jitter 0.25ms, p99 9.1ms, 2.0 missed frames per session",
+            output.getvalue(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+
+from src.timer_wheel import LEVELS, SLOTS, TICK, TimerWheel
+
+
+class TestTimerWheel(unittest.TestCase):
+    def setUp(self):
+        self.wheel = TimerWheel()
+        self.calls: list = []
+
+    def callback(self, dt):
+        self.calls.append((self.wheel.tick, dt))
+
+    def test_schedule(self):
+        timer = self.wheel.schedule(0.5, self.callback)
+        self.assertTrue(timer.active)
+
+        self.wheel.advance(29 * TICK)
+        self.assertEqual(self.calls, [])
+
+        self.wheel.advance(TICK)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.calls[0][0], 30)
+        self.assertAlmostEqual(self.calls[0][1], 0.5)
+        self.assertFalse(timer.active)
+
+    def test_remaining(self):
+        timer = self.wheel.schedule(1, self.callback)
+        self.wheel.advance(TICK * 10.5)
+        self.assertAlmostEqual(self.wheel.remaining(timer), 1 - TICK * 10.5)
+        timer.cancel()
+        self.assertEqual(self.wheel.remaining(timer), 0)
+        self.assertEqual(self.wheel.remaining(None), 0)
+
+    def test_schedule_interval(self):
+        self.wheel.schedule_interval(0.1, self.callback)
+        self.wheel.advance(1.0)
+        self.assertEqual([tick for tick, _ in self.calls], list(range(6, 61, 6)))
+
+    def test_schedule_minimum_one_tick(self):
+        self.wheel.schedule(0, self.callback)
+        self.wheel.advance(TICK)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_cancel(self):
+        timer = self.wheel.schedule(1, self.callback)
+        timer.cancel()
+        timer.cancel()
+        self.wheel.advance(2)
+        self.assertEqual(self.calls, [])
+        self.assertFalse(timer.active)
+
+    def test_cancel_interval_inside_callback(self):
+        def cancel(dt):
+            self.callback(dt)
+            timer.cancel()
+
+        timer = self.wheel.schedule_interval(0.1, cancel)
+        self.wheel.advance(1)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_cancel_all(self):
+        timers = [
+            self.wheel.schedule(0.1, self.callback),
+            self.wheel.schedule(100, self.callback),
+            self.wheel.schedule(TICK * SLOTS**LEVELS * 2, self.callback),
+        ]
+        self.wheel.cancel_all()
+        self.wheel.advance(200)
+        self.assertEqual(self.calls, [])
+        self.assertFalse(any(timer.active for timer in timers))
+
+    def test_cascading_levels(self):
+        deadlines = [SLOTS - 1, SLOTS, SLOTS * 3 + 5, SLOTS**2 + 7, SLOTS**3 + 1]
+        for ticks in deadlines:
+            self.wheel.schedule(ticks * TICK, self.callback)
+        self.wheel.advance((SLOTS**3 + 1) * TICK)
+        self.assertEqual([tick for tick, _ in self.calls], deadlines)
+
+    def test_overflow(self):
+        self.wheel.tick = SLOTS**LEVELS - 3
+        timer = self.wheel.schedule(SLOTS**LEVELS * TICK, self.callback)
+        self.assertIs(timer.bucket, self.wheel._overflow)
+
+        # the overflow is moved into the wheel once the top level wraps around
+        self.wheel.advance(5 * TICK)
+        self.assertEqual(self.calls, [])
+        self.assertTrue(timer.active)
+        self.assertIsNot(timer.bucket, self.wheel._overflow)
+
+    def test_pause_and_resume(self):
+        self.wheel.schedule(0.5, self.callback)
+        self.wheel.pause()
+        self.wheel.advance(1)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.wheel.now, 0)
+
+        self.wheel.resume()
+        self.wheel.advance(1)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_pause_inside_callback(self):
+        self.wheel.schedule(TICK, lambda dt: self.wheel.pause())
+        self.wheel.advance(1)
+        self.assertEqual(self.wheel.tick, 1)
+
+    def test_time_scale(self):
+        self.wheel.time_scale = 0.5
+        self.wheel.schedule(1, self.callback)
+        self.wheel.advance(1)
+        self.assertEqual(self.calls, [])
+        self.assertAlmostEqual(self.wheel.now, 0.5)
+        self.wheel.advance(1)
+        self.assertEqual(len(self.calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
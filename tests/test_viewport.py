@@ -0,0 +1,35 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.viewport import Viewport
+
+
+class TestViewport(unittest.TestCase):
+    def setUp(self):
+        self.viewport = Viewport((960, 1080))
+        self.subscriber = MagicMock()
+        self.viewport.subscribe(self.subscriber)
+
+    def test_init(self):
+        self.assertEqual(self.viewport.tier, "medium")
+
+    def test_resize(self):
+        self.viewport.resize(SimpleNamespace(size=(960, 1080)), 960, 1080)
+        self.subscriber.assert_not_called()
+
+        # rotated to portrait, on_rotate passes the rotation instead of the size
+        self.viewport.resize(SimpleNamespace(size=(540, 960)), 90)
+
+        self.subscriber.assert_called_once_with(self.viewport)
+        self.assertEqual((self.viewport.width, self.viewport.height), (540, 960))
+        self.assertEqual(self.viewport.tier, "medium")
+
+        self.viewport.unsubscribe(self.subscriber)
+        self.viewport.update((3840, 2160))
+        self.subscriber.assert_called_once()
+        self.assertEqual(self.viewport.tier, "high")
+
+
+if __name__ == "__main__":
+    unittest.main()